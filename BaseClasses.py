@@ -12,7 +12,7 @@ from collections import Counter, deque
 from collections.abc import Collection, MutableSequence
 from enum import IntEnum, IntFlag
 from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, TypedDict, Union, \
-    Type, ClassVar
+    Type, ClassVar, FrozenSet
 
 import NetUtils
 import Options
@@ -58,6 +58,7 @@ class MultiWorld():
     worlds: Dict[int, auto_world]
     groups: Dict[int, Group]
     regions: RegionManager
+    entrance_dependencies: EntranceDependencies
     itempool: List[Item]
     is_race: bool = False
     precollected_items: Dict[int, List[Item]]
@@ -96,11 +97,17 @@ class MultiWorld():
         region_cache: Dict[int, Dict[str, Region]]
         entrance_cache: Dict[int, Dict[str, Entrance]]
         location_cache: Dict[int, Dict[str, Location]]
+        event_location_cache: Dict[int, Dict[str, Location]]
+        """subset of location_cache flagged as event, kept up to date by Location.event and LocationRegister"""
+        locked_location_cache: Dict[int, Dict[str, Location]]
+        """subset of location_cache flagged as locked, kept up to date by Location.locked and LocationRegister"""
 
         def __init__(self, players: int):
             self.region_cache = {player: {} for player in range(1, players+1)}
             self.entrance_cache = {player: {} for player in range(1, players+1)}
             self.location_cache = {player: {} for player in range(1, players+1)}
+            self.event_location_cache = {player: {} for player in range(1, players+1)}
+            self.locked_location_cache = {player: {} for player in range(1, players+1)}
 
         def __iadd__(self, other: Iterable[Region]):
             self.extend(other)
@@ -117,6 +124,17 @@ class MultiWorld():
             self.region_cache[new_id] = {}
             self.entrance_cache[new_id] = {}
             self.location_cache[new_id] = {}
+            self.event_location_cache[new_id] = {}
+            self.locked_location_cache[new_id] = {}
+
+        def update_location_flags(self, location: Location):
+            if self.location_cache[location.player].get(location.name) is not location:
+                return  # not registered (yet), LocationRegister.insert picks it up
+            for flag, cache in (("event", self.event_location_cache), ("locked", self.locked_location_cache)):
+                if getattr(location, flag):
+                    cache[location.player][location.name] = location
+                else:
+                    cache[location.player].pop(location.name, None)
 
         def __iter__(self) -> Iterator[Region]:
             for regions in self.region_cache.values():
@@ -134,6 +152,7 @@ class MultiWorld():
         self.algorithm = 'balanced'
         self.groups = {}
         self.regions = self.RegionManager(players)
+        self.entrance_dependencies = EntranceDependencies(self)
         self.shops = []
         self.itempool = []
         self.seed = None
@@ -454,6 +473,20 @@ class MultiWorld():
         return Utils.RepeatableChain(tuple(self.regions.location_cache[player].values()
                                            for player in self.regions.location_cache))
 
+    def get_event_locations(self, player: Optional[int] = None) -> Iterable[Location]:
+        """Locations currently flagged as event, which may or may not have an item yet."""
+        if player is not None:
+            return self.regions.event_location_cache[player].values()
+        return Utils.RepeatableChain(tuple(self.regions.event_location_cache[player].values()
+                                           for player in self.regions.event_location_cache))
+
+    def get_locked_locations(self, player: Optional[int] = None) -> Iterable[Location]:
+        """Locations currently flagged as locked."""
+        if player is not None:
+            return self.regions.locked_location_cache[player].values()
+        return Utils.RepeatableChain(tuple(self.regions.locked_location_cache[player].values()
+                                           for player in self.regions.locked_location_cache))
+
     def get_unfilled_locations(self, player: Optional[int] = None) -> List[Location]:
         return [location for location in self.get_locations(player) if location.item is None]
 
@@ -622,6 +655,24 @@ class MultiWorld():
 PathValue = Tuple[str, Optional["PathValue"]]
 
 
+class ItemCounter(Counter):
+    """Counter of item names that remembers which names were written to since the changes were last taken."""
+    changed: Set[str]
+
+    def __init__(self, *args, **kwargs):
+        self.changed = set()
+        super().__init__(*args, **kwargs)
+        self.changed.clear()
+
+    def __setitem__(self, key: str, value: int) -> None:
+        self.changed.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.changed.add(key)
+        super().__delitem__(key)
+
+
 class CollectionState():
     prog_items: Dict[int, Counter[str]]
     multiworld: MultiWorld
@@ -631,11 +682,20 @@ class CollectionState():
     path: Dict[Union[Region, Entrance], PathValue]
     locations_checked: Set[Location]
     stale: Dict[int, bool]
+    stale_items: Dict[int, Optional[FrozenSet[str]]]
+    """Item names per player whose count changed since the last reachability update, None if unknown."""
+    owned_players: Set[int]
+    """Players whose per-player layers belong to this state alone and may be modified in place."""
     additional_init_functions: List[Callable[[CollectionState, MultiWorld], None]] = []
     additional_copy_functions: List[Callable[[CollectionState, CollectionState], CollectionState]] = []
+    additional_materialize_functions: List[Callable[[CollectionState, int], None]] = []
+    copy_init_functions: List[Callable[[CollectionState, MultiWorld], None]] = []
+    """init_mixins of logic mixins without a materialize_mixin, which copy() runs before the copy_mixins"""
 
     def __init__(self, parent: MultiWorld):
-        self.prog_items = {player: Counter() for player in parent.get_all_ids()}
+        # only players using entrance dependencies record which items changed, see take_item_changes
+        self.prog_items = {player: ItemCounter() if parent.entrance_dependencies.is_used(player) else Counter()
+                           for player in parent.get_all_ids()}
         self.multiworld = parent
         self.reachable_regions = {player: set() for player in parent.get_all_ids()}
         self.blocked_connections = {player: set() for player in parent.get_all_ids()}
@@ -643,33 +703,63 @@ class CollectionState():
         self.path = {}
         self.locations_checked = set()
         self.stale = {player: True for player in parent.get_all_ids()}
+        self.stale_items = {player: frozenset() for player in parent.get_all_ids()}
+        self.owned_players = set(parent.get_all_ids())
         for function in self.additional_init_functions:
             function(self, parent)
         for items in parent.precollected_items.values():
             for item in items:
                 self.collect(item, True)
 
+    def materialize(self, player: int) -> None:
+        """
+        Copy-on-write: give this state its own copy of player's item counts and region caches, which may be shared
+        with other states since the last copy(). Has to be called before modifying any per-player layer in place.
+        """
+        if player in self.owned_players:
+            return
+        self.owned_players.add(player)
+        self.prog_items[player] = self.prog_items[player].copy()
+        self.reachable_regions[player] = self.reachable_regions[player].copy()
+        self.blocked_connections[player] = self.blocked_connections[player].copy()
+        for function in self.additional_materialize_functions:
+            function(self, player)
+
     def update_reachable_regions(self, player: int):
         self.stale[player] = False
+        stale_items = self.stale_items[player]
+        self.stale_items[player] = frozenset()
         reachable_regions = self.reachable_regions[player]
         blocked_connections = self.blocked_connections[player]
-        queue = deque(self.blocked_connections[player])
+        dependencies = self.multiworld.entrance_dependencies
+        traced = dependencies.is_traced(player)
+        if stale_items:
+            # only connections whose rule read one of the changed items can have become reachable
+            queue = deque(dependencies.get_affected(player, blocked_connections, stale_items))
+        else:
+            queue = deque(blocked_connections)
         start = self.multiworld.get_region("Menu", player)
 
         # init on first call - this can't be done on construction since the regions don't exist yet
         if start not in reachable_regions:
+            reachable_regions, blocked_connections = self._writable_regions(player)
             reachable_regions.add(start)
             blocked_connections.update(start.exits)
             queue.extend(start.exits)
 
         # run BFS on all connections, and keep track of those blocked by missing items
+        # the region sets are only materialized once something changes, rules may also copy this state mid-search
         while queue:
             connection = queue.popleft()
             new_region = connection.connected_region
             if new_region in reachable_regions:
+                if player not in self.owned_players:
+                    reachable_regions, blocked_connections = self._writable_regions(player)
                 blocked_connections.remove(connection)
-            elif connection.can_reach(self):
+            elif dependencies.can_reach(connection, self) if traced else connection.can_reach(self):
                 assert new_region, f"tried to search through an Entrance \"{connection}\" with no Region"
+                if player not in self.owned_players:
+                    reachable_regions, blocked_connections = self._writable_regions(player)
                 reachable_regions.add(new_region)
                 blocked_connections.remove(connection)
                 blocked_connections.update(new_region.exits)
@@ -681,16 +771,26 @@ class CollectionState():
                     if new_entrance in blocked_connections and new_entrance not in queue:
                         queue.append(new_entrance)
 
+    def _writable_regions(self, player: int) -> Tuple[Set[Region], Set[Entrance]]:
+        self.materialize(player)
+        return self.reachable_regions[player], self.blocked_connections[player]
+
     def copy(self) -> CollectionState:
-        ret = CollectionState(self.multiworld)
-        ret.prog_items = copy.deepcopy(self.prog_items)
-        ret.reachable_regions = {player: copy.copy(self.reachable_regions[player]) for player in
-                                 self.reachable_regions}
-        ret.blocked_connections = {player: copy.copy(self.blocked_connections[player]) for player in
-                                   self.blocked_connections}
+        # per-player layers are shared between both states until one of them materializes a player for writing
+        ret = self.__class__.__new__(self.__class__)
+        ret.multiworld = self.multiworld
+        ret.prog_items = self.prog_items.copy()
+        ret.reachable_regions = self.reachable_regions.copy()
+        ret.blocked_connections = self.blocked_connections.copy()
+        ret.stale = self.stale.copy()
+        ret.stale_items = self.stale_items.copy()
+        ret.owned_players = set()
+        self.owned_players = set()
         ret.events = copy.copy(self.events)
         ret.path = copy.copy(self.path)
         ret.locations_checked = copy.copy(self.locations_checked)
+        for function in self.copy_init_functions:
+            function(ret, self.multiworld)
         for function in self.additional_copy_functions:
             ret = function(self, ret)
         return ret
@@ -713,14 +813,29 @@ class CollectionState():
 
     def sweep_for_events(self, key_only: bool = False, locations: Optional[Iterable[Location]] = None) -> None:
         if locations is None:
-            locations = self.multiworld.get_filled_locations()
-        reachable_events = True
+            if key_only:
+                locations = self.multiworld.get_filled_locations()
+            else:
+                # locked dungeon items are collected as well, even if they are not events
+                locations = [location for location in self.multiworld.get_event_locations() if location.item]
+                locations += [location for location in self.multiworld.get_locked_locations()
+                              if not location.event and getattr(location.item, "locked_dungeon_item", False)]
         # since the loop has a good chance to run more than once, only filter the events once
-        locations = {location for location in locations if location.event and location not in self.events and
-                     not key_only or getattr(location.item, "locked_dungeon_item", False)}
+        # and group them by region, so events behind unreachable regions only cost one check per region
+        pending: Dict[Region, List[Location]] = {}
+        for location in locations:
+            if location.event and location not in self.events and not key_only \
+                    or getattr(location.item, "locked_dungeon_item", False):
+                pending.setdefault(location.parent_region, []).append(location)
+        reachable_events = True
         while reachable_events:
-            reachable_events = {location for location in locations if location.can_reach(self)}
-            locations -= reachable_events
+            reachable_events = []
+            for region, region_events in pending.items():
+                if region_events and region.can_reach(self):
+                    unreachable_events = []
+                    for location in region_events:
+                        (reachable_events if location.can_reach(self) else unreachable_events).append(location)
+                    pending[region] = unreachable_events
             for event in reachable_events:
                 self.events.add(event)
                 assert isinstance(event.item, Item), "tried to collect Event with no Item"
@@ -767,6 +882,7 @@ class CollectionState():
         if location:
             self.locations_checked.add(location)
 
+        self.materialize(item.player)
         changed = self.multiworld.worlds[item.player].collect(self, item)
 
         if not changed and event:
@@ -774,19 +890,299 @@ class CollectionState():
             changed = True
 
         self.stale[item.player] = True
+        self.take_item_changes(item.player)
 
         if changed and not event:
             self.sweep_for_events()
 
         return changed
 
-    def remove(self, item: Item):
+    def remove(self, item: Item, event: bool = False) -> bool:
+        """Undo collect(item, event), returns whether the state changed."""
+        self.materialize(item.player)
         changed = self.multiworld.worlds[item.player].remove(self, item)
+
+        if not changed and event:
+            # collect counts events the world ignores, so this has to be mirrored here
+            player_prog_items = self.prog_items[item.player]
+            if player_prog_items[item.name] > 0:
+                player_prog_items[item.name] -= 1
+                if player_prog_items[item.name] < 1:
+                    del player_prog_items[item.name]
+                changed = True
+
         if changed:
             # invalidate caches, nothing can be trusted anymore now
             self.reachable_regions[item.player] = set()
             self.blocked_connections[item.player] = set()
             self.stale[item.player] = True
+            self.take_item_changes(item.player)
+        return changed
+
+    def take_item_changes(self, player: int) -> None:
+        """Move the item names written to prog_items[player] since the last call over to stale_items[player]."""
+        prog_items = self.prog_items[player]
+        changed = getattr(prog_items, "changed", None)
+        if changed is None:
+            # not an ItemCounter, so what changed is unknown
+            self.stale_items[player] = None
+            if self.multiworld.entrance_dependencies.is_used(player):
+                # e.g. the world was created or declared its first dependencies after this state
+                self.prog_items[player] = ItemCounter(prog_items)
+        elif changed:
+            stale_items = self.stale_items[player]
+            if stale_items is not None:
+                self.stale_items[player] = stale_items | changed
+            changed.clear()
+
+
+class _RuleTrace:
+    """What a single evaluation of an entrance's access rule read, see EntranceDependencies.can_reach."""
+    __slots__ = ("entrance", "player", "item_names", "regions", "complete")
+    entrance: Entrance
+    player: int
+    item_names: Set[str]
+    regions: Dict[Region, bool]
+    """regions of the entrance's player checked and whether they were reachable"""
+    complete: bool
+    """False once the rule read something that can't be tracked by item names of the entrance's player."""
+
+    def __init__(self, entrance: Entrance):
+        self.entrance = entrance
+        self.player = entrance.player
+        self.item_names = set()
+        self.regions = {}
+        self.complete = True
+
+
+class _TracingCollectionState(CollectionState):
+    """
+    A CollectionState temporarily takes on this class while one of its entrance rules is traced,
+    recording which item names of the traced player the rule reads through the CollectionState API.
+    Accessing prog_items or reachable_regions directly can't be traced.
+    """
+    _trace: _RuleTrace
+
+    @property
+    def prog_items(self) -> Dict[int, Counter[str]]:
+        self._trace.complete = False
+        return self.__dict__["prog_items"]
+
+    @prog_items.setter
+    def prog_items(self, value: Dict[int, Counter[str]]) -> None:
+        self.__dict__["prog_items"] = value
+
+    @property
+    def reachable_regions(self) -> Dict[int, Set[Region]]:
+        self._trace.complete = False
+        return self.__dict__["reachable_regions"]
+
+    @reachable_regions.setter
+    def reachable_regions(self, value: Dict[int, Set[Region]]) -> None:
+        self.__dict__["reachable_regions"] = value
+
+    def _read(self, item_names: Iterable[str], player: int) -> Counter[str]:
+        trace = self._trace
+        if player == trace.player:
+            trace.item_names.update(item_names)
+        else:
+            trace.complete = False
+        return self.__dict__["prog_items"][player]
+
+    def has(self, item: str, player: int, count: int = 1) -> bool:
+        return self._read((item,), player)[item] >= count
+
+    def has_all(self, items: Iterable[str], player: int) -> bool:
+        items = tuple(items)
+        prog_items = self._read(items, player)
+        return all(prog_items[item] for item in items)
+
+    def has_any(self, items: Iterable[str], player: int) -> bool:
+        items = tuple(items)
+        prog_items = self._read(items, player)
+        return any(prog_items[item] for item in items)
+
+    def count(self, item: str, player: int) -> int:
+        return self._read((item,), player)[item]
+
+    def has_group(self, item_name_group: str, player: int, count: int = 1) -> bool:
+        self._read(self.multiworld.worlds[player].item_name_groups[item_name_group], player)
+        return super().has_group(item_name_group, player, count)
+
+    def count_group(self, item_name_group: str, player: int) -> int:
+        self._read(self.multiworld.worlds[player].item_name_groups[item_name_group], player)
+        return super().count_group(item_name_group, player)
+
+    def can_reach(self,
+                  spot: Union[Location, Entrance, Region, str],
+                  resolution_hint: Optional[str] = None,
+                  player: Optional[int] = None) -> bool:
+        if isinstance(spot, str):
+            assert isinstance(player, int), "can_reach: player is required if spot is str"
+            if resolution_hint == "Location":
+                spot = self.multiworld.get_location(spot, player)
+            elif resolution_hint == "Entrance":
+                spot = self.multiworld.get_entrance(spot, player)
+            else:
+                spot = self.multiworld.get_region(spot, player)
+        trace = self._trace
+        if isinstance(spot, Region) and spot.player == trace.player:
+            # regions of the traced player are up to date during its update, and only ever become reachable,
+            # which re-tests the entrance if the region is registered as an indirect condition for it
+            reachable = spot in self.__dict__["reachable_regions"][spot.player]
+            if not reachable and trace.entrance not in self.multiworld.indirect_connections.get(spot, ()):
+                trace.complete = False
+            trace.regions[spot] = reachable
+            return reachable
+        trace.complete = False
+        return spot.can_reach(self)
+
+    def copy(self) -> CollectionState:
+        self._trace.complete = False
+        ret = super().copy()
+        ret.__class__ = CollectionState
+        return ret
+
+
+class EntranceDependencies:
+    """
+    Reverse dependency graph from item names to the entrances whose access rules read them, so that
+    CollectionState.update_reachable_regions only re-tests the blocked entrances that a changed item can unblock.
+
+    Dependencies are either declared by the world, or recorded by tracing every failed access rule evaluation of
+    worlds that set World.trace_rule_dependencies. Entrances without known dependencies are re-tested on every update.
+    """
+    multiworld: MultiWorld
+    dependents: Dict[int, Dict[str, Set[Entrance]]]
+    """player -> item name -> entrances whose access rule read the item"""
+    known: Set[Entrance]
+    """entrances of which all dependencies of the current access rule are in dependents"""
+    declared: Set[Entrance]
+    untraceable: Set[Entrance]
+    """entrances of which the current access rule read something that is not tracked"""
+    last_failures: Dict[Entrance, Tuple[Tuple[str, ...], Tuple[Optional[int], ...], Tuple[Tuple[Region, bool], ...]]]
+    """what the last traced failure of an entrance read: item names, their counts and region reachability"""
+
+    def __init__(self, multiworld: MultiWorld):
+        self.multiworld = multiworld
+        self.dependents = {}
+        self.known = set()
+        self.declared = set()
+        self.untraceable = set()
+        self.last_failures = {}
+
+    def is_traced(self, player: int) -> bool:
+        world = self.multiworld.worlds.get(player)
+        return world is not None and world.trace_rule_dependencies
+
+    def is_used(self, player: int) -> bool:
+        """Whether the reachability updates of player can make use of the item names that changed."""
+        return player in self.dependents or self.is_traced(player)
+
+    def declare(self, entrance: Entrance, item_names: Iterable[str]) -> None:
+        """
+        Declare all item names of entrance.player the entrance's access rule reads, instead of tracing it.
+        Has to be done after setting the access rule, as replacing it drops the declaration.
+        """
+        self.forget(entrance)
+        self._watch(entrance)
+        self._add_dependents(entrance, item_names)
+        self.declared.add(entrance)
+        self.known.add(entrance)
+
+    def forget(self, entrance: Entrance) -> None:
+        """Drop what is known about the entrance's access rule, to be called when it is replaced."""
+        self.known.discard(entrance)
+        self.declared.discard(entrance)
+        self.untraceable.discard(entrance)
+        self.last_failures.pop(entrance, None)
+
+    def get_affected(self, player: int, blocked: Set[Entrance], item_names: Iterable[str]) -> Set[Entrance]:
+        """Blocked entrances that have to be re-tested after the count of item_names of player changed."""
+        affected = blocked - self.known
+        dependents = self.dependents.get(player)
+        if dependents:
+            for item_name in item_names:
+                entrances = dependents.get(item_name)
+                if entrances:
+                    affected |= blocked & entrances
+        return affected
+
+    def can_reach(self, entrance: Entrance, state: CollectionState) -> bool:
+        """Entrance.can_reach for an entrance with a reachable parent region, recording what its rule read if it fails."""
+        last_failure = self.last_failures.get(entrance)
+        if last_failure:
+            # the rule only depends on what it reads, so reading the same values again fails the same way
+            item_names, counts, regions = last_failure
+            if tuple(map(state.prog_items[entrance.player].get, item_names)) == counts and \
+                    (not regions or all((region in state.reachable_regions[entrance.player]) is reachable
+                                        for region, reachable in regions)):
+                return False
+        # only failed evaluations need to be recorded, so evaluating twice is cheaper than tracing every evaluation
+        if entrance.can_reach(state):
+            return True
+        if entrance in self.declared or entrance in self.untraceable:
+            return False
+        trace = _RuleTrace(entrance)
+        state_class, previous_trace = state.__class__, state.__dict__.get("_trace")
+        state.__class__, state._trace = _TracingCollectionState, trace
+        try:
+            reachable = entrance.access_rule(state)
+        finally:
+            state.__class__ = state_class
+            if previous_trace:
+                state._trace = previous_trace
+            else:
+                del state._trace
+        if reachable:
+            return entrance.can_reach(state)
+        self._watch(entrance)
+        # a blocked entrance has to be re-tested once any of the values its rule read so far changes,
+        # so the union of the reads of all failed evaluations covers every state it can be blocked in
+        if trace.complete:
+            self._add_dependents(entrance, trace.item_names)
+            self.known.add(entrance)
+            item_names = tuple(trace.item_names)
+            self.last_failures[entrance] = (item_names, tuple(map(state.prog_items[entrance.player].get, item_names)),
+                                            tuple(trace.regions.items()))
+        else:
+            self.known.discard(entrance)
+            self.untraceable.add(entrance)
+            self.last_failures.pop(entrance, None)
+        return False
+
+    @staticmethod
+    def _watch(entrance: Entrance) -> None:
+        """Makes replacing the access rule of entrance forget what is known about it, see _AccessRuleWatcher."""
+        entrance_class = type(entrance)
+        if issubclass(entrance_class, _AccessRuleWatcher):
+            return
+        watching_class = _AccessRuleWatcher.classes.get(entrance_class)
+        if not watching_class:
+            watching_class = type(entrance_class.__name__, (_AccessRuleWatcher, entrance_class),
+                                  {"__module__": entrance_class.__module__})
+            _AccessRuleWatcher.classes[entrance_class] = watching_class
+        entrance.__class__ = watching_class
+
+    def _add_dependents(self, entrance: Entrance, item_names: Iterable[str]) -> None:
+        dependents = self.dependents.setdefault(entrance.player, {})
+        for item_name in item_names:
+            dependents.setdefault(item_name, set()).add(entrance)
+
+
+class _AccessRuleWatcher:
+    """
+    Mixed into the class of entrances EntranceDependencies recorded something for, so that replacing their access
+    rule drops it. Other entrances don't pay for the check on every attribute assignment.
+    """
+    classes: ClassVar[Dict[Type[Entrance], Type[Entrance]]] = {}
+    """entrance class -> its subclass with this mixin"""
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        super().__setattr__(key, value)
+        if key == "access_rule":
+            # dependencies recorded for the previous rule no longer apply
+            self.parent_region.multiworld.entrance_dependencies.forget(self)
 
 
 class Entrance:
@@ -865,10 +1261,13 @@ class Region:
             location: Location = self._list.__getitem__(index)
             self._list.__delitem__(index)
             del(self.region_manager.location_cache[location.player][location.name])
+            self.region_manager.event_location_cache[location.player].pop(location.name, None)
+            self.region_manager.locked_location_cache[location.player].pop(location.name, None)
 
         def insert(self, index: int, value: Location) -> None:
             self._list.insert(index, value)
             self.region_manager.location_cache[value.player][value.name] = value
+            self.region_manager.update_location_flags(value)
 
     class EntranceRegister(Register):
         def __delitem__(self, index: int) -> None:
@@ -1002,8 +1401,8 @@ class Location:
     name: str
     address: Optional[int]
     parent_region: Optional[Region]
-    event: bool = False
-    locked: bool = False
+    _event: bool = False
+    _locked: bool = False
     show_in_spoiler: bool = True
     progress_type: LocationProgressType = LocationProgressType.DEFAULT
     always_allow = staticmethod(lambda item, state: False)
@@ -1017,6 +1416,29 @@ class Location:
         self.address = address
         self.parent_region = parent
 
+    @property
+    def event(self) -> bool:
+        return self._event
+
+    @event.setter
+    def event(self, value: bool) -> None:
+        self._event = value
+        # may be set in a subclass __init__ before parent_region is
+        parent_region = getattr(self, "parent_region", None)
+        if parent_region and parent_region.multiworld:
+            parent_region.multiworld.regions.update_location_flags(self)
+
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    @locked.setter
+    def locked(self, value: bool) -> None:
+        self._locked = value
+        parent_region = getattr(self, "parent_region", None)
+        if parent_region and parent_region.multiworld:
+            parent_region.multiworld.regions.update_location_flags(self)
+
     def can_fill(self, state: CollectionState, item: Item, check_access=True) -> bool:
         return ((self.always_allow(state, item) and item.name not in state.multiworld.non_local_items[item.player])
                 or ((self.progress_type != LocationProgressType.EXCLUDED or not (item.advancement or item.useful))
@@ -42,6 +42,46 @@ def get_ssl_context():
     return ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=certifi.where())
 
 
+class DataPackageNames(Utils.KeyedDefaultDict):
+    """id to name map, which loads the pending data packages of its context the first time an unknown id is looked
+    up or the map is checked or iterated, so games are only loaded once they are needed"""
+
+    def __init__(self, default_factory: typing.Callable[[int], str], load_pending: typing.Callable[[], bool]):
+        super().__init__(default_factory)
+        self.load_pending = load_pending
+
+    def __missing__(self, key):
+        if self.load_pending() and super().__contains__(key):
+            return self[key]
+        return super().__missing__(key)
+
+    def __contains__(self, key) -> bool:
+        return super().__contains__(key) or (self.load_pending() and super().__contains__(key))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self.load_pending()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.load_pending()
+        return super().__len__()
+
+    def keys(self):
+        self.load_pending()
+        return super().keys()
+
+    def values(self):
+        self.load_pending()
+        return super().values()
+
+    def items(self):
+        self.load_pending()
+        return super().items()
+
+
 class ClientCommandProcessor(CommandProcessor):
     def __init__(self, ctx: CommonContext):
         self.ctx = ctx
@@ -150,8 +190,9 @@ class CommonContext:
 
     # data package
     # Contents in flux until connection to server is made, to download correct data for this multiworld.
-    item_names: typing.Dict[int, str] = Utils.KeyedDefaultDict(lambda code: f'Unknown item (ID:{code})')
-    location_names: typing.Dict[int, str] = Utils.KeyedDefaultDict(lambda code: f'Unknown location (ID:{code})')
+    item_names: typing.Dict[int, str]
+    location_names: typing.Dict[int, str]
+    _pending_games: typing.Dict[str, typing.Callable[[], dict]]
 
     # defaults
     starting_reconnect_delay: int = 5
@@ -245,7 +286,12 @@ class CommonContext:
 
         self.jsontotextparser = JSONtoTextParser(self)
         self.rawjsontotextparser = RawJSONtoTextParser(self)
-        self.update_data_package(network_data_package)
+        self._pending_games = {}
+        self.item_names = DataPackageNames(lambda code: f'Unknown item (ID:{code})', self._load_pending_games)
+        self.location_names = DataPackageNames(lambda code: f'Unknown location (ID:{code})',
+                                               self._load_pending_games)
+        for game, game_data in network_data_package["games"].items():
+            self.defer_game(game, lambda game_data=game_data: game_data)
 
         # execution
         self.keep_alive_task = asyncio.create_task(keep_alive(self), name="Bouncy")
@@ -433,9 +479,16 @@ class CommonContext:
         # by documentation any game can use Archipelago locations/items -> always relevant
         relevant_games.add("Archipelago")
 
+        # only keep the games of this multiworld resident
+        self._pending_games.clear()
+        self.item_names.clear()
+        self.location_names.clear()
+
         needed_updates: typing.Set[str] = set()
         for game in relevant_games:
             if game not in remote_date_package_versions and game not in remote_data_package_checksums:
+                if game in network_data_package["games"]:
+                    self.defer_game(game, lambda game=game: network_data_package["games"][game])
                 continue
 
             remote_version: int = remote_date_package_versions.get(game, 0)
@@ -450,6 +503,9 @@ class CommonContext:
             # no action required if local version is new enough
             if (not remote_checksum and (remote_version > local_version or remote_version == 0)) \
                     or remote_checksum != local_checksum:
+                if Utils.has_data_package_for_checksum(game, remote_checksum):
+                    self.defer_game(game, functools.partial(self._load_cached_game, game, remote_checksum))
+                    continue
                 cached_game = Utils.load_data_package_for_checksum(game, remote_checksum)
                 cache_version: int = cached_game.get("version", 0)
                 cache_checksum: typing.Optional[str] = cached_game.get("checksum")
@@ -459,6 +515,8 @@ class CommonContext:
                     needed_updates.add(game)
                 else:
                     self.update_game(cached_game)
+            else:
+                self.defer_game(game, lambda game=game: network_data_package["games"][game])
         if needed_updates:
             await self.send_msgs([{"cmd": "GetDataPackage", "games": [game_name]} for game_name in needed_updates])
 
@@ -468,15 +526,38 @@ class CommonContext:
         for location_name, location_id in game_package["location_name_to_id"].items():
             self.location_names[location_id] = location_name
 
+    def defer_game(self, game: str, load: typing.Callable[[], dict]):
+        """Adds the names of a game the first time an unknown id is looked up, using the package returned by load."""
+        self._pending_games[game] = load
+
+    def _load_cached_game(self, game: str, checksum: str) -> dict:
+        """Loads the cached data package of game, requesting it from the server instead if the cache is broken."""
+        game_package = Utils.load_data_package_for_checksum(game, checksum)
+        if game_package.get("checksum") != checksum \
+                or "item_name_to_id" not in game_package or "location_name_to_id" not in game_package:
+            logger.warning(f"Cached data package of {game} is invalid, requesting it from the server.")
+            async_start(self.send_msgs([{"cmd": "GetDataPackage", "games": [game]}]))
+            return {}
+        return game_package
+
+    def _load_pending_games(self) -> bool:
+        """Adds the names of all deferred games. Returns if there were any."""
+        if not self._pending_games:
+            return False
+        pending = list(self._pending_games.values())
+        self._pending_games.clear()
+        for load in pending:
+            game_package = load()
+            if game_package:
+                self.update_game(game_package)
+        return True
+
     def update_data_package(self, data_package: dict):
         for game, game_data in data_package["games"].items():
             self.update_game(game_data)
 
     def consume_network_data_package(self, data_package: dict):
         self.update_data_package(data_package)
-        current_cache = Utils.persistent_load().get("datapackage", {}).get("games", {})
-        current_cache.update(data_package["games"])
-        Utils.persistent_store("datapackage", "games", current_cache)
         logger.info(f"Got new ID/Name DataPackage for {', '.join(data_package['games'])}")
         for game, game_data in data_package["games"].items():
             Utils.store_data_package_for_checksum(game, game_data)
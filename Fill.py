@@ -56,6 +56,14 @@ def fill_restrictive(world: MultiWorld, base_state: CollectionState, locations:
     total = min(len(item_pool), len(locations))
     placed = 0
 
+    # base_state plus item_pool and unplaced_items without any swept events, updated as items leave and re-enter
+    # the pool instead of being re-collected from scratch every round.
+    # Removing items is only exact for worlds declaring reversible_collect, otherwise the state is rebuilt every round.
+    reversible = all(world.worlds[player].reversible_collect for player in reachable_items)
+    pool_state = base_state.copy()
+    for item in item_pool:
+        pool_state.collect(item, True)
+
     while any(reachable_items.values()) and locations:
         # grab one item per player
         items_to_place = [items.pop()
@@ -65,8 +73,16 @@ def fill_restrictive(world: MultiWorld, base_state: CollectionState, locations:
                 if pool_item is item:
                     item_pool.pop(p)
                     break
-        maximum_exploration_state = sweep_from_pool(
-            base_state, item_pool + unplaced_items)
+            if reversible:
+                pool_state.remove(item, True)
+        if not reversible:
+            pool_state = base_state.copy()
+            for item in item_pool + unplaced_items:
+                pool_state.collect(item, True)
+        # events can't be uncollected reliably, as they may only be reachable through the removed items,
+        # so only they are swept again
+        maximum_exploration_state = pool_state.copy()
+        maximum_exploration_state.sweep_for_events()
 
         has_beaten_game = world.has_beaten_game(maximum_exploration_state)
 
@@ -74,6 +90,8 @@ def fill_restrictive(world: MultiWorld, base_state: CollectionState, locations:
             # if we have run out of locations to fill,break out of this loop
             if not locations:
                 unplaced_items += items_to_place
+                for item in items_to_place:
+                    pool_state.collect(item, True)
                 break
             item_to_place = items_to_place.pop(0)
 
@@ -139,6 +157,7 @@ def fill_restrictive(world: MultiWorld, base_state: CollectionState, locations:
                                 reachable_items[placed_item.player].appendleft(
                                     placed_item)
                                 item_pool.append(placed_item)
+                                pool_state.collect(placed_item, True)
 
                                 # cleanup at the end to hopefully get better errors
                                 cleanup_required = True
@@ -152,9 +171,11 @@ def fill_restrictive(world: MultiWorld, base_state: CollectionState, locations:
                     if spot_to_fill is None:
                         # Can't place this item, move on to the next
                         unplaced_items.append(item_to_place)
+                        pool_state.collect(item_to_place, True)
                         continue
                 else:
                     unplaced_items.append(item_to_place)
+                    pool_state.collect(item_to_place, True)
                     continue
             world.push_item(spot_to_fill, item_to_place, False)
             spot_to_fill.locked = lock
@@ -2,11 +2,9 @@ import collections
 import concurrent.futures
 import logging
 import os
-import pickle
 import tempfile
 import time
 import zipfile
-import zlib
 from typing import Dict, List, Optional, Set, Tuple, Union
 
 import worlds
@@ -105,7 +103,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
     if not args.skip_output:
         AutoWorld.call_stage(world, "assert_generate")
 
-    AutoWorld.call_all(world, "generate_early")
+    AutoWorld.call_all(world, "generate_early", workers=args.stage_workers)
 
     logger.info('')
 
@@ -130,10 +128,10 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
             del early
 
     logger.info('Creating World.')
-    AutoWorld.call_all(world, "create_regions")
+    AutoWorld.call_all(world, "create_regions", workers=args.stage_workers)
 
     logger.info('Creating Items.')
-    AutoWorld.call_all(world, "create_items")
+    AutoWorld.call_all(world, "create_items", workers=args.stage_workers)
 
     logger.info('Calculating Access Rules.')
 
@@ -142,7 +140,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
         world.worlds[player].options.non_local_items.value -= world.worlds[player].options.local_items.value
         world.worlds[player].options.non_local_items.value -= set(world.local_early_items[player])
 
-    AutoWorld.call_all(world, "set_rules")
+    AutoWorld.call_all(world, "set_rules", workers=args.stage_workers)
 
     for player in world.player_ids:
         exclusion_rules(world, player, world.worlds[player].options.exclude_locations.value)
@@ -163,7 +161,7 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
         world.worlds[1].options.non_local_items.value = set()
         world.worlds[1].options.local_items.value = set()
     
-    AutoWorld.call_all(world, "generate_basic")
+    AutoWorld.call_all(world, "generate_basic", workers=args.stage_workers)
 
     # remove starting inventory from pool items.
     # Because some worlds don't actually create items during create_items this has to be as late as possible.
@@ -409,11 +407,8 @@ def main(args, seed=None, baked_server_options: Optional[Dict[str, object]] = No
                 }
                 AutoWorld.call_all(world, "modify_multidata", multidata)
 
-                multidata = zlib.compress(pickle.dumps(multidata), 9)
-
                 with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f:
-                    f.write(bytes([3]))  # version of format
-                    f.write(multidata)
+                    f.write(NetUtils.dump_multidata(multidata))
 
             output_file_futures.append(pool.submit(write_multidata))
             if not check_accessibility_task.result():
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import bisect
 import collections
 import copy
 import datetime
 import functools
 import hashlib
 import inspect
+import io
 import itertools
 import logging
 import math
+import mmap
 import operator
 import pickle
 import random
@@ -37,9 +40,9 @@ except ImportError:
 
 import NetUtils
 import Utils
-from Utils import version_tuple, restricted_loads, Version, async_start
+from Utils import version_tuple, restricted_loads, RestrictedUnpickler, Version, async_start
 from NetUtils import Endpoint, ClientStatus, NetworkItem, decode, encode, NetworkPlayer, Permission, NetworkSlot, \
-    SlotType, LocationStore
+    SlotType, LocationStore, load_multidata, JSONFragment, encode_messages
 
 min_client_version = Version(0, 1, 6)
 colorama.init()
@@ -99,6 +102,69 @@ def get_saving_second(seed_name: str, interval: int = 60) -> int:
     return int(hashlib.sha256(seed_name.encode()).hexdigest(), 16) % interval
 
 
+# JSON of game data packages by checksum and fields, shared by all rooms of the process
+_encoded_game_packages: typing.Dict[typing.Tuple[str, typing.Tuple[str, ...]], str] = {}
+
+
+def encode_game_package(game_package: typing.Dict[str, typing.Any]) -> str:
+    """Returns the JSON of a game's data package, encoding packages with a checksum only once."""
+    if "checksum" not in game_package:
+        return encode(game_package)
+    key = game_package["checksum"], tuple(game_package)
+    encoded = _encoded_game_packages.get(key)
+    if encoded is None:
+        encoded = _encoded_game_packages[key] = encode(game_package)
+    return encoded
+
+
+# (kind, key, value) of a state change recorded in the save journal, kind being the get_save() key it changes
+JournalEntry = typing.Tuple[str, typing.Any, typing.Any]
+JournalRecord = typing.Tuple[int, typing.List[JournalEntry]]  # (save generation, entries)
+# get_save() keys stored as a sequence of (key, value) pairs rather than a dict
+journal_pairs = ("client_activity_timers", "client_connection_timers", "video")
+
+
+def read_save_journal(data: bytes) -> typing.Iterator[JournalRecord]:
+    """Yields the records of a save journal, stopping at a record that was cut off while being written."""
+    stream = io.BytesIO(data)
+    while stream.tell() < len(data):
+        try:
+            # each record is a separate pickle, so it gets a fresh unpickler memo
+            yield RestrictedUnpickler(stream).load()
+        except Exception as e:
+            logging.warning(f"Ignoring incomplete end of the save journal: {e!r}")
+            return
+
+
+def apply_save_journal(savedata: typing.Dict[str, typing.Any], records: typing.Iterable[JournalRecord]) -> int:
+    """Replays the journal records written after the savedata snapshot onto it.
+    Records of other save generations are skipped. Returns the number of entries applied."""
+    generation = savedata.get("generation", 0)
+    pairs = {kind: {tuple(key): value for key, value in savedata[kind]} for kind in journal_pairs if kind in savedata}
+    applied = 0
+    for record_generation, entries in records:
+        if record_generation != generation:
+            continue
+        for kind, key, value in entries:
+            if kind == "received_items":
+                received_items = savedata[kind].setdefault(key, [])
+                # (length after the change, new items), so that items already in the snapshot are not added again
+                length, items = value
+                missing = length - len(received_items)
+                if missing > 0:
+                    received_items.extend(items[-missing:])
+            elif kind in {"location_checks", "hints"}:
+                savedata[kind].setdefault(key, set()).update(value)
+            elif kind in pairs:
+                pairs[kind][key] = value
+            else:
+                savedata[kind][key] = value
+        applied += len(entries)
+    for kind, values in pairs.items():
+        savedata[kind] = type(savedata[kind])(values.items())
+    return applied
+
+
 class Client(Endpoint):
     version = Version(0, 0, 0)
     tags: typing.List[str] = []
@@ -142,6 +208,43 @@ class Client(Endpoint):
 team_slot = typing.Tuple[int, int]
 
 
+class KeyTrie:
+    """Clients subscribed to key prefixes, by character, so the subscribers of a key are found in O(len(key))."""
+    __slots__ = ("children", "clients")
+
+    children: typing.Dict[str, KeyTrie]
+    clients: typing.Optional[typing.Set[Client]]
+
+    def __init__(self):
+        self.children = {}
+        self.clients = None
+
+    def add(self, prefix: str, client: Client):
+        node = self
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = KeyTrie()
+            node = child
+        if node.clients is None:
+            node.clients = weakref.WeakSet()
+        node.clients.add(client)
+
+    def get_clients(self, key: str) -> typing.Set[Client]:
+        """All clients subscribed to a prefix of key, including key itself."""
+        clients: typing.Set[Client] = set()
+        node = self
+        if node.clients:
+            clients.update(node.clients)
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.clients:
+                clients.update(node.clients)
+        return clients
+
+
 class Context:
     dumper = staticmethod(encode)
     loader = staticmethod(decode)
@@ -165,6 +268,7 @@ class Context:
     stored_data: typing.Dict[str, object]
     read_data: typing.Dict[str, object]
     stored_data_notification_clients: typing.Dict[str, typing.Set[Client]]
+    stored_data_notification_prefixes: KeyTrie
     slot_info: typing.Dict[int, NetworkSlot]
     generator_version = Version(0, 0, 0)
     checksums: typing.Dict[str, str]
@@ -201,6 +305,7 @@ class Context:
         self.server = None
         self.countdown_timer = 0
         self.received_items = {}
+        self.item_receivers: typing.Set[team_slot] = set()  # slots that got items since the last send_new_items
         self.start_inventory = {}
         self.name_aliases: typing.Dict[team_slot, str] = {}
         self.location_checks = collections.defaultdict(set)
@@ -208,6 +313,8 @@ class Context:
         self.location_check_points = location_check_points
         self.hints_used = collections.defaultdict(int)
         self.hints: typing.Dict[team_slot, typing.Set[NetUtils.Hint]] = collections.defaultdict(set)
+        # hint sets that may hold hints found by checks made since they were last rechecked
+        self.hints_to_recheck: typing.Set[team_slot] = set()
         self.release_mode: str = release_mode
         self.remaining_mode: str = remaining_mode
         self.collect_mode: str = collect_mode
@@ -226,6 +333,13 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread = None
         self.save_dirty = False
+        # changes of often changing state are appended to a journal, which is compacted into a full save snapshot
+        # once it has journal_compaction_length entries or state outside of it changes
+        self.save_journal: typing.Deque[JournalEntry] = collections.deque()
+        self.save_generation = 0
+        self.journal_length = 0
+        self.journal_compaction_length = 10000
+        self.snapshot_dirty = True
         self.tags = ['AP']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
@@ -235,15 +349,31 @@ class Context:
         self.random = random.Random()
         self.stored_data = {}
         self.stored_data_notification_clients = collections.defaultdict(weakref.WeakSet)
+        self.stored_data_notification_prefixes = KeyTrie()
+        # sorted keys of stored_data, built on the first Get by prefix
+        self.stored_data_keys: typing.Optional[typing.List[str]] = None
+        # SetReply messages queued this iteration of the event loop, already encoded, and the ones each client gets
+        self.set_replies: typing.List[str] = []
+        self.set_reply_targets: typing.Dict[Client, typing.List[int]] = {}
+        # clients may subscribe to tracker events with this token, None disables subscriptions
+        self.tracker_token: typing.Optional[str] = None
+        self.tracker_subscribers: typing.Set[Client] = weakref.WeakSet()
+        self.tracker_events: typing.List[list] = []
         self.read_data = {}
 
         # init empty to satisfy linter, I suppose
         self.gamespackage = {}
+        self.encoded_game_packages: typing.Dict[str, str] = {}
+        self.encoded_data_package: typing.Optional[str] = None
+        # key: (version, JSON) of message parts sent on every connection, see get_encoded_fragment
+        self.encoded_fragments: typing.Dict[typing.Hashable, typing.Tuple[typing.Hashable, JSONFragment]] = {}
+        self.players_generation = 0  # increased whenever get_players_package changes
         self.checksums = {}
         self.item_name_groups = {}
         self.location_name_groups = {}
         self.all_item_and_group_names = {}
         self.all_location_and_group_names = {}
+        self.name_indexes: typing.Dict[typing.Hashable, Utils.FuzzyIndex] = {}
         self.non_hintable_names = collections.defaultdict(frozenset)
 
         self._load_game_data()
@@ -272,6 +402,35 @@ class Context:
                 set(game_package["item_name_to_id"]) | set(self.item_name_groups[game_name])
             self.all_location_and_group_names[game_name] = \
                 set(game_package["location_name_to_id"]) | set(self.location_name_groups.get(game_name, []))
+            self.encoded_game_packages[game_name] = encode_game_package(game_package)
+        self.encoded_data_package = None
+        self.encoded_fragments.clear()
+        self.name_indexes.clear()
+
+    def get_encoded_fragment(self, key: typing.Hashable, version: typing.Hashable,
+                             create: typing.Callable[[], typing.Any]) -> JSONFragment:
+        """Returns the JSON of what create returns, only calling it again once version changed for that key."""
+        cached = self.encoded_fragments.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+        encoded = JSONFragment(self.dumper(create()))
+        self.encoded_fragments[key] = version, encoded
+        return encoded
+
+    def get_encoded_players(self) -> JSONFragment:
+        return self.get_encoded_fragment("players", self.players_generation, self.get_players_package)
+
+    def get_data_package_msg(self, games: typing.Optional[typing.AbstractSet[str]] = None) -> str:
+        """Returns the encoded DataPackage message for the given games, or for all games,
+        spliced together from the data packages encoded at load."""
+        if games is None and self.encoded_data_package is not None:
+            return self.encoded_data_package
+        msg = '[{"cmd":"DataPackage","data":{"games":{' + ",".join(
+            f"{encode(game_name)}:{encoded_package}" for game_name, encoded_package
+            in self.encoded_game_packages.items() if games is None or game_name in games) + "}}}]"
+        if games is None:
+            self.encoded_data_package = msg
+        return msg
 
     def item_names_for_game(self, game: str) -> typing.Optional[typing.Dict[str, int]]:
         return self.gamespackage[game]["item_name_to_id"] if game in self.gamespackage else None
@@ -279,6 +438,13 @@ class Context:
     def location_names_for_game(self, game: str) -> typing.Optional[typing.Dict[str, int]]:
         return self.gamespackage[game]["location_name_to_id"] if game in self.gamespackage else None
 
+    def get_name_index(self, key: typing.Hashable, names: typing.Iterable[str]) -> Utils.FuzzyIndex:
+        """Returns the fuzzy search index of names, only building it once for that key until game data changes."""
+        index = self.name_indexes.get(key)
+        if index is None:
+            index = self.name_indexes[key] = Utils.FuzzyIndex(names)
+        return index
+
     # General networking
     async def send_msgs(self, endpoint: Endpoint, msgs: typing.Iterable[dict]) -> bool:
         if not endpoint.socket or not endpoint.socket.open:
@@ -342,6 +508,63 @@ class Context:
         msgs = self.dumper(msgs)
         async_start(self.broadcast_send_encoded_msgs(endpoints, msgs))
 
+    def publish_tracker_event(self, *event: typing.Any):
+        """Queue an event for the clients subscribed to the tracker stream.
+        Events queued during one iteration of the event loop are sent together."""
+        if self.tracker_subscribers:
+            if not self.tracker_events:
+                asyncio.get_running_loop().call_soon(self._send_tracker_events)
+            self.tracker_events.append(list(event))
+
+    def _send_tracker_events(self):
+        events, self.tracker_events = self.tracker_events, []
+        self.broadcast(list(self.tracker_subscribers), [{"cmd": "TrackerEvents", "events": events}])
+
+    def get_stored_data_targets(self, key: str) -> typing.Set[Client]:
+        """Clients subscribed to key, directly or through a prefix of it."""
+        targets: typing.Set[Client] = set(self.stored_data_notification_clients.get(key, ()))
+        targets |= self.stored_data_notification_prefixes.get_clients(key)
+        return targets
+
+    def get_stored_data_keys(self, prefix: str) -> typing.List[str]:
+        """Keys of stored_data starting with prefix, in sorted order."""
+        if self.stored_data_keys is None:
+            self.stored_data_keys = sorted(self.stored_data)
+        keys = self.stored_data_keys
+        return list(itertools.takewhile(lambda key: key.startswith(prefix),
+                                        itertools.islice(keys, bisect.bisect_left(keys, prefix), None)))
+
+    def queue_set_reply(self, endpoints: typing.Iterable[Client], msg: dict):
+        """Queue a SetReply for endpoints. Replies queued during one iteration of the event loop are sent to each
+        client as one message. The reply is encoded right away, as later Sets may modify its value in place."""
+        if not self.set_replies:
+            asyncio.get_running_loop().call_soon(self._send_set_replies)
+        index = len(self.set_replies)
+        self.set_replies.append(self.dumper([msg])[1:-1])
+        for endpoint in endpoints:
+            self.set_reply_targets.setdefault(endpoint, []).append(index)
+
+    def _send_set_replies(self):
+        replies, self.set_replies = self.set_replies, []
+        targets, self.set_reply_targets = self.set_reply_targets, {}
+        # clients that get the same replies, such as subscribers of the same keys, share one encoded message
+        groups: typing.Dict[typing.Tuple[int, ...], typing.List[Client]] = {}
+        for endpoint, indexes in targets.items():
+            groups.setdefault(tuple(indexes), []).append(endpoint)
+        for indexes, endpoints in groups.items():
+            msg = "[" + ",".join(replies[index] for index in indexes) + "]"
+            async_start(self.broadcast_send_encoded_msgs(endpoints, msg))
+
+    def get_tracker_snapshot(self) -> typing.List[list]:
+        """The current state as tracker events, sent when subscribing."""
+        events = []
+        for team, slots in self.clients.items():
+            for slot in slots:
+                events.append(["checks", team, slot, len(self.location_checks[team, slot]), []])
+                events.append(["items", team, slot, len(get_received_items(self, team, slot, True)), []])
+                events.append(["status", team, slot, self.client_game_state[team, slot]])
+        return events
+
     async def disconnect(self, endpoint: Client):
         if endpoint in self.endpoints:
             self.endpoints.remove(endpoint)
@@ -375,19 +598,17 @@ class Context:
                     raise Exception("No .archipelago found in archive.")
         else:
             with open(multidatapath, 'rb') as f:
-                data = f.read()
+                # sections are read on demand, so map the file instead of reading all of it
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
         self._load(self.decompress(data), {}, use_embedded_server_options)
         self.data_filename = multidatapath
 
     @staticmethod
-    def decompress(data: bytes) -> dict:
-        format_version = data[0]
-        if format_version > 3:
-            raise Utils.VersionException("Incompatible multidata.")
-        return restricted_loads(zlib.decompress(data[1:]))
+    def decompress(data: bytes) -> typing.MutableMapping[str, typing.Any]:
+        return load_multidata(data)
 
-    def _load(self, decoded_obj: dict, game_data_packages: typing.Dict[str, typing.Any],
+    def _load(self, decoded_obj: typing.MutableMapping[str, typing.Any], game_data_packages: typing.Dict[str, typing.Any],
               use_embedded_server_options: bool):
 
         self.read_data = {}
@@ -423,10 +644,11 @@ class Context:
         self.seed_name = decoded_obj["seed_name"]
         self.random.seed(self.seed_name)
         self.connect_names = decoded_obj['connect_names']
-        self.locations = LocationStore(decoded_obj.pop("locations"))  # pre-emptively free memory
+        locations = decoded_obj.pop("locations")  # pre-emptively free memory
+        self.locations = locations if isinstance(locations, LocationStore) else LocationStore(locations)
         self.slot_data = decoded_obj['slot_data']
-        for slot, data in self.slot_data.items():
-            self.read_data[f"slot_data_{slot}"] = lambda data=data: data
+        for slot in self.slot_data:
+            self.read_data[f"slot_data_{slot}"] = lambda slot=slot: self.slot_data[slot]
         self.er_hint_data = {int(player): {int(address): name for address, name in loc_data.items()}
                              for player, loc_data in decoded_obj["er_hint_data"].items()}
 
@@ -467,7 +689,9 @@ class Context:
     # saving
 
     def save(self, now=False) -> bool:
+        """Mark state as changed that is not covered by the save journal, so the next save writes a snapshot."""
         if self.saving:
+            self.snapshot_dirty = True
             if now:
                 self.save_dirty = False
                 return self._save()
@@ -477,17 +701,55 @@ class Context:
 
         return False
 
+    def journal(self, kind: str, key: typing.Any, value: typing.Any) -> bool:
+        """Record a change to get_save()[kind][key] to be appended to the save journal by the next save."""
+        if self.saving:
+            self.save_journal.append((kind, key, value))
+            self.save_dirty = True
+            return True
+
+        return False
+
     def _save(self, exit_save: bool = False) -> bool:
         try:
-            encoded_save = pickle.dumps(self.get_save())
-            with open(self.save_filename, "wb") as f:
-                f.write(zlib.compress(encoded_save))
+            self._write_save(exit_save)
         except Exception as e:
             logging.exception(e)
             return False
         else:
             return True
 
+    def _write_save(self, exit_save: bool = False):
+        try:
+            if exit_save or self.snapshot_dirty or self.journal_length >= self.journal_compaction_length:
+                # entries recorded while snapshotting stay in the new journal, as they may be missing from the snapshot
+                self.save_journal = collections.deque()
+                self.snapshot_dirty = False
+                self.save_generation += 1
+                self.journal_length = 0
+                encoded_save = pickle.dumps(self.get_save())
+                self._write_snapshot(encoded_save)
+            elif self.save_journal:
+                entries = [self.save_journal.popleft() for _ in range(len(self.save_journal))]
+                self.journal_length += len(entries)
+                self._write_journal(pickle.dumps((self.save_generation, entries)))
+        except BaseException:
+            self.snapshot_dirty = True
+            raise
+
+    @property
+    def journal_filename(self) -> str:
+        return self.save_filename + "_journal"
+
+    def _write_snapshot(self, encoded_save: bytes):
+        with open(self.save_filename, "wb") as f:
+            f.write(zlib.compress(encoded_save))
+        open(self.journal_filename, "wb").close()
+
+    def _write_journal(self, encoded_record: bytes):
+        with open(self.journal_filename, "ab") as f:
+            f.write(encoded_record)
+
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
@@ -499,7 +761,12 @@ class Context:
             try:
                 with open(self.save_filename, 'rb') as f:
                     save_data = restricted_loads(zlib.decompress(f.read()))
-                    self.set_save(save_data)
+                try:
+                    with open(self.journal_filename, 'rb') as f:
+                        journal_length = apply_save_journal(save_data, read_save_journal(f.read()))
+                except FileNotFoundError:
+                    journal_length = 0
+                self.set_save(save_data, journal_length)
             except FileNotFoundError:
                 logging.error('No save data found, starting a new game')
             except Exception as e:
@@ -521,12 +788,14 @@ class Context:
                         time.sleep(max(1.0, next_wakeup))
                         if self.save_dirty:
                             logging.debug("Saving via thread.")
-                            self._save()
+                            # cleared before saving, so that changes made while saving are saved next time
+                            self.save_dirty = False
+                            if not self._save():
+                                self.save_dirty = True
                     except OperationalError as e:
+                        self.save_dirty = True
                         logging.exception(e)
                         logging.info(f"Saving failed. Retry in {self.auto_save_interval} seconds.")
-                    else:
-                        self.save_dirty = False
             self.auto_saver_thread = threading.Thread(target=save_regularly, daemon=True)
             self.auto_saver_thread.start()
 
@@ -537,6 +806,7 @@ class Context:
         self.recheck_hints()
         d = {
             "version": self.save_version,
+            "generation": self.save_generation,
             "connect_names": self.connect_names,
             "received_items": self.received_items,
             "hints_used": dict(self.hints_used),
@@ -561,14 +831,18 @@ class Context:
 
         return d
 
-    def set_save(self, savedata: dict):
+    def set_save(self, savedata: dict, journal_length: int = 0):
         if self.connect_names != savedata["connect_names"]:
             raise Exception("This savegame does not appear to match the loaded multiworld.")
         if savedata["version"] > self.save_version:
             raise Exception("This savegame is newer than the server.")
+        self.save_generation = savedata.get("generation", 0)
+        self.journal_length = journal_length
+        self.snapshot_dirty = False
         self.received_items = savedata["received_items"]
         self.hints_used.update(savedata["hints_used"])
         self.hints.update(savedata["hints"])
+        self.hints_to_recheck.update(self.hints)
 
         self.name_aliases.update(savedata["name_aliases"])
         self.client_game_state.update(savedata["client_game_state"])
@@ -597,6 +871,7 @@ class Context:
 
         if "stored_data" in savedata:
             self.stored_data = savedata["stored_data"]
+            self.stored_data_keys = None
         # count items and slots from lists for items_handling = remote
         logging.info(
             f'Loaded save file with {sum([len(v) for k, v in self.received_items.items() if k[2]])} received items '
@@ -610,12 +885,14 @@ class Context:
         return 0
 
     def recheck_hints(self, team: typing.Optional[int] = None, slot: typing.Optional[int] = None):
-        for hint_team, hint_slot in self.hints:
+        for hint_team, hint_slot in list(self.hints_to_recheck):
             if (team is None or team == hint_team) and (slot is None or slot == hint_slot):
-                self.hints[hint_team, hint_slot] = {
-                    hint.re_check(self, hint_team) for hint in
-                    self.hints[hint_team, hint_slot]
-                }
+                self.hints_to_recheck.discard((hint_team, hint_slot))
+                if (hint_team, hint_slot) in self.hints:
+                    self.hints[hint_team, hint_slot] = {
+                        hint.re_check(self, hint_team) for hint in
+                        self.hints[hint_team, hint_slot]
+                    }
 
     def get_rechecked_hints(self, team: int, slot: int):
         self.recheck_hints(team, slot)
@@ -676,9 +953,13 @@ class Context:
                 # we can check once if hint already exists
                 if hint not in self.hints[team, hint.finding_player]:
                     self.hints[team, hint.finding_player].add(hint)
+                    self.journal("hints", (team, hint.finding_player), {hint})
+                    self.publish_tracker_event("hint", team, hint.finding_player, hint.receiving_player,
+                                               hint.location, hint.item, hint.entrance)
                     new_hint_events.add(hint.finding_player)
                     for player in self.slot_set(hint.receiving_player):
                         self.hints[team, player].add(hint)
+                        self.journal("hints", (team, player), {hint})
                         new_hint_events.add(player)
 
             logging.info("Notice (Team #%d): %s" % (team + 1, format_hint(self, team, hint)))
@@ -706,9 +987,9 @@ class Context:
 
     def on_new_hint(self, team: int, slot: int):
         key: str = f"_read_hints_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        targets: typing.Set[Client] = self.get_stored_data_targets(key)
         if targets:
-            self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.hints[team, slot]}])
+            self.queue_set_reply(targets, {"cmd": "SetReply", "key": key, "value": self.hints[team, slot]})
         self.broadcast(self.clients[team][slot], [{
             "cmd": "RoomUpdate",
             "hint_points": get_slot_points(self, team, slot)
@@ -716,14 +997,15 @@ class Context:
 
     def on_client_status_change(self, team: int, slot: int):
         key: str = f"_read_client_status_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        targets: typing.Set[Client] = self.get_stored_data_targets(key)
         if targets:
-            self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.client_game_state[team, slot]}])
+            self.queue_set_reply(targets, {"cmd": "SetReply", "key": key, "value": self.client_game_state[team, slot]})
 
 
 def update_aliases(ctx: Context, team: int):
-    cmd = ctx.dumper([{"cmd": "RoomUpdate",
-                       "players": ctx.get_players_package()}])
+    ctx.players_generation += 1
+    cmd = encode_messages([{"cmd": "RoomUpdate",
+                            "players": ctx.get_encoded_players()}])
 
     for clients in ctx.clients[team].values():
         for client in clients:
@@ -766,10 +1048,10 @@ async def on_client_connected(ctx: Context, client: Client):
                 )
     games = {ctx.games[x] for x in range(1, len(ctx.games) + 1)}
     games.add("Archipelago")
-    await ctx.send_msgs(client, [{
+    await ctx.send_encoded_msgs(client, encode_messages([{
         'cmd': 'RoomInfo',
         'password': bool(ctx.password),
-        'games': games,
+        'games': ctx.get_encoded_fragment("games", 0, lambda: games),
         # tags are for additional features in the communication.
         # Name them by feature or fork, as you feel is appropriate.
         'tags': ctx.tags,
@@ -778,13 +1060,16 @@ async def on_client_connected(ctx: Context, client: Client):
         'permissions': get_permissions(ctx),
         'hint_cost': ctx.hint_cost,
         'location_check_points': ctx.location_check_points,
-        'datapackage_versions': {game: game_data["version"] for game, game_data
-                                 in ctx.gamespackage.items() if game in games},
-        'datapackage_checksums': {game: game_data["checksum"] for game, game_data
-                                  in ctx.gamespackage.items() if game in games and "checksum" in game_data},
+        'datapackage_versions': ctx.get_encoded_fragment(
+            "datapackage_versions", 0, lambda: {game: game_data["version"] for game, game_data
+                                                in ctx.gamespackage.items() if game in games}),
+        'datapackage_checksums': ctx.get_encoded_fragment(
+            "datapackage_checksums", 0, lambda: {game: game_data["checksum"] for game, game_data
+                                                 in ctx.gamespackage.items()
+                                                 if game in games and "checksum" in game_data}),
         'seed_name': ctx.seed_name,
         'time': time.time(),
-    }])
+    }]))
 
 
 def get_permissions(ctx) -> typing.Dict[str, Permission]:
@@ -815,13 +1100,17 @@ async def on_client_joined(ctx: Context, client: Client):
                               "If your client supports it, "
                               "you may have additional local commands you can list with /help.",
                       {"type": "Tutorial"})
-    ctx.client_connection_timers[client.team, client.slot] = datetime.datetime.now(datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ctx.client_connection_timers[client.team, client.slot] = now
+    ctx.journal("client_connection_timers", (client.team, client.slot), now.timestamp())
 
 
 async def on_client_left(ctx: Context, client: Client):
     if len(ctx.clients[client.team][client.slot]) < 1:
         update_client_status(ctx, client, ClientStatus.CLIENT_UNKNOWN)
-        ctx.client_connection_timers[client.team, client.slot] = datetime.datetime.now(datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        ctx.client_connection_timers[client.team, client.slot] = now
+        ctx.journal("client_connection_timers", (client.team, client.slot), now.timestamp())
     ctx.broadcast_text_all(
         "%s (Team #%d) has left the game" % (ctx.get_aliased_name(client.team, client.slot), client.team + 1),
         {"type": "Part", "team": client.team, "slot": client.slot})
@@ -885,20 +1174,21 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """Send the items received since the last call to the clients of the slots that received them."""
+    item_receivers, ctx.item_receivers = ctx.item_receivers, set()
+    for team, slot in sorted(item_receivers):
+        for client in ctx.clients[team].get(slot, ()):
+            if client.no_items:
+                continue
+            start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
+            items = get_received_items(ctx, team, slot, client.remote_items)
+            if len(start_inventory) + len(items) > client.send_index:
+                first_new_item = max(0, client.send_index - len(start_inventory))
+                async_start(ctx.send_msgs(client, [{
+                    "cmd": "ReceivedItems",
+                    "index": client.send_index,
+                    "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
+                client.send_index = len(start_inventory) + len(items)
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
@@ -941,11 +1231,17 @@ def get_remaining(ctx: Context, team: int, slot: int) -> typing.List[int]:
 
 
 def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem):
+    items_from_others = [item for item in items if item.player != target_slot]
     for target in ctx.slot_set(target_slot):
-        for item in items:
-            if item.player != target_slot:
-                get_received_items(ctx, team, target, False).append(item)
-            get_received_items(ctx, team, target, True).append(item)
+        ctx.item_receivers.add((team, target))
+        if items_from_others:
+            received_items = get_received_items(ctx, team, target, False)
+            received_items.extend(items_from_others)
+            ctx.journal("received_items", (team, target, False), (len(received_items), items_from_others))
+        received_items = get_received_items(ctx, team, target, True)
+        received_items.extend(items)
+        ctx.journal("received_items", (team, target, True), (len(received_items), list(items)))
+        ctx.publish_tracker_event("items", team, target, len(received_items), [item.item for item in items])
 
 
 def register_location_checks(ctx: Context, team: int, slot: int, locations: typing.Iterable[int],
@@ -954,19 +1250,32 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
     new_locations.intersection_update(ctx.locations[slot])  # ignore location IDs unknown to this multidata
     if new_locations:
         if count_activity:
-            ctx.client_activity_timers[team, slot] = datetime.datetime.now(datetime.timezone.utc)
+            ctx.client_activity_timers[team, slot] = now = datetime.datetime.now(datetime.timezone.utc)
+            ctx.journal("client_activity_timers", (team, slot), now.timestamp())
+        # collect everything the checks cause first, so each client only gets one message per kind
+        new_items: typing.Dict[int, typing.List[NetworkItem]] = collections.defaultdict(list)
+        info_texts: typing.List[dict] = []
         for location in new_locations:
             item_id, target_player, flags = ctx.locations[slot][location]
             new_item = NetworkItem(item_id, location, slot, flags)
-            send_items_to(ctx, team, target_player, new_item)
+            new_items[target_player].append(new_item)
 
             logging.info('(Team #%d) %s sent %s to %s (%s)' % (
                 team + 1, ctx.player_names[(team, slot)], ctx.item_names[item_id],
                 ctx.player_names[(team, target_player)], ctx.location_names[location]))
-            info_text = json_format_send_event(new_item, target_player)
-            ctx.broadcast_team(team, [info_text])
+            info_texts.append(json_format_send_event(new_item, target_player))
+
+        for target_player, items in new_items.items():
+            send_items_to(ctx, team, target_player, *items)
+        ctx.broadcast_team(team, info_texts)
 
         ctx.location_checks[team, slot] |= new_locations
+        # only hints involving the finder or a receiver of these checks can have become found
+        ctx.hints_to_recheck.add((team, slot))
+        for target_player in new_items:
+            ctx.hints_to_recheck.update((team, player) for player in ctx.slot_set(target_player))
+        ctx.journal("location_checks", (team, slot), new_locations)
+        ctx.publish_tracker_event("checks", team, slot, len(ctx.location_checks[team, slot]), new_locations)
         send_new_items(ctx)
         ctx.broadcast(ctx.clients[team][slot], [{
             "cmd": "RoomUpdate",
@@ -974,8 +1283,6 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             "checked_locations": new_locations,  # send back new checks only
         }])
 
-        ctx.save()
-
 
 def collect_hints(ctx: Context, team: int, slot: int, item: typing.Union[int, str]) -> typing.List[NetUtils.Hint]:
     hints = []
@@ -1043,8 +1350,15 @@ def json_format_send_event(net_item: NetworkItem, receiving_player: int):
             "item": net_item}
 
 
-def get_intended_text(input_text: str, possible_answers) -> typing.Tuple[str, bool, str]:
-    picks = Utils.get_fuzzy_results(input_text, possible_answers, limit=2)
+def get_intended_text(input_text: str, possible_answers: typing.Union[typing.Collection[str], Utils.FuzzyIndex]) \
+        -> typing.Tuple[str, bool, str]:
+    if isinstance(possible_answers, Utils.FuzzyIndex):
+        exact = possible_answers.get_exact(input_text)
+        if exact is not None and len(possible_answers) > 1:
+            return exact, True, "Perfect Match"
+        picks = possible_answers.get_results(input_text, limit=2)
+    else:
+        picks = Utils.get_fuzzy_results(input_text, possible_answers, limit=2)
     if len(picks) > 1:
         dif = picks[0][1] - picks[1][1]
         if picks[0][1] == 100:
@@ -1399,15 +1713,20 @@ class ClientMessageProcessor(CommonCommandProcessor):
     def _cmd_getitem(self, item_name: str) -> bool:
         """Cheat in an item, if it is enabled on this server"""
         if self.ctx.item_cheat:
-            names = self.ctx.item_names_for_game(self.ctx.games[self.client.slot])
+            game = self.ctx.games[self.client.slot]
+            names = self.ctx.item_names_for_game(game)
             item_name, usable, response = get_intended_text(
                 item_name,
-                names
+                self.ctx.get_name_index(("items", game), names)
             )
             if usable:
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
-                get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
-                get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                for remote_items in (False, True):
+                    received_items = get_received_items(self.ctx, self.client.team, self.client.slot, remote_items)
+                    received_items.append(new_item)
+                    self.ctx.journal("received_items", (self.client.team, self.client.slot, remote_items),
+                                     (len(received_items), [new_item]))
+                self.ctx.item_receivers.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -1455,9 +1774,10 @@ class ClientMessageProcessor(CommonCommandProcessor):
             if game not in self.ctx.all_item_and_group_names:
                 self.output("Can't look up item/location for unknown game. Hint for ID instead.")
                 return False
-            names = self.ctx.all_location_and_group_names[game] \
+            names = self.ctx.get_name_index(("locations_and_groups", game),
+                                            self.ctx.all_location_and_group_names[game]) \
                 if for_location else \
-                self.ctx.all_item_and_group_names[game]
+                self.ctx.get_name_index(("items_and_groups", game), self.ctx.all_item_and_group_names[game])
             hint_name, usable, response = get_intended_text(input_text, names)
 
             if usable:
@@ -1513,6 +1833,8 @@ class ClientMessageProcessor(CommonCommandProcessor):
                     hints.append(hint)
                     can_pay -= 1
                     self.ctx.hints_used[self.client.team, self.client.slot] += 1
+                    self.ctx.journal("hints_used", (self.client.team, self.client.slot),
+                                     self.ctx.hints_used[self.client.team, self.client.slot])
                     points_available = get_client_points(self.ctx, self.client)
 
                 if not_found_hints:
@@ -1529,7 +1851,6 @@ class ClientMessageProcessor(CommonCommandProcessor):
                                     f"You have {points_available} points and need at least "
                                     f"{self.ctx.get_hint_cost(self.client.slot)}.")
                 self.ctx.notify_hints(self.client.team, hints)
-                self.ctx.save()
                 return True
 
         else:
@@ -1640,13 +1961,19 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             client.version = args['version']
             client.tags = args['tags']
             client.no_locations = 'TextOnly' in client.tags or 'Tracker' in client.tags
+            # checks are only ever added, so their count tells whether the cached lists are still current
+            checks_version = len(ctx.location_checks[team, slot])
             connected_packet = {
                 "cmd": "Connected",
                 "team": client.team, "slot": client.slot,
-                "players": ctx.get_players_package(),
-                "missing_locations": get_missing_checks(ctx, team, slot),
-                "checked_locations": get_checked_checks(ctx, team, slot),
-                "slot_info": ctx.slot_info,
+                "players": ctx.get_encoded_players(),
+                "missing_locations": ctx.get_encoded_fragment(
+                    ("missing_locations", team, slot), checks_version,
+                    lambda: get_missing_checks(ctx, team, slot)),
+                "checked_locations": ctx.get_encoded_fragment(
+                    ("checked_locations", team, slot), checks_version,
+                    lambda: get_checked_checks(ctx, team, slot)),
+                "slot_info": ctx.get_encoded_fragment("slot_info", 0, lambda: ctx.slot_info),
                 "hint_points": get_slot_points(ctx, team, slot),
             }
             reply = [connected_packet]
@@ -1659,29 +1986,30 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 client.auth = True
                 await on_client_joined(ctx, client)
             if args.get("slot_data", True):
-                connected_packet["slot_data"] = ctx.slot_data[client.slot]
-            await ctx.send_msgs(client, reply)
+                connected_packet["slot_data"] = ctx.get_encoded_fragment(
+                    ("slot_data", client.slot), 0, lambda: ctx.slot_data[client.slot])
+            await ctx.send_encoded_msgs(client, encode_messages(reply))
 
     elif cmd == "GetDataPackage":
         exclusions = args.get("exclusions", [])
         if "games" in args:
-            games = {name: game_data for name, game_data in ctx.gamespackage.items()
-                     if name in set(args.get("games", []))}
-            await ctx.send_msgs(client, [{"cmd": "DataPackage",
-                                          "data": {"games": games}}])
+            await ctx.send_encoded_msgs(client, ctx.get_data_package_msg(set(args.get("games", []))))
         # TODO: remove exclusions behaviour around 0.5.0
         elif exclusions:
             exclusions = set(exclusions)
-            games = {name: game_data for name, game_data in ctx.gamespackage.items()
-                     if name not in exclusions}
-
-            package = {"games": games}
-            await ctx.send_msgs(client, [{"cmd": "DataPackage",
-                                          "data": package}])
+            await ctx.send_encoded_msgs(client, ctx.get_data_package_msg(
+                {name for name in ctx.encoded_game_packages if name not in exclusions}))
 
         else:
-            await ctx.send_msgs(client, [{"cmd": "DataPackage",
-                                          "data": {"games": ctx.gamespackage}}])
+            await ctx.send_encoded_msgs(client, ctx.get_data_package_msg())
+
+    elif cmd == "TrackerSubscribe":
+        if not ctx.tracker_token or args.get("token") != ctx.tracker_token:
+            await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments", 'text': cmd,
+                                          "original_cmd": cmd}])
+            return
+        ctx.tracker_subscribers.add(client)
+        await ctx.send_msgs(client, [{"cmd": "TrackerEvents", "events": ctx.get_tracker_snapshot()}])
 
     elif client.auth:
         if cmd == "ConnectUpdate":
@@ -1749,8 +2077,6 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                     hints.extend(collect_hint_location_id(ctx, client.team, client.slot, location))
                 locs.append(NetworkItem(target_item, location, target_player, flags))
             ctx.notify_hints(client.team, hints, only_new=create_as_hint == 2)
-            if locs and create_as_hint:
-                ctx.save()
             await ctx.send_msgs(client, [{'cmd': 'LocationInfo', 'locations': locs}])
 
         elif cmd == 'StatusUpdate':
@@ -1778,12 +2104,20 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                     await ctx.send_encoded_msgs(bounceclient, msg)
 
         elif cmd == "Get":
-            if "keys" not in args or type(args["keys"]) != list:
+            if "keys" not in args or type(args["keys"]) != list or type(args.get("prefixes", [])) != list or \
+                    type(args.get("offset", 0)) != int or type(args.get("limit", 0)) != int:
                 await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
                                               "text": 'Retrieve', "original_cmd": cmd}])
                 return
             args["cmd"] = "Retrieved"
-            keys = args["keys"]
+            keys = dict.fromkeys(args["keys"])
+            for prefix in args.get("prefixes", ()):
+                keys.update(dict.fromkeys(ctx.get_stored_data_keys(prefix)))
+            if "limit" in args:
+                offset = max(0, args.get("offset", 0))
+                end = offset + max(1, args["limit"])
+                args["next_offset"] = end if end < len(keys) else None
+                keys = itertools.islice(keys, offset, end)
             args["keys"] = {
                 key: ctx.read_data.get(key[6:], lambda: None)() if key.startswith("_read_") else
                      ctx.stored_data.get(key, None)
@@ -1803,21 +2137,25 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             for operation in args["operations"]:
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
+            if ctx.stored_data_keys is not None and args["key"] not in ctx.stored_data:
+                bisect.insort(ctx.stored_data_keys, args["key"])
             ctx.stored_data[args["key"]] = args["value"] = value
-            targets = set(ctx.stored_data_notification_clients[args["key"]])
+            targets = ctx.get_stored_data_targets(args["key"])
             if args.get("want_reply", True):
                 targets.add(client)
             if targets:
-                ctx.broadcast(targets, [args])
-            ctx.save()
+                ctx.queue_set_reply(targets, args)
+            ctx.journal("stored_data", args["key"], value)
 
         elif cmd == "SetNotify":
-            if "keys" not in args or type(args["keys"]) != list:
+            if "keys" not in args or type(args["keys"]) != list or type(args.get("prefixes", [])) != list:
                 await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
                                               "text": 'SetNotify', "original_cmd": cmd}])
                 return
             for key in args["keys"]:
                 ctx.stored_data_notification_clients[key].add(client)
+            for prefix in args.get("prefixes", ()):
+                ctx.stored_data_notification_prefixes.add(prefix, client)
 
 
 def update_client_status(ctx: Context, client: Client, new_status: ClientStatus):
@@ -1828,7 +2166,8 @@ def update_client_status(ctx: Context, client: Client, new_status: ClientStatus)
 
         ctx.client_game_state[client.team, client.slot] = new_status
         ctx.on_client_status_change(client.team, client.slot)
-        ctx.save()
+        ctx.journal("client_game_state", (client.team, client.slot), new_status)
+        ctx.publish_tracker_event("status", client.team, client.slot, new_status)
 
 
 class ServerCommandProcessor(CommonCommandProcessor):
@@ -1975,8 +2314,9 @@ class ServerCommandProcessor(CommonCommandProcessor):
         if usable:
             team, slot = self.ctx.player_name_lookup[seeked_player]
             item_name = " ".join(item_name)
-            names = self.ctx.item_names_for_game(self.ctx.games[slot])
-            item_name, usable, response = get_intended_text(item_name, names)
+            game = self.ctx.games[slot]
+            names = self.ctx.item_names_for_game(game)
+            item_name, usable, response = get_intended_text(item_name, self.ctx.get_name_index(("items", game), names))
             if usable:
                 amount: int = int(amount)
                 new_items = [NetworkItem(names[item_name], -1, 0) for _ in range(int(amount))]
@@ -2009,7 +2349,8 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif self.ctx.location_names_for_game(game) is not None:
-                location, usable, response = get_intended_text(full_name, self.ctx.location_names_for_game(game))
+                location, usable, response = get_intended_text(
+                    full_name, self.ctx.get_name_index(("locations", game), self.ctx.location_names_for_game(game)))
             else:
                 self.output("Can't look up location for unknown game. Send by ID instead.")
                 return False
@@ -2040,7 +2381,8 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 item, usable, response = int(full_name), True, None
             elif game in self.ctx.all_item_and_group_names:
-                item, usable, response = get_intended_text(full_name, self.ctx.all_item_and_group_names[game])
+                names = self.ctx.get_name_index(("items_and_groups", game), self.ctx.all_item_and_group_names[game])
+                item, usable, response = get_intended_text(full_name, names)
             else:
                 self.output("Can't look up item for unknown game. Hint for ID instead.")
                 return False
@@ -2079,7 +2421,8 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif self.ctx.location_names_for_game(game) is not None:
-                location, usable, response = get_intended_text(full_name, self.ctx.location_names_for_game(game))
+                location, usable, response = get_intended_text(
+                    full_name, self.ctx.get_name_index(("locations", game), self.ctx.location_names_for_game(game)))
             else:
                 self.output("Can't look up location for unknown game. Hint for ID instead.")
                 return False
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import typing
 import enum
+import mmap
+import pickle
+import struct
 import warnings
+import zlib
 from json import JSONEncoder, JSONDecoder
 
 import websockets
 
-from Utils import ByValue, Version
+from Utils import ByValue, Version, VersionException, restricted_loads
 
 
 class JSONMessagePart(typing.TypedDict, total=False):
@@ -83,10 +87,10 @@ class NetworkItem(typing.NamedTuple):
 
 
 def _scan_for_TypedTuples(obj: typing.Any) -> typing.Any:
+    if type(obj) in _json_leaf_types:
+        return obj
     if isinstance(obj, tuple) and hasattr(obj, "_fields"):  # NamedTuple is not actually a parent class
-        data = obj._asdict()
-        data["class"] = obj.__class__.__name__
-        return data
+        return _typed_tuple_to_dict(obj)
     if isinstance(obj, (tuple, list, set, frozenset)):
         return tuple(_scan_for_TypedTuples(o) for o in obj)
     if isinstance(obj, dict):
@@ -94,6 +98,27 @@ def _scan_for_TypedTuples(obj: typing.Any) -> typing.Any:
     return obj
 
 
+_json_leaf_types = {str, int, bool, float, type(None)}
+
+# the NamedTuples sent in bulk, converted without going through _asdict()
+_typed_tuple_converters: typing.Dict[type, typing.Callable[[typing.Any], typing.Dict[str, typing.Any]]] = {
+    NetworkItem: lambda item: {"item": item[0], "location": item[1], "player": item[2], "flags": item[3],
+                               "class": "NetworkItem"},
+    NetworkPlayer: lambda player: {"team": player[0], "slot": player[1], "alias": player[2], "name": player[3],
+                                   "class": "NetworkPlayer"},
+    NetworkSlot: lambda slot: {"name": slot[0], "game": slot[1], "type": slot[2], "group_members": slot[3],
+                               "class": "NetworkSlot"},
+}
+
+
+def _typed_tuple_to_dict(obj: typing.NamedTuple) -> typing.Dict[str, typing.Any]:
+    converter = _typed_tuple_converters.get(type(obj))
+    if converter:
+        return converter(obj)
+    data = obj._asdict()
+    data["class"] = obj.__class__.__name__
+    return data
+
 _encode = JSONEncoder(
     ensure_ascii=False,
     check_circular=False,
@@ -101,10 +126,47 @@ _encode = JSONEncoder(
 ).encode
 
 
+def _encode_default(obj: typing.Any) -> typing.Any:
+    """Converts what orjson can't serialize itself the same way _scan_for_TypedTuples does."""
+    if isinstance(obj, tuple) and hasattr(obj, "_fields"):
+        return _typed_tuple_to_dict(obj)
+    if isinstance(obj, (tuple, set, frozenset)):
+        return tuple(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 def encode(obj: typing.Any) -> str:
+    """Encodes obj as JSON of the network protocol, turning NamedTuples into dicts with their class name.
+    Uses orjson when it's installed, which serializes the protocol types without copying the message first.
+    Both give the same output, except for the exponent notation of floats and non-finite floats."""
+    if orjson:
+        try:
+            return orjson.dumps(obj, default=_encode_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            pass  # such as integers over 64 bits, which the json module can handle
     return _encode(_scan_for_TypedTuples(obj))
 
 
+class JSONFragment(str):
+    """Already encoded JSON, spliced into a message by encode_messages as it is."""
+    __slots__ = ()
+
+
+def encode_messages(msgs: typing.Iterable[typing.Dict[str, typing.Any]]) -> str:
+    """Encodes a list of messages like encode does, except that JSONFragment values of the messages are spliced in
+    instead of being encoded as strings."""
+    return "[" + ",".join(
+        "{" + ",".join(f"{_encode(key)}:{value if type(value) is JSONFragment else encode(value)}"
+                       for key, value in msg.items()) + "}"
+        for msg in msgs) + "]"
+
+
 def get_any_version(data: dict) -> Version:
     data = {key.lower(): value for key, value in data.items()}  # .NET version classes have capitalized keys
     return Version(int(data["major"]), int(data["minor"]), int(data["build"]))
@@ -346,6 +408,10 @@ class Hint(typing.NamedTuple):
         return self.receiving_player == self.finding_player
 
 
+# receiver -> item -> (sender, location, item, receiver, flags)
+_ReceiverIndex = typing.Dict[int, typing.Dict[int, typing.List[typing.Tuple[int, int, int, int, int]]]]
+
+
 class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
     def __init__(self, values: typing.MutableMapping[int, typing.Dict[int, typing.Tuple[int, int, int]]]):
         super().__init__(values)
@@ -359,20 +425,37 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
         if len(self.get(0, {})):
             raise ValueError("Invalid player id 0 for location")
 
+        self._receiver_index: typing.Optional[_ReceiverIndex] = None
+
+    @classmethod
+    def from_buffer(cls, buffer: typing.Union[bytes, memoryview]) -> _LocationStore:
+        return cls(unpack_locations(buffer))
+
+    def _get_receiver_index(self) -> _ReceiverIndex:
+        """Entries by receiver and item, each in sender and location order.
+        Built on first use, so the store must not be modified afterwards."""
+        if self._receiver_index is None:
+            receiver_index: _ReceiverIndex = {}
+            for sender, locations in sorted(self.items()):
+                for location, (item, receiver, flags) in sorted(locations.items()):
+                    receiver_index.setdefault(receiver, {}).setdefault(item, []).append(
+                        (sender, location, item, receiver, flags))
+            self._receiver_index = receiver_index
+        return self._receiver_index
+
     def find_item(self, slots: typing.Set[int], seeked_item_id: int
                   ) -> typing.Generator[typing.Tuple[int, int, int, int, int], None, None]:
-        for finding_player, check_data in self.items():
-            for location_id, (item_id, receiving_player, item_flags) in check_data.items():
-                if receiving_player in slots and item_id == seeked_item_id:
-                    yield finding_player, location_id, item_id, receiving_player, item_flags
+        receiver_index = self._get_receiver_index()
+        found = [entry for slot in slots for entry in receiver_index.get(slot, {}).get(seeked_item_id, ())]
+        if len(slots) > 1:
+            found.sort()  # in sender and location order, as if the store was scanned
+        yield from found
 
     def get_for_player(self, slot: int) -> typing.Dict[int, typing.Set[int]]:
-        import collections
-        all_locations: typing.Dict[int, typing.Set[int]] = collections.defaultdict(set)
-        for source_slot, location_data in self.items():
-            for location_id, values in location_data.items():
-                if values[1] == slot:
-                    all_locations[source_slot].add(location_id)
+        all_locations: typing.Dict[int, typing.Set[int]] = {}
+        for sender, location, _, _, _ in sorted(entry for entries in self._get_receiver_index().get(slot, {}).values()
+                                                for entry in entries):
+            all_locations.setdefault(sender, set()).add(location)
         return all_locations
 
     def get_checked(self, state: typing.Dict[typing.Tuple[int, int], typing.Set[int]], team: int, slot: int
@@ -404,6 +487,41 @@ class _LocationStore(dict, typing.MutableMapping[int, typing.Dict[int, typing.Tu
                        location_id not in checked])
 
 
+_location_store_header = struct.Struct("<QQ")  # entry count, sender index size
+_location_index_entry = struct.Struct("<QQ")  # start, count
+_location_entry = struct.Struct("<qIIqI4x")  # location, sender, receiver, item, flags
+
+
+def pack_locations(locations: typing.Mapping[int, typing.Mapping[int, typing.Sequence[int]]]) -> bytes:
+    """
+    Pack locations into the sorted entry array and sender index LocationStore uses in memory,
+    so LocationStore.from_buffer can use them in place on little endian 64bit platforms.
+    """
+    max_sender = max(locations, default=0)
+    index = [(0, 0)] * (max_sender + 1)
+    entries: typing.List[bytes] = []
+    for sender, sender_locations in sorted(locations.items()):
+        index[sender] = len(entries), len(sender_locations)
+        entries.extend(_location_entry.pack(location, sender, data[1], data[0], data[2] if len(data) > 2 else 0)
+                       for location, data in sorted(sender_locations.items()))
+    return b"".join((_location_store_header.pack(len(entries), len(index)),
+                     *(_location_index_entry.pack(*index_entry) for index_entry in index), *entries))
+
+
+def unpack_locations(buffer: typing.Union[bytes, memoryview]
+                     ) -> typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]]:
+    """Read the output of pack_locations back into the nested dict the LocationStore constructor takes."""
+    entry_count, index_size = _location_store_header.unpack_from(buffer)
+    entries_start = _location_store_header.size + index_size * _location_index_entry.size
+    if len(buffer) != entries_start + entry_count * _location_entry.size:
+        raise ValueError("Buffer size does not match LocationStore header")
+    locations: typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]] = \
+        {sender: {} for sender in range(1, index_size)}
+    for location, sender, receiver, item, flags in _location_entry.iter_unpack(buffer[entries_start:]):
+        locations[sender][location] = item, receiver, flags
+    return locations
+
+
 if typing.TYPE_CHECKING:  # type-check with pure python implementation until we have a typing stub
     LocationStore = _LocationStore
 else:
@@ -426,3 +544,120 @@ else:
             warnings.warn("_speedups not available. Falling back to pure python LocationStore. "
                           "Install a matching C++ compiler for your platform to compile _speedups.")
             LocationStore = _LocationStore
+
+
+multidata_format_version = 4
+"""format version of the container written by dump_multidata"""
+
+multidata_split_keys = frozenset(("slot_data", "checks_in_area", "precollected_items", "precollected_hints",
+                                  "er_hint_data", "datapackage"))
+"""multidata keys of which each slot's or game's value is stored as a separate section"""
+
+_multidata_index_size = struct.Struct("<I")
+_multidata_alignment = 8
+"""sections that are used in place are aligned to this, counted from the start of the data"""
+
+_SectionIndex = typing.Dict[typing.Any, typing.Union[typing.Tuple[int, int], typing.Tuple[int, int, str],
+                                                     "_SectionIndex"]]
+_Buffer = typing.Union[bytes, memoryview, mmap.mmap]
+
+
+def dump_multidata(multidata: typing.Mapping[str, typing.Any]) -> bytes:
+    """
+    Serialize multidata into independently compressed sections, so readers only have to decompress what they use.
+
+    The format version byte is followed by the size of the index as uint32, the compressed index, padding up to the
+    alignment and then the sections. The index maps each key to the offset and size of its section, counted from the
+    end of the padding. Keys in multidata_split_keys map to an index of their own, of each slot's or game's section.
+    Locations are not compressed, but stored as packed by pack_locations, which is marked in their index entry.
+    """
+    sections: typing.List[bytes] = []
+    offset = 0
+
+    def add_section(section: bytes) -> typing.Tuple[int, int]:
+        nonlocal offset
+        sections.append(section)
+        offset += len(section)
+        return offset - len(section), len(section)
+
+    def add_packed_section(section: bytes, kind: str) -> typing.Tuple[int, int, str]:
+        add_section(bytes(-offset % _multidata_alignment))
+        return (*add_section(section), kind)
+
+    index: _SectionIndex = {}
+    for key, value in multidata.items():
+        if key == "locations" and isinstance(value, (typing.Mapping, LocationStore)):
+            index[key] = add_packed_section(pack_locations(value), "locations")
+        elif key in multidata_split_keys and isinstance(value, typing.Mapping):
+            index[key] = {sub_key: add_section(zlib.compress(pickle.dumps(sub_value), 9))
+                          for sub_key, sub_value in value.items()}
+        else:
+            index[key] = add_section(zlib.compress(pickle.dumps(value), 9))
+    compressed_index = zlib.compress(pickle.dumps(index), 9)
+    header_size = 1 + _multidata_index_size.size + len(compressed_index)
+    return b"".join((bytes([multidata_format_version]), _multidata_index_size.pack(len(compressed_index)),
+                     compressed_index, bytes(-header_size % _multidata_alignment), *sections))
+
+
+def load_multidata(data: _Buffer) -> typing.MutableMapping[str, typing.Any]:
+    """Read multidata of any supported format version, lazily if it is sectioned."""
+    format_version = data[0]
+    if format_version > multidata_format_version:
+        raise VersionException("Incompatible multidata.")
+    if format_version < 4:
+        return restricted_loads(zlib.decompress(data[1:]))
+    index_start = 1 + _multidata_index_size.size
+    index_size, = _multidata_index_size.unpack_from(data, 1)
+    index = restricted_loads(zlib.decompress(data[index_start:index_start + index_size]))
+    header_size = index_start + index_size
+    return MultiData(data, header_size + -header_size % _multidata_alignment, index)
+
+
+class MultiData(typing.MutableMapping[typing.Any, typing.Any]):
+    """
+    Multidata read from the container written by dump_multidata.
+    Each section is only decompressed and unpickled when it is first accessed, split keys are MultiData themselves.
+    """
+    _data: _Buffer
+    _start: int
+    _index: _SectionIndex
+    _loaded: typing.Dict[typing.Any, typing.Any]
+
+    def __init__(self, data: _Buffer, start: int, index: _SectionIndex):
+        self._data = data
+        self._start = start
+        self._index = index
+        self._loaded = {}
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        if key in self._loaded:
+            return self._loaded[key]
+        section = self._index[key]
+        if isinstance(section, dict):
+            value = MultiData(self._data, self._start, section)
+        else:
+            offset, size, *kind = section
+            offset += self._start
+            if kind == ["locations"]:
+                value = LocationStore.from_buffer(memoryview(self._data)[offset:offset + size])
+            else:
+                value = restricted_loads(zlib.decompress(self._data[offset:offset + size]))
+        self._loaded[key] = value
+        return value
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        self._index.setdefault(key, (0, 0))
+        self._loaded[key] = value
+
+    def __delitem__(self, key: typing.Any) -> None:
+        del self._index[key]
+        self._loaded.pop(key, None)
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
@@ -511,6 +511,16 @@ async def snes_recv_loop(ctx: SNIContext) -> None:
 
 
 async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+    data = await snes_read_many(ctx, [(address, size)])
+    return data[0] if data is not None else None
+
+
+async def snes_read_many(ctx: SNIContext, ranges: typing.Sequence[typing.Tuple[int, int]]) \
+        -> typing.Optional[typing.List[bytes]]:
+    """Reads all (address, size) ranges with a single GetAddress request, returning their data in the same order.
+    Returns None if any of them could not be read."""
+    if not ranges:
+        return []
     try:
         await ctx.snes_request_lock.acquire()
 
@@ -525,22 +535,24 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
         GetAddress_Request: SNESRequest = {
             "Opcode": "GetAddress",
             "Space": "SNES",
-            "Operands": [hex(address)[2:], hex(size)[2:]]
+            "Operands": [operand for address, size in ranges for operand in (hex(address)[2:], hex(size)[2:])]
         }
         try:
             await ctx.snes_socket.send(dumps(GetAddress_Request))
         except ConnectionClosed:
             return None
 
+        total_size = sum(size for address, size in ranges)
         data: bytes = bytes()
-        while len(data) < size:
+        while len(data) < total_size:
             try:
                 data += await asyncio.wait_for(ctx.snes_recv_queue.get(), 5)
             except asyncio.TimeoutError:
                 break
 
-        if len(data) != size:
-            snes_logger.error('Error reading %s, requested %d bytes, received %d' % (hex(address), size, len(data)))
+        if len(data) != total_size:
+            snes_logger.error('Error reading %s, requested %d bytes, received %d' % (
+                ", ".join(hex(address) for address, size in ranges), total_size, len(data)))
             if len(data):
                 snes_logger.error(str(data))
                 snes_logger.warning('Communication Failure with SNI')
@@ -548,7 +560,12 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
                 await ctx.snes_socket.close()
             return None
 
-        return data
+        results: typing.List[bytes] = []
+        offset = 0
+        for address, size in ranges:
+            results.append(data[offset:offset + size])
+            offset += size
+        return results
     finally:
         ctx.snes_request_lock.release()
 
@@ -329,19 +329,58 @@ def get_file_safe_name(name: str) -> str:
     return "".join(c for c in name if c not in '<>:"/\\|?*')
 
 
+def _data_package_cache_path(game: str, checksum: str, extension: str) -> str:
+    if checksum != get_file_safe_name(checksum):
+        raise ValueError(f"Bad symbols in checksum: {checksum}")
+    return cache_path("datapackage", get_file_safe_name(game), f"{checksum}.{extension}")
+
+
+# file names in the data package cache folder of each game, listed once per process instead of checking each file
+_data_package_cache_index: typing.Dict[str, typing.Set[str]] = {}
+
+
+def _data_package_cache_files(game: str) -> typing.Set[str]:
+    folder = cache_path("datapackage", get_file_safe_name(game))
+    files = _data_package_cache_index.get(folder)
+    if files is None:
+        try:
+            files = set(os.listdir(folder))
+        except OSError:
+            files = set()
+        _data_package_cache_index[folder] = files
+    return files
+
+
+def _data_package_cache_file(game: str, checksum: str) -> typing.Optional[str]:
+    """Returns the path of the cached data package of game with checksum, preferring pickle over json."""
+    files = _data_package_cache_files(game)
+    for extension in ("pickle", "json"):
+        path = _data_package_cache_path(game, checksum, extension)
+        if os.path.basename(path) in files:
+            return path
+    return None
+
+
+def has_data_package_for_checksum(game: str, checksum: typing.Optional[str]) -> bool:
+    """Checks if the data package of game with checksum is cached, without loading it."""
+    return bool(checksum and game) and _data_package_cache_file(game, checksum) is not None
+
+
 def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) -> Dict[str, Any]:
     if checksum and game:
-        if checksum != get_file_safe_name(checksum):
-            raise ValueError(f"Bad symbols in checksum: {checksum}")
-        path = cache_path("datapackage", get_file_safe_name(game), f"{checksum}.json")
-        if os.path.exists(path):
+        path = _data_package_cache_file(game, checksum)
+        if path:
             try:
+                if path.endswith(".pickle"):
+                    with open(path, "rb") as f:
+                        return restricted_loads(f.read())
                 with open(path, "r", encoding="utf-8-sig") as f:
                     return json.load(f)
             except Exception as e:
                 logging.debug(f"Could not load data package: {e}")
+        return {}
 
-    # fall back to old cache
+    # data packages without a checksum were only kept in the old cache
     cache = persistent_load().get("datapackage", {}).get("games", {}).get(game, {})
     if cache.get("checksum") == checksum:
         return cache
@@ -353,15 +392,22 @@ def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) ->
 def store_data_package_for_checksum(game: str, data: typing.Dict[str, Any]) -> None:
     checksum = data.get("checksum")
     if checksum and game:
-        if checksum != get_file_safe_name(checksum):
-            raise ValueError(f"Bad symbols in checksum: {checksum}")
-        game_folder = cache_path("datapackage", get_file_safe_name(game))
-        os.makedirs(game_folder, exist_ok=True)
+        path = _data_package_cache_path(game, checksum, "pickle")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # written to a temporary file first, so a client reading the cache never loads a partially written package
+        import tempfile
+        temp_path: typing.Optional[str] = None
         try:
-            with open(os.path.join(game_folder, f"{checksum}.json"), "w", encoding="utf-8-sig") as f:
-                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path), suffix=".tmp", delete=False) as f:
+                temp_path = f.name
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            _data_package_cache_files(game).add(os.path.basename(path))
         except Exception as e:
             logging.debug(f"Could not store data package: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
 
 def get_default_adjuster_settings(game_name: str) -> Namespace:
     import LttPAdjuster
@@ -615,6 +661,60 @@ def get_fuzzy_results(input_word: str, wordlist: typing.Sequence[str], limit: ty
     )
 
 
+class FuzzyIndex:
+    """Search index over a fixed wordlist, giving the same results as get_fuzzy_results for that wordlist.
+    Words are bucketed by length, as the edit distance is at least the difference in length,
+    so buckets that cannot beat the best matches found so far are never compared."""
+    __slots__ = ("words", "_exact", "_buckets")
+
+    words: typing.Tuple[str, ...]
+    _exact: typing.Dict[str, str]
+    _buckets: typing.Tuple[typing.Tuple[int, int, typing.Tuple[typing.Tuple[int, str, str], ...]], ...]
+
+    def __init__(self, wordlist: typing.Iterable[str]):
+        self.words = tuple(wordlist)
+        self._exact = {}
+        buckets: typing.Dict[typing.Tuple[int, int], typing.List[typing.Tuple[int, str, str]]] = {}
+        for position, word in enumerate(self.words):
+            lowered = word.lower()
+            if lowered:
+                self._exact.setdefault(lowered, word)
+            buckets.setdefault((len(lowered), len(word)), []).append((position, word, lowered))
+        self._buckets = tuple((lowered_length, length, tuple(entries))
+                              for (lowered_length, length), entries in buckets.items())
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def get_exact(self, input_word: str) -> typing.Optional[str]:
+        """Returns the first word matching input_word ignoring case, which get_fuzzy_results would rank first."""
+        return self._exact.get(input_word.lower())
+
+    def get_results(self, input_word: str, limit: typing.Optional[int] = None) -> typing.List[typing.Tuple[str, int]]:
+        if not limit or limit >= len(self.words):
+            return get_fuzzy_results(input_word, self.words, limit)
+        import bisect
+        import jellyfish
+
+        lowered_input = input_word.lower()
+        buckets = sorted(
+            ((1 - abs(len(lowered_input) - lowered_length) / max(len(input_word), length),
+              max(len(input_word), length), entries)
+             for lowered_length, length, entries in self._buckets),
+            key=lambda bucket: bucket[0], reverse=True)
+        # (-ratio, position, word), so that equal ratios keep wordlist order like the stable sort does
+        best: typing.List[typing.Tuple[float, int, str]] = []
+        for bound, longest, entries in buckets:
+            if len(best) == limit and bound < -best[-1][0]:
+                break
+            for position, word, lowered in entries:
+                ratio = 1 - jellyfish.damerau_levenshtein_distance(lowered_input, lowered) / longest
+                if len(best) < limit or (-ratio, position) < best[-1][:2]:
+                    bisect.insort(best, (-ratio, position, word))
+                    del best[limit:]
+        return [(word, int(-negative_ratio * 100)) for negative_ratio, position, word in best]
+
+
 def open_filename(title: str, filetypes: typing.Sequence[typing.Tuple[str, typing.Sequence[str]]], suggest: str = "") \
         -> typing.Optional[str]:
     def run(*args: str):
@@ -24,6 +24,7 @@ app.jinja_env.filters['all'] = all
 app.config["SELFHOST"] = True  # application process is in charge of running the websites
 app.config["GENERATORS"] = 8  # maximum concurrent world gens
 app.config["SELFLAUNCH"] = True  # application process is in charge of launching Rooms.
+app.config["ROOM_WORKERS"] = 0  # if not 0, Rooms are hosted by up to this many processes instead of one process each
 app.config["SELFLAUNCHCERT"] = None  # can point to a SSL Certificate to encrypt Room websocket connections
 app.config["SELFLAUNCHKEY"] = None  # can point to a SSL Certificate Key to encrypt Room websocket connections
 app.config["SELFGEN"] = True  # application process is in charge of scheduling Generations.
@@ -50,6 +51,8 @@ app.config["PONY"] = {
 }
 app.config["MAX_ROLL"] = 20
 app.config["CACHE_TYPE"] = "SimpleCache"
+# size in bytes of the serialized seeds, data packages and saves the trackers of each process keep loaded
+app.config["TRACKER_CACHE_SIZE"] = 256 * 1024 * 1024
 app.config["HOST_ADDRESS"] = ""
 
 cache = Cache()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import multiprocessing
+import queue
 import threading
 import time
 import typing
@@ -14,14 +16,114 @@ from Utils import restricted_loads
 from .locker import Locker, AlreadyRunningException
 
 
-def launch_room(room: Room, config: dict):
-    # requires db_session!
-    if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout):
-        multiworld = multiworlds.get(room.id, None)
-        if not multiworld:
-            multiworld = MultiworldInstance(room, config)
+class Wakeup:
+    """Sleeps between scheduler ticks, backing off exponentially while idle, until woken by the web app.
+    Wake-ups only reach a scheduler running in the same process as the web app, so schedulers of a separately
+    served web app should not back off, see poll()."""
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 3.2):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.event = threading.Event()
+
+    def wake(self):
+        self.event.set()
+
+    def sleep(self, idle: bool):
+        self.interval = min(self.interval * 2, self.max_interval) if idle else self.min_interval
+        if self.event.wait(self.interval):
+            # the change that woke us may not be committed yet, so look again soon
+            self.interval = self.min_interval
+        self.event.clear()
+
+    def poll(self):
+        """Sleep a fixed min_interval, for when the web app can't wake this process."""
+        self.max_interval = self.min_interval
+
+
+autohost_wakeup = Wakeup()
+autogen_wakeup = Wakeup()
+
+
+def room_is_running(room_id) -> bool:
+    # requires guardian_lock!
+    if room_id in room_workers_by_room:
+        return True
+    multiworld = multiworlds.get(room_id, None)
+    return bool(multiworld and multiworld.process and multiworld.process.is_alive())
+
 
-        multiworld.start()
+def launch_room(room_id, config: dict):
+    if config["ROOM_WORKERS"]:
+        with guardian_lock:
+            if room_id not in room_workers_by_room:
+                get_room_worker(config).start_room(room_id)
+        return
+
+    multiworld = multiworlds.get(room_id, None)
+    if not multiworld:
+        multiworld = MultiworldInstance(room_id, config)
+
+    multiworld.start()
+
+
+class RoomScheduler:
+    """Keeps an index of rooms that should be running, only reading rooms with new activity from the DB."""
+    # last_activity is written by several processes, so re-read a bit of the past to not miss late commits
+    overlap = timedelta(seconds=5)
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.watermark = datetime.utcnow() - timedelta(days=3)
+        self.deadlines: typing.Dict[type(Room.id), datetime] = {}  # room_id -> last_activity + timeout
+        self.launched: typing.Set[type(Room.id)] = set()
+
+    def refresh(self) -> bool:
+        """Reads rooms with activity since the last refresh, returns whether any deadline changed."""
+        # requires db_session!
+        changed = False
+        now = datetime.utcnow()
+        for room_id, last_activity, timeout in select(
+                (room.id, room.last_activity, room.timeout) for room in Room
+                if room.last_activity > self.watermark - self.overlap):
+            self.watermark = max(self.watermark, last_activity)
+            deadline = last_activity + timedelta(seconds=timeout)
+            if deadline >= now and self.deadlines.get(room_id) != deadline:
+                self.deadlines[room_id] = deadline
+                changed = True
+        return changed
+
+    def launch_rooms(self) -> bool:
+        """Launches rooms that are within their timeout and not running, returns whether any were launched."""
+        now = datetime.utcnow()
+        with guardian_lock:
+            stopped = [room_id for room_id in self.launched if not room_is_running(room_id)]
+        if stopped:
+            self.launched.difference_update(stopped)
+            # a room shutting down sets its last_activity past the timeout, which refresh() does not read again,
+            # so look the stopped rooms up to relaunch those that crashed while still active
+            with db_session:
+                for room_id, last_activity, timeout in select(
+                        (room.id, room.last_activity, room.timeout) for room in Room if room.id in stopped):
+                    self.deadlines[room_id] = last_activity + timedelta(seconds=timeout)
+        launched = False
+        for room_id, deadline in list(self.deadlines.items()):
+            if deadline < now:
+                del self.deadlines[room_id]
+            elif room_id not in self.launched:
+                launch_room(room_id, self.config)
+                self.launched.add(room_id)
+                launched = True
+        return launched
+
+    def tick(self) -> bool:
+        """Runs one round of scheduling, returns whether anything happened."""
+        update_room_workers()
+        with db_session:
+            dispatched = dispatch_commands()
+            changed = self.refresh()
+        return self.launch_rooms() or changed or dispatched
 
 
 def handle_generation_success(seed_id):
@@ -59,18 +161,19 @@ def init_db(pony_config: dict):
 
 
 def autohost(config: dict):
+    if not config["SELFHOST"]:
+        autohost_wakeup.poll()
+
     def keep_running():
         try:
             with Locker("autohost"):
                 run_guardian()
-                while 1:
-                    time.sleep(0.1)
-                    with db_session:
-                        rooms = select(
-                            room for room in Room if
-                            room.last_activity >= datetime.utcnow() - timedelta(days=3))
-                        for room in rooms:
-                            launch_room(room, config)
+                scheduler = RoomScheduler(config)
+                try:
+                    while 1:
+                        autohost_wakeup.sleep(idle=not scheduler.tick())
+                finally:
+                    stop_room_workers()
 
         except AlreadyRunningException:
             logging.info("Autohost reports as already running, not starting another.")
@@ -80,6 +183,9 @@ def autohost(config: dict):
 
 
 def autogen(config: dict):
+    if not config["SELFHOST"]:
+        autogen_wakeup.poll()
+
     def keep_running():
         try:
             with Locker("autogen"):
@@ -102,7 +208,7 @@ def autogen(config: dict):
                         select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
 
                     while 1:
-                        time.sleep(0.1)
+                        idle = True
                         with db_session:
                             # for update locks the database row(s) during transaction, preventing writes from elsewhere
                             to_start = select(
@@ -110,6 +216,8 @@ def autogen(config: dict):
                                 if generation.state == STATE_QUEUED).for_update()
                             for generation in to_start:
                                 launch_generator(generator_pool, generation)
+                                idle = False
+                        autogen_wakeup.sleep(idle)
         except AlreadyRunningException:
             logging.info("Autogen reports as already running, not starting another.")
 
@@ -121,9 +229,10 @@ multiworlds: typing.Dict[type(Room.id), MultiworldInstance] = {}
 
 
 class MultiworldInstance():
-    def __init__(self, room: Room, config: dict):
-        self.room_id = room.id
+    def __init__(self, room_id, config: dict):
+        self.room_id = room_id
         self.process: typing.Optional[multiprocessing.Process] = None
+        self.command_queue: typing.Optional[multiprocessing.Queue] = None
         with guardian_lock:
             multiworlds[self.room_id] = self
         self.ponyconfig = config["PONY"]
@@ -136,14 +245,24 @@ class MultiworldInstance():
             return False
 
         logging.info(f"Spinning up {self.room_id}")
+        with guardian_lock:
+            forget_pending_commands(self.room_id)
+        command_queue = multiprocessing.Queue()
         process = multiprocessing.Process(group=None, target=run_server_process,
                                           args=(self.room_id, self.ponyconfig, get_static_server_data(),
-                                                self.cert, self.key, self.host),
+                                                self.cert, self.key, self.host, command_queue),
                                           name="MultiHost")
         process.start()
         # bind after start to prevent thread sync issues with guardian.
+        self.command_queue = command_queue
         self.process = process
 
+    def send_command(self, command_id: int, commandtext: str) -> bool:
+        if self.process and self.process.is_alive():
+            self.command_queue.put((command_id, commandtext))
+            return True
+        return False
+
     def stop(self):
         if self.process:
             self.process.terminate()
@@ -155,6 +274,145 @@ class MultiworldInstance():
     def collect(self):
         self.process.join()  # wait for process to finish
         self.process = None
+        self.command_queue = None
+
+
+class RoomHostWorker:
+    """A process hosting many rooms on one event loop, see customserver.run_room_host_worker."""
+    rooms: typing.Set[typing.Any]
+    metrics: typing.Optional[RoomHostMetrics] = None
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self.rooms = set()
+        self.room_queue = multiprocessing.Queue()
+        self.report_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(group=None, target=run_room_host_worker,
+                                               args=(name, config["PONY"], get_static_server_data(),
+                                                     config["SELFLAUNCHCERT"], config["SELFLAUNCHKEY"],
+                                                     config["HOST_ADDRESS"], self.room_queue, self.report_queue),
+                                               name=name)
+        self.process.start()
+
+    @property
+    def load(self) -> typing.Tuple[int, int]:
+        return len(self.rooms), self.metrics.sockets if self.metrics else 0
+
+    def start_room(self, room_id):
+        logging.info(f"Spinning up {room_id} on {self.name}")
+        forget_pending_commands(room_id)
+        self.rooms.add(room_id)
+        room_workers_by_room[room_id] = self
+        self.room_queue.put(("start", room_id))
+
+    def send_command(self, room_id, command_id: int, commandtext: str) -> bool:
+        if self.process.is_alive():
+            self.room_queue.put(("command", room_id, command_id, commandtext))
+            return True
+        return False
+
+    def collect_reports(self):
+        while True:
+            try:
+                kind, data = self.report_queue.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "stopped":
+                self.rooms.discard(data)
+                room_workers_by_room.pop(data, None)
+            elif kind == "metrics":
+                self.metrics = data
+                logging.info(f"{self.name}: {data}")
+
+    def done(self) -> bool:
+        return not self.process.is_alive()
+
+    def stop(self, timeout: float = 30):
+        """Asks the worker to shut down its rooms, terminating it if it did not stop within timeout."""
+        if self.process.is_alive():
+            self.room_queue.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                logging.error(f"{self.name} did not stop in time, terminating it.")
+                self.process.terminate()
+        self.collect()
+
+    def collect(self):
+        self.process.join()
+        for room_id in self.rooms:  # rooms of a crashed worker get launched again elsewhere
+            room_workers_by_room.pop(room_id, None)
+        self.rooms.clear()
+
+
+room_workers: typing.List[RoomHostWorker] = []
+room_workers_by_room: typing.Dict[type(Room.id), RoomHostWorker] = {}
+# commands sent to a room, which the room did not process yet, as command id -> room id
+pending_commands: typing.Dict[type(Command.id), type(Room.id)] = {}
+
+
+def update_room_workers():
+    """Processes the reports of the room workers and forgets about workers that stopped."""
+    with guardian_lock:
+        for worker in room_workers[:]:
+            worker.collect_reports()
+            if worker.done():
+                logging.error(f"{worker.name} stopped unexpectedly.")
+                worker.collect()
+                room_workers.remove(worker)
+
+
+def stop_room_workers():
+    """Stops all room workers, letting them save their rooms."""
+    with guardian_lock:
+        for worker in room_workers:
+            worker.stop()
+        room_workers.clear()
+
+
+def forget_pending_commands(room_id):
+    """Makes commands that were forwarded to a previous run of the room, but not processed by it, get sent again."""
+    # requires guardian_lock!
+    for command_id, command_room_id in list(pending_commands.items()):
+        if command_room_id == room_id:
+            del pending_commands[command_id]
+
+
+def dispatch_commands() -> bool:
+    """Forwards the commands of all rooms hosted by this autohost to their processes with a single query.
+    Rooms delete their commands once processed, so commands for rooms that are not running,
+    or that stopped before processing them, stay in the DB until their room is spun up.
+    Returns whether any command was forwarded."""
+    # requires db_session!
+    dispatched = False
+    with guardian_lock:
+        commands = select(command for command in Command)[:]
+        for command_id in pending_commands.keys() - {command.id for command in commands}:
+            del pending_commands[command_id]  # processed
+        for command in commands:
+            if command.id in pending_commands:
+                continue
+            room_id = command.room.id
+            instance = room_workers_by_room.get(room_id)
+            if instance:
+                sent = instance.send_command(room_id, command.id, command.commandtext)
+            else:
+                instance = multiworlds.get(room_id)
+                sent = instance.send_command(command.id, command.commandtext) if instance else False
+            if sent:
+                pending_commands[command.id] = room_id
+                dispatched = True
+    return dispatched
+
+
+def get_room_worker(config: dict) -> RoomHostWorker:
+    """Returns the worker hosting the fewest rooms and sockets, starting workers up to ROOM_WORKERS."""
+    # requires guardian_lock!
+    if len(room_workers) < config["ROOM_WORKERS"]:
+        room_workers.append(RoomHostWorker(f"RoomHost{len(room_workers) + 1}", config))
+        if len(room_workers) == 1:
+            # registered after multiprocessing's exit handler, so it runs first and the workers don't block exit
+            atexit.register(stop_room_workers)
+    return min(room_workers, key=lambda worker: worker.load)
 
 
 guardian = None
@@ -191,6 +449,6 @@ def run_guardian():
             guardian = threading.Thread(name="Guardian", target=guard)
 
 
-from .models import Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed
-from .customserver import run_server_process, get_static_server_data
+from .models import Command, Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed
+from .customserver import RoomHostMetrics, get_static_server_data, run_room_host_worker, run_server_process
 from .generate import gen_game
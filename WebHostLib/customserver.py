@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import collections
+import concurrent.futures
+import contextvars
 import datetime
 import functools
 import logging
-import pickle
+import os
+import queue
 import random
 import socket
 import threading
@@ -18,10 +22,11 @@ from pony.orm import commit, db_session, select
 
 import Utils
 
-from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, load_server_cert
+from MultiServer import Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, \
+    load_server_cert, apply_save_journal, read_save_journal
 from Utils import restricted_loads, cache_argsless
-from .locker import Locker
-from .models import Command, GameDataPackage, Room, db
+from .locker import AlreadyRunningException, Locker
+from .models import Command, GameDataPackage, Room, SaveJournal, db
 
 
 class CustomClientMessageProcessor(ClientMessageProcessor):
@@ -33,12 +38,12 @@ class CustomClientMessageProcessor(ClientMessageProcessor):
         """
         if platform.lower().startswith("t"):  # twitch
             self.ctx.video[self.client.team, self.client.slot] = "Twitch", user
-            self.ctx.save()
+            self.ctx.journal("video", (self.client.team, self.client.slot), ("Twitch", user))
             self.output(f"Registered Twitch Stream https://www.twitch.tv/{user}")
             return True
         elif platform.lower().startswith("y"):  # youtube
             self.ctx.video[self.client.team, self.client.slot] = "Youtube", user
-            self.ctx.save()
+            self.ctx.journal("video", (self.client.team, self.client.slot), ("Youtube", user))
             self.output(f"Registered Youtube Stream for {user}")
             return True
         return False
@@ -71,10 +76,12 @@ class WebHostContext(Context):
 
     def _load_game_data(self):
         for key, value in self.static_server_data.items():
-            setattr(self, key, value)
+            # copy, as embedded data packages get added per room, while static server data may be shared by rooms
+            setattr(self, key, value.copy())
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
     def listen_to_db_commands(self):
+        """Fallback for rooms hosted without a command queue, see autolauncher.dispatch_commands."""
         cmdprocessor = DBCommandProcessor(self)
 
         while not self.exit_event.is_set():
@@ -87,6 +94,21 @@ class WebHostContext(Context):
                     commit()
             time.sleep(5)
 
+    def listen_to_command_queue(self, command_queue: "multiprocessing.Queue"):
+        cmdprocessor = DBCommandProcessor(self)
+
+        async def process(commandtext: str):
+            cmdprocessor(commandtext)
+
+        while not self.exit_event.is_set():
+            try:
+                command_id, commandtext = command_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            # the autohost sends the command again, if the room stops before processing it
+            asyncio.run_coroutine_threadsafe(process(commandtext), self.main_loop).result()
+            acknowledge_command(command_id)
+
     @db_session
     def load(self, room_id: int):
         self.room_id = room_id
@@ -95,6 +117,9 @@ class WebHostContext(Context):
             self.port = room.last_port
         else:
             self.port = get_random_port()
+        if room.tracker:
+            # the tracker page subscribes to tracker events with the id in its url
+            self.tracker_token = base64.urlsafe_b64encode(room.tracker.bytes).rstrip(b'=').decode('ascii')
 
         multidata = self.decompress(room.seed.multidata)
         game_data_packages = {}
@@ -116,27 +141,50 @@ class WebHostContext(Context):
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
-            savegame_data = Room.get(id=self.room_id).multisave
-            if savegame_data:
-                self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
+            room = Room.get(id=self.room_id)
+            if room.multisave:
+                savegame_data = restricted_loads(room.multisave)
+                journal_length = apply_save_journal(savegame_data, read_save_journal(room.get_save_journal()))
+                self.set_save(savegame_data, journal_length)
             self._start_async_saving()
-        threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
 
     @db_session
     def _save(self, exit_save: bool = False) -> bool:
-        room = Room.get(id=self.room_id)
-        room.multisave = pickle.dumps(self.get_save())
+        self._write_save(exit_save)
         # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
         if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
-            room.last_activity = datetime.datetime.utcnow()
+            Room.get(id=self.room_id).last_activity = datetime.datetime.utcnow()
         return True
 
+    def _write_snapshot(self, encoded_save: bytes):
+        room = Room.get(id=self.room_id)
+        room.multisave = encoded_save
+        SaveJournal.select(lambda entry: entry.room == room).delete(bulk=True)
+
+    def _write_journal(self, encoded_record: bytes):
+        SaveJournal(room=Room.get(id=self.room_id), data=encoded_record)
+
     def get_save(self) -> dict:
         d = super(WebHostContext, self).get_save()
         d["video"] = [(tuple(playerslot), videodata) for playerslot, videodata in self.video.items()]
         return d
 
 
+class RoomHostContext(WebHostContext):
+    """A room hosted by a room host worker, which saves all of its rooms from a single task instead."""
+
+    def _start_async_saving(self):
+        pass
+
+
+@db_session
+def acknowledge_command(command_id: int):
+    """Deletes a command forwarded by the autohost, once its room processed it."""
+    command = Command.get(id=command_id)
+    if command:
+        command.delete()
+
+
 def get_random_port():
     return random.randint(49152, 65535)
 
@@ -159,9 +207,64 @@ def get_static_server_data() -> dict:
     return data
 
 
+async def host_room(ctx: WebHostContext, room_id, cert_file: typing.Optional[str],
+                    cert_key_file: typing.Optional[str], host: str, full_gc: bool = True):
+    """Hosts a room with ctx until it shuts down due to inactivity."""
+    import gc
+    ctx.load(room_id)
+    ctx.init_save()
+    ssl_context = load_server_cert(cert_file, cert_key_file) if cert_file else None
+    gc.collect(2 if full_gc else 1)  # free intermediate objects used during setup
+    try:
+        ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, ctx.port, ssl=ssl_context)
+
+        await ctx.server
+    except OSError:  # likely port in use
+        ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, 0, ssl=ssl_context)
+
+        await ctx.server
+    port = 0
+    for wssocket in ctx.server.ws_server.sockets:
+        socketname = wssocket.getsockname()
+        if wssocket.family == socket.AF_INET6:
+            # Prefer IPv4, as most users seem to not have working ipv6 support
+            if not port:
+                port = socketname[1]
+        elif wssocket.family == socket.AF_INET:
+            port = socketname[1]
+    if port:
+        logging.info(f'Hosting game at {host}:{port}')
+        with db_session:
+            room = Room.get(id=ctx.room_id)
+            room.last_port = port
+    else:
+        logging.exception("Could not determine port. Likely hosting failure.")
+    with db_session:
+        ctx.auto_shutdown = Room.get(id=room_id).timeout
+    ctx.shutdown_task = asyncio.create_task(auto_shutdown(ctx, []))
+    await ctx.shutdown_task
+
+    # ensure auto launch is on the same page in regard to room activity.
+    with db_session:
+        room: Room = Room.get(id=ctx.room_id)
+        room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(seconds=room.timeout + 60)
+
+    logging.info("Shutting down")
+
+
+@db_session
+def stop_room(room_id, failed: bool):
+    """Ensure the Room does not spin up again on its own, with a minute of safety buffer."""
+    room = Room.get(id=room_id)
+    if failed:
+        room.last_port = -1
+    room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+
+
 def run_server_process(room_id, ponyconfig: dict, static_server_data: dict,
                        cert_file: typing.Optional[str], cert_key_file: typing.Optional[str],
-                       host: str):
+                       host: str, command_queue: typing.Optional["multiprocessing.Queue"] = None):
+    """Hosts a single room. Commands for it are read from command_queue if given, otherwise polled from the DB."""
     # establish DB connection for multidata and multisave
     db.bind(**ponyconfig)
     db.generate_mapping(check_tables=False)
@@ -170,61 +273,190 @@ def run_server_process(room_id, ponyconfig: dict, static_server_data: dict,
         if "worlds" in sys.modules:
             raise Exception("Worlds system should not be loaded in the custom server.")
 
-        import gc
         Utils.init_logging(str(room_id), write_mode="a")
         ctx = WebHostContext(static_server_data)
-        ctx.load(room_id)
-        ctx.init_save()
-        ssl_context = load_server_cert(cert_file, cert_key_file) if cert_file else None
-        gc.collect()  # free intermediate objects used during setup
-        try:
-            ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, ctx.port, ssl=ssl_context)
-
-            await ctx.server
-        except OSError:  # likely port in use
-            ctx.server = websockets.serve(functools.partial(server, ctx=ctx), ctx.host, 0, ssl=ssl_context)
-
-            await ctx.server
-        port = 0
-        for wssocket in ctx.server.ws_server.sockets:
-            socketname = wssocket.getsockname()
-            if wssocket.family == socket.AF_INET6:
-                # Prefer IPv4, as most users seem to not have working ipv6 support
-                if not port:
-                    port = socketname[1]
-            elif wssocket.family == socket.AF_INET:
-                port = socketname[1]
-        if port:
-            logging.info(f'Hosting game at {host}:{port}')
-            with db_session:
-                room = Room.get(id=ctx.room_id)
-                room.last_port = port
+        if command_queue:
+            threading.Thread(target=ctx.listen_to_command_queue, args=(command_queue,), daemon=True).start()
         else:
-            logging.exception("Could not determine port. Likely hosting failure.")
-        with db_session:
-            ctx.auto_shutdown = Room.get(id=room_id).timeout
-        ctx.shutdown_task = asyncio.create_task(auto_shutdown(ctx, []))
-        await ctx.shutdown_task
-
-        # ensure auto launch is on the same page in regard to room activity.
-        with db_session:
-            room: Room = Room.get(id=ctx.room_id)
-            room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(seconds=room.timeout + 60)
-
-        logging.info("Shutting down")
+            threading.Thread(target=ctx.listen_to_db_commands, daemon=True).start()
+        await host_room(ctx, room_id, cert_file, cert_key_file, host)
 
     with Locker(room_id):
         try:
             asyncio.run(main())
         except (KeyboardInterrupt, SystemExit):
-            with db_session:
-                room = Room.get(id=room_id)
-                # ensure the Room does not spin up again on its own, minute of safety buffer
-                room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+            stop_room(room_id, False)
         except Exception:
-            with db_session:
-                room = Room.get(id=room_id)
-                room.last_port = -1
-                # ensure the Room does not spin up again on its own, minute of safety buffer
-                room.last_activity = datetime.datetime.utcnow() - datetime.timedelta(minutes=1, seconds=room.timeout)
+            stop_room(room_id, True)
             raise
+
+
+current_room: contextvars.ContextVar[str] = contextvars.ContextVar("current_room", default="")
+
+
+class RoomLogHandler(logging.Handler):
+    """Writes log records to the log file of the room, whose tasks emitted them."""
+    log_format = "[%(name)s at %(asctime)s]: %(message)s"  # same as Utils.init_logging
+
+    def __init__(self):
+        super().__init__()
+        self.room_handlers: typing.Dict[str, logging.FileHandler] = {}
+
+    def open_room(self, room_id: str):
+        handler = logging.FileHandler(os.path.join(Utils.user_path("logs"), f"{room_id}.txt"), "a",
+                                      encoding="utf-8-sig")
+        handler.setFormatter(logging.Formatter(self.log_format))
+        self.room_handlers[room_id] = handler
+
+    def close_room(self, room_id: str):
+        handler = self.room_handlers.pop(room_id, None)
+        if handler:
+            handler.close()
+
+    def emit(self, record: logging.LogRecord):
+        handler = self.room_handlers.get(current_room.get())
+        if handler and not getattr(record, "NoFile", False):
+            handler.handle(record)
+
+
+def save_room(room_id: str, ctx: WebHostContext, exit_save: bool = False):
+    """Saves ctx from a thread of the room host worker, logging to the room's log file."""
+    token = current_room.set(room_id)
+    try:
+        ctx._save(exit_save)
+    except Exception as e:
+        logging.exception(e)
+        if not exit_save:
+            logging.info(f"Saving failed. Retry in {ctx.auto_save_interval} seconds.")
+            ctx.save_dirty = True
+    finally:
+        current_room.reset(token)
+
+
+async def save_rooms(contexts: typing.Dict[str, WebHostContext], executor: concurrent.futures.Executor,
+                     interval: float):
+    """Saves the changed rooms every interval, one at a time in executor.
+    Rooms that are shutting down are skipped, as the exit save of a room is queued into the same executor."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        for room_id, ctx in list(contexts.items()):
+            if ctx.save_dirty and not ctx.exit_event.is_set():
+                ctx.save_dirty = False
+                await loop.run_in_executor(executor, save_room, room_id, ctx)
+
+
+class RoomHostMetrics(typing.NamedTuple):
+    rooms: int
+    sockets: int
+    rss: int  # bytes
+    loop_lag: float  # seconds
+
+
+def get_rss() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):  # not linux
+        import resource  # unix only; peak instead of current usage
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def run_room_host_worker(worker_name: str, ponyconfig: dict, static_server_data: dict,
+                         cert_file: typing.Optional[str], cert_key_file: typing.Optional[str], host: str,
+                         room_queue: "multiprocessing.Queue", report_queue: "multiprocessing.Queue",
+                         metrics_interval: float = 60, save_interval: float = 60):
+    """Hosts every room started through room_queue on one shared event loop, until None is put into it.
+    room_queue takes ("start", room_id) and ("command", room_id, command_id, commandtext).
+    Reports ("stopped", room_id) once a room shut down and ("metrics", RoomHostMetrics) every metrics_interval.
+    Changed rooms are saved every save_interval and once more when they shut down."""
+    db.bind(**ponyconfig)
+    db.generate_mapping(check_tables=False)
+    Utils.init_logging(worker_name, write_mode="a")
+    room_log_handler = RoomLogHandler()
+    logging.getLogger().addHandler(room_log_handler)
+    contexts: typing.Dict[str, WebHostContext] = {}
+    command_processors: typing.Dict[str, DBCommandProcessor] = {}
+    # a single thread for all saves, so the exit save of a room always runs after its last regular save
+    save_executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="RoomSaver")
+
+    async def run_room(room_id):
+        # each task copies the context it's created in, so all of the room's tasks log to the room's log file
+        current_room.set(str(room_id))
+        room_log_handler.open_room(str(room_id))
+        ctx = contexts[str(room_id)] = RoomHostContext(static_server_data)
+        command_processors[str(room_id)] = DBCommandProcessor(ctx)
+        try:
+            with Locker(room_id):
+                await host_room(ctx, room_id, cert_file, cert_key_file, host, full_gc=False)
+        except AlreadyRunningException:
+            logging.info(f"Room {room_id} is already hosted elsewhere.")
+        except asyncio.CancelledError:  # the worker is stopping
+            stop_room(room_id, False)
+            raise
+        except Exception as e:
+            logging.exception(e)
+            stop_room(room_id, True)
+        finally:
+            # tear down in place, instead of relying on the process exiting
+            ctx.exit_event.set()
+            if ctx.server:
+                ctx.server.ws_server.close()
+            if ctx.saving:
+                await asyncio.get_running_loop().run_in_executor(save_executor, save_room, str(room_id), ctx, True)
+            del contexts[str(room_id)]
+            del command_processors[str(room_id)]
+            room_log_handler.close_room(str(room_id))
+            report_queue.put(("stopped", room_id))
+
+    async def report_metrics():
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(metrics_interval)
+            lag = loop.time() - before - metrics_interval
+            metrics = RoomHostMetrics(len(contexts), sum(len(ctx.endpoints) for ctx in contexts.values()),
+                                      get_rss(), lag)
+            logging.info(f"{worker_name}: {metrics}")
+            report_queue.put(("metrics", metrics))
+
+    async def main():
+        if "worlds" in sys.modules:
+            raise Exception("Worlds system should not be loaded in the custom server.")
+        loop = asyncio.get_running_loop()
+        background_tasks = [asyncio.create_task(report_metrics()),
+                            asyncio.create_task(save_rooms(contexts, save_executor, save_interval))]
+        room_tasks: typing.Set[asyncio.Task] = set()
+        while True:
+            message = await loop.run_in_executor(None, room_queue.get)
+            if message is None:
+                break
+            kind, room_id, *args = message
+            if kind == "start":
+                task = asyncio.create_task(run_room(room_id))
+                room_tasks.add(task)
+                task.add_done_callback(room_tasks.discard)
+            elif kind == "command":
+                cmdprocessor = command_processors.get(str(room_id))
+                if cmdprocessor:
+                    token = current_room.set(str(room_id))
+                    command_id, commandtext = args
+                    try:
+                        cmdprocessor(commandtext)
+                    finally:
+                        current_room.reset(token)
+                    loop.run_in_executor(None, acknowledge_command, command_id)
+                else:
+                    # left in the DB, so it is sent again once the room runs
+                    logging.warning(f"Room {room_id} is not hosted here, skipped its command.")
+        for task in background_tasks:
+            task.cancel()
+        for task in room_tasks:
+            task.cancel()
+        # let the rooms tear down, which includes their exit save
+        await asyncio.gather(*room_tasks, return_exceptions=True)
+
+    try:
+        asyncio.run(main())
+    finally:
+        save_executor.shutdown()
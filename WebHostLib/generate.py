@@ -85,6 +85,8 @@ def generate(race=False):
                         state=STATE_QUEUED,
                         owner=session["_id"])
                     commit()
+                    from .autolauncher import autogen_wakeup
+                    autogen_wakeup.wake()
 
                     return redirect(url_for("wait_seed", seed=gen.id))
                 else:
@@ -132,6 +134,7 @@ def gen_game(gen_options: dict, meta: Optional[Dict[str, Any]] = None, owner=Non
                                                                        {"bosses", "items", "connections", "texts"}))
         erargs.skip_prog_balancing = False
         erargs.skip_output = False
+        erargs.stage_workers = 0
 
         name_counter = Counter()
         for player, (playerfile, settings) in enumerate(gen_options.items(), 1):
@@ -160,8 +160,14 @@ def host_room(room: UUID):
     now = datetime.datetime.utcnow()
     # indicate that the page should reload to get the assigned port
     should_refresh = not room.last_port and now - room.creation_time < datetime.timedelta(seconds=3)
+    stopped = room.last_activity + datetime.timedelta(seconds=room.timeout) < now
     with db_session:
         room.last_activity = now  # will trigger a spinup, if it's not already running
+    if stopped:
+        # the autohost only needs to act right away if this activity makes it launch the room
+        commit()
+        from .autolauncher import autohost_wakeup
+        autohost_wakeup.wake()
 
     return render_template("hostRoom.html", room=room, should_refresh=should_refresh)
 
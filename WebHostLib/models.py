@@ -26,12 +26,17 @@ class Room(db.Entity):
     commands = Set('Command')
     seed = Required('Seed', index=True)
     multisave = Optional(buffer, lazy=True)
+    save_journal = Set('SaveJournal')  # changes made after multisave was written
     show_spoiler = Required(int, default=0)  # 0 -> never, 1 -> after completion, -> 2 always
     timeout = Required(int, default=lambda: 2 * 60 * 60)  # seconds since last activity to shutdown
     tracker = Optional(UUID, index=True)
     # Port special value -1 means the server errored out. Another attempt can be made with a page refresh
     last_port = Optional(int, default=lambda: 0)
 
+    def get_save_journal(self) -> bytes:
+        """Returns the save journal records written since multisave, in order."""
+        return b"".join(entry.data for entry in self.save_journal.select().order_by(SaveJournal.id))
+
 
 class Seed(db.Entity):
     id = PrimaryKey(UUID, default=uuid4)
@@ -50,6 +55,12 @@ class Command(db.Entity):
     commandtext = Required(str)
 
 
+class SaveJournal(db.Entity):
+    id = PrimaryKey(int, auto=True)
+    room = Required(Room, index=True)
+    data = Required(buffer, lazy=True)  # pickled MultiServer.JournalRecord
+
+
 class Generation(db.Entity):
     id = PrimaryKey(UUID, default=uuid4)
     owner = Required(UUID)
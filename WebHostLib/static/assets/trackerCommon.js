@@ -21,6 +21,22 @@ const adjustTableHeight = () => {
     }
 };
 
+const clientStatusNames = {
+    0: "Disconnected",
+    5: "Connected",
+    10: "Ready",
+    20: "Playing",
+    30: "Goal Completed",
+};
+
+/**
+ * Format the completion percentage of checked out of total locations
+ * @param {Number} checked
+ * @param {Number} total
+ * @returns {string}
+ */
+const formatPercentage = (checked, total) => (total ? checked / total * 100 : 100).toFixed(2);
+
 /**
  * Convert an integer number of seconds into a human readable HH:MM format
  * @param {Number} seconds
@@ -125,6 +141,10 @@ window.addEventListener('load', () => {
     });
     const tracker = document.getElementById('tracker-wrapper').getAttribute('data-tracker');
     const target_second = document.getElementById('tracker-wrapper').getAttribute('data-second') + 3;
+    // while the room's tracker events are received, the page does not need to be reloaded
+    let streaming = false;
+    // time the activity column was last brought up to date, as it is aged in place while streaming
+    let activityUpdated = Date.now();
 
     function getSleepTimeSeconds(){
         // -40 % 60 is -40, which is absolutely wrong and should burn
@@ -132,11 +152,33 @@ window.addEventListener('load', () => {
         return sleepSeconds || 60;
     }
 
+    const tickActivity = () => {
+        const elapsed = Math.floor((Date.now() - activityUpdated) / 1000);
+        if (!elapsed)
+            return;
+        activityUpdated += elapsed * 1000;
+        tables.tables().every(function () {
+            const table = this;
+            table.cells(null, 'lastActivity:name').every(function () {
+                const data = this.data();
+                if (data !== "None" && !isNaN(data))
+                    this.data(parseFloat(data) + elapsed);
+            });
+            table.draw(false);
+        });
+    };
+
     const update = () => {
+        if (streaming) {
+            tickActivity();
+            setTimeout(update, getSleepTimeSeconds()*1000);
+            return;
+        }
         const target = $("<div></div>");
         console.log("Updating Tracker...");
         target.load(location.href, function (response, status) {
             if (status === "success") {
+                activityUpdated = Date.now();
                 target.find(".table").each(function (i, new_table) {
                     const new_trs = $(new_table).find("tbody>tr");
                     const footer_tr = $(new_table).find("tfoot>tr");
@@ -162,6 +204,90 @@ window.addEventListener('load', () => {
     }
     setTimeout(update, getSleepTimeSeconds()*1000);
 
+    const applyTrackerEvents = (events) => {
+        const rows = {};
+        tables.tables().every(function () {
+            const table = this;
+            const team = table.table().node().getAttribute('data-team');
+            table.rows().nodes().each((row) => {
+                rows[`${team}_${row.getAttribute('data-player')}`] = [table, row];
+            });
+        });
+
+        const changedTables = new Set();
+        events.forEach(([kind, team, slot, ...data]) => {
+            if (kind !== "checks" && kind !== "status")
+                return;
+            const [table, row] = rows[`${team}_${slot}`] || [];
+            if (!row)
+                return;
+            if (kind === "checks") {
+                const [checked, newLocations] = data;
+                const checksCell = row.querySelector('td.checks');
+                const total = parseInt(checksCell.innerText.split("/")[1]);
+                checksCell.innerText = `${checked}/${total}`;
+                checksCell.setAttribute('data-sort', checked);
+                table.cell(checksCell).invalidate('dom');
+                const percentageCell = row.querySelector('td.percentage');
+                percentageCell.innerText = formatPercentage(checked, total);
+                table.cell(percentageCell).invalidate('dom');
+                if (newLocations.length)
+                    table.cell(row.querySelector('td.activity')).data(0);
+            } else {
+                const statusCell = row.querySelector('td.status');
+                statusCell.innerText = clientStatusNames[data[0]] || "Unknown State";
+                table.cell(statusCell).invalidate('dom');
+            }
+            changedTables.add(table);
+        });
+
+        changedTables.forEach((table) => {
+            const footer = table.table().footer();
+            if (footer && footer.querySelector('td.completed-worlds')) {
+                let checked = 0, total = 0, completed = 0;
+                table.rows().nodes().each((row) => {
+                    const [rowChecked, rowTotal] = row.querySelector('td.checks').innerText.split("/");
+                    checked += parseInt(rowChecked);
+                    total += parseInt(rowTotal);
+                    completed += row.querySelector('td.status').innerText.trim() === clientStatusNames[30];
+                });
+                footer.querySelector('td.completed-worlds').innerText =
+                    `${completed}/${table.rows().count()} Complete`;
+                footer.querySelector('td.checks').innerText = `${checked}/${total}`;
+                footer.querySelector('td.percentage').innerText = formatPercentage(checked, total);
+            }
+            table.draw(false);
+        });
+    };
+
+    const stream = document.getElementById('tracker-wrapper').getAttribute('data-stream');
+    let socket = null;
+    if (stream && window.WebSocket) {
+        try {
+            socket = new WebSocket(stream);
+        } catch (error) {
+            // e.g. an insecure stream on a secure page, the tracker keeps reloading instead
+            console.log("Failed to open Tracker stream.");
+            console.log(error);
+        }
+    }
+    if (socket) {
+        socket.addEventListener('open', () => {
+            socket.send(JSON.stringify([{cmd: "TrackerSubscribe", token: tracker}]));
+        });
+        socket.addEventListener('message', (event) => {
+            JSON.parse(event.data).forEach((packet) => {
+                if (packet.cmd === "TrackerEvents") {
+                    streaming = true;
+                    applyTrackerEvents(packet.events);
+                }
+            });
+        });
+        socket.addEventListener('close', () => {
+            streaming = false;
+        });
+    }
+
     window.addEventListener('resize', () => {
         adjustTableHeight();
         tables.draw();
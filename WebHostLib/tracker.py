@@ -1,17 +1,19 @@
 import datetime
 import collections
+import threading
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
 from uuid import UUID
 
 from flask import render_template
+from pony.orm import select
 from werkzeug.exceptions import abort
 
-from MultiServer import Context, get_saving_second
+from MultiServer import Context, apply_save_journal, get_saving_second, read_save_journal
 from NetUtils import ClientStatus, Hint, NetworkItem, NetworkSlot, SlotType
 from Utils import restricted_loads, KeyedDefaultDict
 from . import app, cache
-from .models import GameDataPackage, Room
+from .models import GameDataPackage, Room, SaveJournal
 
 # Multisave is currently updated, at most, every minute.
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
@@ -24,9 +26,135 @@ TeamPlayer = Tuple[int, int]
 ItemMetadata = Tuple[int, int, int]
 
 
+class _SizedLRUCache:
+    """Keeps the most recently used values, evicting the least recently used ones once their summed size
+    exceeds get_max_size(). Sizes are the lengths of the serialized data the values were loaded from."""
+
+    def __init__(self, get_max_size: Callable[[], int]):
+        self.get_max_size = get_max_size
+        self.size = 0
+        self._entries: "collections.OrderedDict[Hashable, Tuple[Any, int]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = value, size
+            self.size += size
+            max_size = self.get_max_size()
+            while self.size > max_size and len(self._entries) > 1:
+                self.size -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class _SeedTrackerData(NamedTuple):
+    """The parts of TrackerData that never change for a seed."""
+    multidata: Dict[str, Any]
+    item_id_to_name: Dict[str, Dict[int, str]]
+    location_id_to_name: Dict[str, Dict[int, str]]
+    item_name_to_id: Dict[str, Dict[str, int]]
+    location_name_to_id: Dict[str, Dict[str, int]]
+
+
+class _GameTrackerData(NamedTuple):
+    item_id_to_name: Dict[int, str]
+    location_id_to_name: Dict[int, str]
+    item_name_to_id: Dict[str, int]
+    location_name_to_id: Dict[str, int]
+
+
+class _SaveTrackerData(NamedTuple):
+    """The multisave of a room and the results computed from it, valid as long as the save has the same signature."""
+    signature: Hashable
+    multisave: Dict[str, Any]
+    tracker_cache: Dict[str, Any]
+
+
+# shared by all requests of this process, seeds by seed id, games by data package checksum and saves by room id
+_tracker_data_cache = _SizedLRUCache(lambda: app.config["TRACKER_CACHE_SIZE"])
+
+
+def _get_game_tracker_data(checksum: str) -> _GameTrackerData:
+    game_data = _tracker_data_cache.get(("game", checksum))
+    if game_data is None:
+        data = GameDataPackage.get(checksum=checksum).data
+        game_package = restricted_loads(data)
+        game_data = _GameTrackerData(
+            {id: name for name, id in game_package["item_name_to_id"].items()},
+            {id: name for name, id in game_package["location_name_to_id"].items()},
+            game_package["item_name_to_id"],
+            game_package["location_name_to_id"],
+        )
+        _tracker_data_cache.set(("game", checksum), game_data, len(data))
+    return game_data
+
+
+def _get_seed_tracker_data(room: Room) -> _SeedTrackerData:
+    seed_data = _tracker_data_cache.get(("seed", room.seed.id))
+    if seed_data is not None:
+        return seed_data
+
+    data = room.seed.multidata
+    multidata = Context.decompress(data)
+    # Generate inverse lookup tables from data package, useful for trackers.
+    item_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
+        game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Item (ID: {code})")
+    })
+    location_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
+        game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
+    })
+    item_name_to_id: Dict[str, Dict[str, int]] = {}
+    location_name_to_id: Dict[str, Dict[str, int]] = {}
+    for game, game_package in multidata["datapackage"].items():
+        game_data = _get_game_tracker_data(game_package["checksum"])
+        item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})",
+                                                 game_data.item_id_to_name)
+        location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})",
+                                                     game_data.location_id_to_name)
+
+        # Normal lookup tables as well.
+        item_name_to_id[game] = game_data.item_name_to_id
+        location_name_to_id[game] = game_data.item_name_to_id
+
+    seed_data = _SeedTrackerData(multidata, item_id_to_name, location_id_to_name, item_name_to_id,
+                                 location_name_to_id)
+    _tracker_data_cache.set(("seed", room.seed.id), seed_data, len(data))
+    return seed_data
+
+
+def _get_save_tracker_data(room: Room) -> _SaveTrackerData:
+    # rooms update last_activity whenever they write their save, so the (lazy) multisave is only loaded if it changed
+    signature = (room.last_activity, select(entry.id for entry in SaveJournal if entry.room == room).max())
+    save_data = _tracker_data_cache.get(("save", room.id))
+    if save_data is not None and save_data.signature == signature:
+        return save_data
+
+    multisave = room.multisave
+    multisave_data = restricted_loads(multisave) if multisave else {}
+    if multisave_data:
+        apply_save_journal(multisave_data, read_save_journal(room.get_save_journal()))
+    save_data = _SaveTrackerData(signature, multisave_data, {})
+    _tracker_data_cache.set(("save", room.id), save_data, len(multisave) if multisave else 0)
+    return save_data
+
+
 def _cache_results(func: Callable) -> Callable:
     """Stores the results of any computationally expensive methods after the initial call in TrackerData.
-    If called again, returns the cached result instead, as results will not change for the lifetime of TrackerData.
+    If called again, returns the cached result instead, as results will not change until the room's save does.
+    Results are shared with every TrackerData of the same save, so they must not be modified.
     """
     def method_wrapper(self: "TrackerData", *args):
         cache_key = f"{func.__name__}{''.join(f'_[{arg.__repr__()}]' for arg in args)}"
@@ -45,7 +173,8 @@ class TrackerData:
     """A helper dataclass that is instantiated each time an HTTP request comes in for tracker data.
 
     Provides helper methods to lazily load necessary data that each tracker require and caches any results so any
-    subsequent helper method calls do not need to recompute results during the lifetime of this instance.
+    subsequent helper method calls do not need to recompute results until the room's save changes.
+    The data of the seed and of the save is shared between requests, see _tracker_data_cache.
     """
     room: Room
     _multidata: Dict[str, Any]
@@ -55,30 +184,17 @@ class TrackerData:
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
-        self._tracker_cache = {}
-
-        self.item_name_to_id: Dict[str, Dict[str, int]] = {}
-        self.location_name_to_id: Dict[str, Dict[str, int]] = {}
-
-        # Generate inverse lookup tables from data package, useful for trackers.
-        self.item_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
-            game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Item (ID: {code})")
-        })
-        self.location_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
-            game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
-        })
-        for game, game_package in self._multidata["datapackage"].items():
-            game_package = restricted_loads(GameDataPackage.get(checksum=game_package["checksum"]).data)
-            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", {
-                id: name for name, id in game_package["item_name_to_id"].items()})
-            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})", {
-                id: name for name, id in game_package["location_name_to_id"].items()})
-
-            # Normal lookup tables as well.
-            self.item_name_to_id[game] = game_package["item_name_to_id"]
-            self.location_name_to_id[game] = game_package["item_name_to_id"]
+        seed_data = _get_seed_tracker_data(room)
+        self._multidata = seed_data.multidata
+        self.item_id_to_name = seed_data.item_id_to_name
+        self.location_id_to_name = seed_data.location_id_to_name
+        self.item_name_to_id = seed_data.item_name_to_id
+        self.location_name_to_id = seed_data.location_name_to_id
+
+        save_data = _get_save_tracker_data(room)
+        self._multisave = save_data.multisave
+        self._tracker_cache = save_data.tracker_cache
+        self._last_activity: Dict[TeamPlayer, datetime.timedelta] = {}  # relative to now, so not shared
 
     def get_seed_name(self) -> str:
         """Retrieves the seed name."""
@@ -136,7 +252,6 @@ class TrackerData:
         """Retrieves a set of all hints relevant for a particular player."""
         return self._multisave.get("hints", {}).get((team, player), set())
 
-    @_cache_results
     def get_player_last_activity(self, team: int, player: int) -> Optional[datetime.timedelta]:
         """Retrieves the relative timedelta for when a particular player was last active.
         Returns None if no activity was ever recorded.
@@ -264,17 +379,16 @@ class TrackerData:
 
         return long_player_names
 
-    @_cache_results
     def get_room_last_activity(self) -> Dict[TeamPlayer, datetime.timedelta]:
         """Retrieves a dictionary of all players and the timedelta from now to their last activity.
         Does not include players who have no activity recorded.
         """
-        last_activity: Dict[TeamPlayer, datetime.timedelta] = {}
-        now = datetime.datetime.utcnow()
-        for (team, player), timestamp in self._multisave.get("client_activity_timers", []):
-            last_activity[team, player] = now - datetime.datetime.utcfromtimestamp(timestamp)
+        if not self._last_activity:
+            now = datetime.datetime.utcnow()
+            for (team, player), timestamp in self._multisave.get("client_activity_timers", []):
+                self._last_activity[team, player] = now - datetime.datetime.utcfromtimestamp(timestamp)
 
-        return last_activity
+        return self._last_activity
 
     @_cache_results
     def get_room_videos(self) -> Dict[TeamPlayer, Tuple[str, str]]:
@@ -405,6 +519,7 @@ def render_generic_multiworld_tracker(tracker_data: TrackerData, enabled_tracker
         videos=tracker_data.get_room_videos(),
         item_id_to_name=tracker_data.item_id_to_name,
         location_id_to_name=tracker_data.location_id_to_name,
+        tracker_stream=True,  # all columns can be updated from the room's tracker events
     )
 
 
@@ -1859,7 +1974,7 @@ if "Starcraft 2 Wings of Liberty" in network_data_package["games"]:
             "Progressive Ship Armor":      106 + SC2WOL_ITEM_ID_OFFSET,
         }
 
-        inventory = tracker_data.get_player_inventory_counts(team, player)
+        inventory = tracker_data.get_player_inventory_counts(team, player).copy()
         for grouped_item_name, grouped_item_id in grouped_item_ids.items():
             count: int = inventory[grouped_item_id]
             if count > 0:
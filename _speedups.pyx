@@ -8,12 +8,18 @@ This is deliberately .pyx because using a non-compiled "pure python" may be slow
 
 # pip install cython cymem
 import cython
+import sys
 import warnings
 from cpython cimport PyObject
 from typing import Any, Dict, Iterable, Iterator, Generator, Sequence, Tuple, TypeVar, Union, Set, List, TYPE_CHECKING
 from cymem.cymem cimport Pool
-from libc.stdint cimport int64_t, uint32_t
+from cython.operator cimport dereference as deref, preincrement as inc
+from libc.stdint cimport int64_t, uint32_t, uint64_t, INT64_MAX, INT64_MIN
+from libc.string cimport memcpy
+from libcpp.algorithm cimport lower_bound, sort, upper_bound
 from libcpp.set cimport set as std_set
+from libcpp.utility cimport pair
+from libcpp.vector cimport vector
 from collections import defaultdict
 
 cdef extern from *:
@@ -48,6 +54,20 @@ cdef struct IndexEntry:
     size_t count
 
 
+ctypedef pair[pair[ap_player_t, ap_id_t], size_t] ReceiverKey  # (receiver, item), entry index
+
+
+cdef struct BufferHeader:
+    # layout of NetUtils.pack_locations: header, sender_index_size IndexEntry, entry_count LocationEntry
+    uint64_t entry_count
+    uint64_t sender_index_size
+
+
+# the packed layout is little endian with 64bit size_t, so it can only be used in place on platforms matching that
+cdef bint NATIVE_BUFFER_LAYOUT = sys.byteorder == "little" and sizeof(LocationEntry) == 32 and \
+    sizeof(IndexEntry) == 16 and sizeof(BufferHeader) == 16
+
+
 cdef class LocationStore:
     """Compact store for locations and their items in a MultiServer"""
     # The original implementation uses Dict[int, Dict[int, Tuple(int, int, int]]
@@ -66,6 +86,11 @@ cdef class LocationStore:
     cdef list _items  # ~64KB/1000 players, speed up items (56 per tuple + 8 per list entry)
     cdef list _proxies  # ~92KB/1000 players, speed up self[player] (56 per struct + 28 per len + 8 per list entry)
     cdef PyObject** _raw_proxies  # 8K/1000 players, faster access to _proxies, but does not keep a ref
+    cdef object _buffer  # keeps the buffer entries and sender_index point into alive, if loaded from_buffer
+    # entry indices sorted by receiver, item and entry index, to look up items sent to a player without a full scan.
+    # Built on first use, so loading does not pay for it. ~24B per location
+    cdef vector[ReceiverKey] _receiver_order
+    cdef bint _receiver_order_built
 
     def get_size(self):
         from sys import getsizeof
@@ -76,6 +101,7 @@ cdef class LocationStore:
         size += sum(sizeof(item) for item in self._items)
         size += sum(sizeof(proxy) for proxy in self._proxies)
         size += sizeof(self._raw_proxies[0]) * self.sender_index_size
+        size += sizeof(ReceiverKey) * self._receiver_order.capacity()
         return size
 
     def __cinit__(self, locations_dict: Dict[int, Dict[int, Sequence[int]]]) -> None:
@@ -89,6 +115,8 @@ cdef class LocationStore:
         self.sender_index = NULL
         self.sender_index_size = 0
         self._raw_proxies = NULL
+        self._buffer = None
+        self._receiver_order_built = False
 
     def __init__(self, locations_dict: Dict[int, Dict[int, Sequence[int]]]) -> None:
         self._mem = Pool()
@@ -148,23 +176,92 @@ cdef class LocationStore:
                 self.sender_index[sender].count += 1
                 i += 1
 
+        self.sender_index_size = max_sender + 1
+        self.entry_count = count
+        self._build_proxies()
+
+    cdef _build_proxies(self):
         # build pyobject caches
+        cdef size_t i
         self._proxies.append(None)  # player 0
         assert self.sender_index[0].count == 0
-        for i in range(1, max_sender + 1):
+        for i in range(1, self.sender_index_size):
             assert self.sender_index[i].count == 0 or (
-                    self.sender_index[i].start < count and
-                    self.sender_index[i].start + self.sender_index[i].count <= count)
+                    self.sender_index[i].start < self.entry_count and
+                    self.sender_index[i].start + self.sender_index[i].count <= self.entry_count)
             key = i  # allocate python integer
             proxy = PlayerLocationProxy(self, i)
             self._keys.append(key)
             self._items.append((key, proxy))
             self._proxies.append(proxy)
             self._raw_proxies[i] = <PyObject*>proxy
+        self._len = self.sender_index_size - 1
+
+    @staticmethod
+    def from_buffer(buffer: Any) -> LocationStore:
+        """
+        Create a LocationStore from the output of NetUtils.pack_locations, using the entries in the buffer in place.
+        The buffer is validated and has to stay unchanged for the lifetime of the store.
+        """
+        if not NATIVE_BUFFER_LAYOUT:
+            from NetUtils import unpack_locations
+            return LocationStore(unpack_locations(buffer))
+        cdef const unsigned char[::1] view = buffer
+        cdef size_t size = view.shape[0]
+        if size < sizeof(BufferHeader):
+            raise ValueError("Buffer too small for LocationStore")
+        cdef BufferHeader header
+        memcpy(&header, &view[0], sizeof(BufferHeader))
+        if header.sender_index_size < 2:
+            raise ValueError(f"Rejecting game with 0 players")
+        if header.sender_index_size > <uint64_t>MAX_PLAYER_ID + 1:
+            raise ValueError(f"Invalid player id {header.sender_index_size - 1} for location")
+        if header.entry_count > (size - sizeof(BufferHeader)) // sizeof(LocationEntry) or \
+                size != sizeof(BufferHeader) + header.sender_index_size * sizeof(IndexEntry) + \
+                header.entry_count * sizeof(LocationEntry):
+            raise ValueError("Buffer size does not match LocationStore header")
+
+        cdef LocationStore store = LocationStore.__new__(LocationStore, {})
+        store._mem = Pool()
+        store._keys = []
+        store._items = []
+        store._proxies = []
+        store.sender_index_size = header.sender_index_size
+        store.entry_count = header.entry_count
+        store.sender_index = <IndexEntry*>&view[sizeof(BufferHeader)]
+        store.entries = <LocationEntry*>&view[sizeof(BufferHeader) + header.sender_index_size * sizeof(IndexEntry)]
+        if <size_t>&view[0] % sizeof(uint64_t):
+            # not aligned for direct access, so copy instead
+            store.sender_index = <IndexEntry*>store._mem.alloc(store.sender_index_size, sizeof(IndexEntry))
+            memcpy(store.sender_index, &view[sizeof(BufferHeader)], store.sender_index_size * sizeof(IndexEntry))
+            store.entries = <LocationEntry*>store._mem.alloc(store.entry_count, sizeof(LocationEntry))
+            memcpy(store.entries, &view[sizeof(BufferHeader) + store.sender_index_size * sizeof(IndexEntry)],
+                   store.entry_count * sizeof(LocationEntry))
+        else:
+            store._buffer = view  # holds the buffer export, so the memory can't be released
 
-        self.sender_index_size = max_sender + 1
-        self.entry_count = count
-        self._len = sender_count
+        # validate everything that is used to index, as well as what the constructor validates
+        cdef size_t sender, i
+        cdef IndexEntry* index_entry
+        cdef LocationEntry* entry
+        if store.sender_index[0].count != 0:
+            raise ValueError("Invalid player id 0 for location")
+        for sender in range(1, store.sender_index_size):
+            index_entry = store.sender_index + sender
+            if index_entry.start > store.entry_count or index_entry.count > store.entry_count - index_entry.start:
+                raise ValueError(f"Invalid location index for player {sender}")
+            for i in range(index_entry.start, index_entry.start + index_entry.count):
+                entry = store.entries + i
+                if entry.sender != sender:
+                    raise ValueError(f"Location {entry.location} is not indexed for its player {entry.sender}")
+                if entry.receiver < 1 or entry.receiver > MAX_PLAYER_ID:
+                    raise ValueError(f"Invalid player id {entry.receiver} for item")
+                if i > index_entry.start and entry.location <= (entry - 1).location:
+                    raise ValueError(f"Locations of player {sender} are not sorted")
+
+        store._raw_proxies = <PyObject**>store._mem.alloc(store.sender_index_size, sizeof(PyObject*))
+        store._build_proxies()
+        return store
 
     # fake dict access
     def __len__(self) -> int:
@@ -193,40 +290,68 @@ cdef class LocationStore:
         return self._items
 
     # specialized accessors
+    cdef void _build_receiver_order(self) noexcept:
+        # holds the GIL, so concurrent lookups can't build it twice
+        cdef size_t i
+        if self._receiver_order_built:
+            return
+        self._receiver_order.reserve(self.entry_count)
+        for i in range(self.entry_count):
+            self._receiver_order.push_back(ReceiverKey(
+                pair[ap_player_t, ap_id_t](self.entries[i].receiver, self.entries[i].item), i))
+        sort(self._receiver_order.begin(), self._receiver_order.end())
+        self._receiver_order_built = True
+
+    cdef void _find_entries(self, ap_player_t receiver, ap_id_t first_item, ap_id_t last_item,
+                            vector[size_t]& found) noexcept nogil:
+        """Appends the indices of entries sent to receiver with first_item <= item <= last_item"""
+        cdef size_t MAX_INDEX = <size_t>(-1)
+        cdef vector[ReceiverKey].iterator it = lower_bound(
+            self._receiver_order.begin(), self._receiver_order.end(),
+            ReceiverKey(pair[ap_player_t, ap_id_t](receiver, first_item), 0))
+        cdef vector[ReceiverKey].iterator end = upper_bound(
+            it, self._receiver_order.end(),
+            ReceiverKey(pair[ap_player_t, ap_id_t](receiver, last_item), MAX_INDEX))
+        while it != end:
+            found.push_back(deref(it).second)
+            inc(it)
+
     def find_item(self, slots: Set[int], seeked_item_id: int) -> Generator[Tuple[int, int, int, int, int], None, None]:
         cdef ap_id_t item = seeked_item_id
         cdef ap_player_t receiver
-        cdef std_set[ap_player_t] receivers
-        cdef size_t slot_count = len(slots)
-        if slot_count == 1:
-            # specialized implementation for single slot
-            receiver = list(slots)[0]
-            with nogil:
-                for entry in self.entries[:self.entry_count]:
-                    if entry.item == item and entry.receiver == receiver:
-                        with gil:
-                            yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
-        elif slot_count:
-            # generic implementation with lookup in set
-            for receiver in slots:
-                receivers.insert(receiver)
-            with nogil:
-                for entry in self.entries[:self.entry_count]:
-                    if entry.item == item and receivers.count(entry.receiver):
-                        with gil:
-                            yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
+        cdef vector[size_t] found
+        self._build_receiver_order()
+        for slot in slots:
+            if 0 < slot <= MAX_PLAYER_ID:  # other ids can't be in the store
+                receiver = slot
+                with nogil:
+                    self._find_entries(receiver, item, item, found)
+        if len(slots) > 1:
+            sort(found.begin(), found.end())  # in entry order, as if the store was scanned
+        cdef LocationEntry* entry
+        cdef size_t i
+        for i in found:
+            entry = self.entries + i
+            yield entry.sender, entry.location, entry.item, entry.receiver, entry.flags
 
     def get_for_player(self, slot: int) -> Dict[int, Set[int]]:
-        cdef ap_player_t receiver = slot
         all_locations: Dict[int, Set[int]] = {}
+        if not 0 < slot <= MAX_PLAYER_ID:
+            return all_locations
+        cdef ap_player_t receiver = slot
+        cdef vector[size_t] found
+        self._build_receiver_order()
         with nogil:
-            for entry in self.entries[:self.entry_count]:
-                if entry.receiver == receiver:
-                    with gil:
-                        sender: int = entry.sender
-                        if sender not in all_locations:
-                            all_locations[sender] = set()
-                        all_locations[sender].add(entry.location)
+            self._find_entries(receiver, INT64_MIN, INT64_MAX, found)
+            sort(found.begin(), found.end())
+        cdef LocationEntry* entry
+        cdef size_t i
+        for i in found:
+            entry = self.entries + i
+            sender: int = entry.sender
+            if sender not in all_locations:
+                all_locations[sender] = set()
+            all_locations[sender].add(entry.location)
         return all_locations
 
     if TYPE_CHECKING:
@@ -295,6 +420,9 @@ cdef class PlayerLocationProxy:
     def __len__(self) -> int:
         return self._store.sender_index[self._player].count
 
+    def __contains__(self, key: int) -> bool:
+        return self._get(key) != NULL
+
     def __iter__(self) -> Generator[int, None, None]:
         cdef LocationEntry* entry
         cdef size_t i
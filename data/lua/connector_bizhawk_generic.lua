@@ -20,7 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 ]]
 
-local SCRIPT_VERSION = 1
+local SCRIPT_VERSION = 2
 
 --[[
 This script expects to receive JSON and will send JSON back. A message should
@@ -33,6 +33,19 @@ field `type`. The value of `type` determines what other fields may exist.
 To get the script version, instead of JSON, send "VERSION" to get the script
 version directly (e.g. "2").
 
+Messages are separated by newlines until the client sends "BINARY", which the
+script acknowledges with "BINARY". From then on, both sides send binary frames
+instead, so several requests can be in flight at once:
+
+| size (u32) | request id (u32) | header size (u32) | header | data |
+
+All integers are big endian, and `size` counts every byte after itself. The
+header is the same JSON list of requests or responses, except that data is
+not base64 encoded. `GUARD` and `WRITE` requests have a `size` field instead of
+`expected_data` and `value`, and `READ_RESPONSE`s have a `size` field instead of
+`value`, with the bytes themselves following the header in request order. Each
+response frame carries the id of the request frame it answers.
+
 #### Ex. 1
 
 Request: `[{"type": "PING"}]`
@@ -297,6 +310,12 @@ local locked = false
 
 local rom_hash = nil
 
+local binary_mode = false
+local receive_buffer = ""
+local frame_size = nil
+
+local unpack = table.unpack or unpack
+
 function queue_push (self, value)
     self[self.right] = value
     self.right = self.right + 1
@@ -360,7 +379,7 @@ function process_request (req)
 
     elseif req["type"] == "GUARD" then
         res["type"] = "GUARD_RESPONSE"
-        local expected_data = base64.decode(req["expected_data"])
+        local expected_data = req["data"] or base64.decode(req["expected_data"])
 
         local actual_data = memory.read_bytes_as_array(req["address"], #expected_data, req["domain"])
 
@@ -385,11 +404,11 @@ function process_request (req)
 
     elseif req["type"] == "READ" then
         res["type"] = "READ_RESPONSE"
-        res["value"] = base64.encode(memory.read_bytes_as_array(req["address"], req["size"], req["domain"]))
+        res["data"] = memory.read_bytes_as_array(req["address"], req["size"], req["domain"])
 
     elseif req["type"] == "WRITE" then
         res["type"] = "WRITE_RESPONSE"
-        memory.write_bytes_as_array(req["address"], base64.decode(req["value"]), req["domain"])
+        memory.write_bytes_as_array(req["address"], req["data"] or base64.decode(req["value"]), req["domain"])
 
     elseif req["type"] == "DISPLAY_MESSAGE" then
         res["type"] = "DISPLAY_MESSAGE_RESPONSE"
@@ -407,24 +426,157 @@ function process_request (req)
     return res
 end
 
--- Receive data from AP client and send message back
-function send_receive ()
-    local message, err = client_socket:receive()
+function process_requests (requests)
+    local res = {}
+    local failed_guard_response = nil
+    for i, req in ipairs(requests) do
+        if failed_guard_response ~= nil then
+            res[i] = failed_guard_response
+        else
+            -- An error is more likely to cause an NLua exception than to return an error here
+            local status, response = pcall(process_request, req)
+            if status then
+                res[i] = response
+
+                -- If the GUARD validation failed, skip the remaining commands
+                if response["type"] == "GUARD_RESPONSE" and not response["value"] then
+                    failed_guard_response = response
+                end
+            else
+                if type(response) ~= "string" then response = "Unknown error" end
+                res[i] = {type = "ERROR", err = response}
+            end
+        end
+    end
+    return res
+end
 
-    -- Handle errors
+function encode_u32 (value)
+    return string.char(math.floor(value / 16777216) % 256, math.floor(value / 65536) % 256,
+        math.floor(value / 256) % 256, value % 256)
+end
+
+function decode_u32 (data, position)
+    local b1, b2, b3, b4 = data:byte(position, position + 3)
+    return ((b1 * 256 + b2) * 256 + b3) * 256 + b4
+end
+
+-- Converting in chunks keeps the number of values passed through the stack bounded
+function bytes_to_array (data, position, size)
+    local array = {}
+    local last = position + size - 1
+    for chunk_start = position, last, 4096 do
+        local chunk = {data:byte(chunk_start, math.min(chunk_start + 4095, last))}
+        for _, byte in ipairs(chunk) do
+            array[#array + 1] = byte
+        end
+    end
+    return array
+end
+
+function array_to_bytes (array)
+    local chunks = {}
+    for chunk_start = 1, #array, 4096 do
+        chunks[#chunks + 1] = string.char(unpack(array, chunk_start, math.min(chunk_start + 4095, #array)))
+    end
+    return table.concat(chunks)
+end
+
+function handle_receive_error (err)
     if err == "closed" then
         if current_state == STATE_CONNECTED then
             print("Connection to client closed")
         end
         current_state = STATE_NOT_CONNECTED
-        return
     elseif err == "timeout" then
         unlock()
-        return
-    elseif err ~= nil then
+    else
         print(err)
         current_state = STATE_NOT_CONNECTED
         unlock()
+    end
+end
+
+-- Returns exactly count bytes, keeping partially received data for the next call
+function receive_exactly (count)
+    local data, err, partial = client_socket:receive(count - #receive_buffer)
+    if data == nil then
+        receive_buffer = receive_buffer..(partial or "")
+        return nil, err
+    end
+    data = receive_buffer..data
+    receive_buffer = ""
+    return data
+end
+
+function receive_frame ()
+    if frame_size == nil then
+        local header, err = receive_exactly(4)
+        if header == nil then
+            return nil, err
+        end
+        frame_size = decode_u32(header, 1)
+    end
+
+    local frame, err = receive_exactly(frame_size)
+    if frame == nil then
+        return nil, err
+    end
+    frame_size = nil
+    return frame
+end
+
+-- Answers every complete frame the client has sent so far
+function send_receive_binary ()
+    while true do
+        local frame, err = receive_frame()
+        if frame == nil then
+            handle_receive_error(err)
+            return
+        end
+
+        timeout_timer = 5
+
+        local request_id = decode_u32(frame, 1)
+        local header_size = decode_u32(frame, 5)
+        local requests = json.decode(frame:sub(9, 8 + header_size))
+
+        local position = 9 + header_size
+        for _, req in ipairs(requests) do
+            if (req["type"] == "GUARD" or req["type"] == "WRITE") and req["size"] ~= nil then
+                req["data"] = bytes_to_array(frame, position, req["size"])
+                position = position + req["size"]
+            end
+        end
+
+        local responses = process_requests(requests)
+        local data = {}
+        for _, response in ipairs(responses) do
+            if response["data"] ~= nil then
+                data[#data + 1] = array_to_bytes(response["data"])
+                response["size"] = #response["data"]
+                response["data"] = nil
+            end
+        end
+
+        local header = json.encode(responses)
+        data = table.concat(data)
+        client_socket:send(encode_u32(8 + #header + #data)..encode_u32(request_id)..encode_u32(#header)..header..data)
+    end
+end
+
+-- Receive data from AP client and send message back
+function send_receive ()
+    if binary_mode then
+        send_receive_binary()
+        return
+    end
+
+    local message, err = client_socket:receive()
+
+    -- Handle errors
+    if err ~= nil then
+        handle_receive_error(err)
         return
     end
 
@@ -438,27 +590,15 @@ function send_receive ()
 
     if message == "VERSION" then
         client_socket:send(tostring(SCRIPT_VERSION).."\n")
+    elseif message == "BINARY" then
+        binary_mode = true
+        client_socket:send("BINARY\n")
     else
-        local res = {}
-        local data = json.decode(message)
-        local failed_guard_response = nil
-        for i, req in ipairs(data) do
-            if failed_guard_response ~= nil then
-                res[i] = failed_guard_response
-            else
-                -- An error is more likely to cause an NLua exception than to return an error here
-                local status, response = pcall(process_request, req)
-                if status then
-                    res[i] = response
-
-                    -- If the GUARD validation failed, skip the remaining commands
-                    if response["type"] == "GUARD_RESPONSE" and not response["value"] then
-                        failed_guard_response = response
-                    end
-                else
-                    if type(response) ~= "string" then response = "Unknown error" end
-                    res[i] = {type = "ERROR", err = response}
-                end
+        local res = process_requests(json.decode(message))
+        for _, response in ipairs(res) do
+            if response["data"] ~= nil then
+                response["value"] = base64.encode(response["data"])
+                response["data"] = nil
             end
         end
 
@@ -522,6 +662,9 @@ function main ()
                 if timeout == nil then
                     print("Client connected")
                     current_state = STATE_CONNECTED
+                    binary_mode = false
+                    receive_buffer = ""
+                    frame_size = nil
                     client_socket = client
                     server:close()
                     server = nil
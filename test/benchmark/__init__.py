@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for hot paths in generation and hosting.
+
+These are not collected by the test runner; run a module directly, for example
+`python -m test.benchmark.collection_state`.
+"""
@@ -0,0 +1,55 @@
+"""
+Measures CollectionState.copy() and Fill.sweep_from_pool() against player count.
+
+Usage: python -m test.benchmark.collection_state [game] [player counts...]
+"""
+import sys
+import typing
+
+from test.benchmark.multiworld import setup_multiworld
+from test.benchmark.time_it import TimeIt
+
+
+def run_collection_state_benchmark(game: str = "Timespinner",
+                                   player_counts: typing.Sequence[int] = (1, 10, 50, 100)) -> None:
+    from Fill import sweep_from_pool
+
+    for players in player_counts:
+        multiworld = setup_multiworld(game, players)
+        base_state = multiworld.get_all_state(False)
+        repetitions = 1000
+
+        with TimeIt("copy", repetitions) as copy_time:
+            for _ in range(repetitions):
+                base_state.copy()
+
+        with TimeIt("copy + collect into one player", repetitions) as touch_time:
+            item = multiworld.itempool[0]
+            for _ in range(repetitions):
+                base_state.copy().collect(item, True)
+
+        with TimeIt("copy + materialize all players", repetitions // 10) as eager_time:
+            for _ in range(repetitions // 10):
+                state = base_state.copy()
+                for player in multiworld.get_all_ids():
+                    state.materialize(player)
+
+        with TimeIt("sweep_from_pool", 3) as sweep_time:
+            for _ in range(3):
+                sweep_from_pool(multiworld.state, multiworld.itempool)
+
+        print(f"{players:>4} players | {copy_time} | {touch_time} | {eager_time} | {sweep_time}")
+
+
+if __name__ == "__main__":
+    import warnings
+
+    import Utils
+    Utils.init_logging("Benchmark", loglevel="warning")
+    warnings.simplefilter("ignore")
+    if len(sys.argv) > 2:
+        run_collection_state_benchmark(sys.argv[1], [int(count) for count in sys.argv[2:]])
+    elif len(sys.argv) > 1:
+        run_collection_state_benchmark(sys.argv[1])
+    else:
+        run_collection_state_benchmark()
@@ -0,0 +1,35 @@
+"""
+Measures Fill.distribute_items_restrictive() against player count, which is dominated by fill_restrictive.
+
+Usage: python -m test.benchmark.fill [game] [player counts...]
+"""
+import sys
+import typing
+
+from test.benchmark.multiworld import gen_steps, setup_multiworld
+from test.benchmark.time_it import TimeIt
+
+
+def run_fill_benchmark(game: str = "Timespinner", player_counts: typing.Sequence[int] = (1, 10, 25, 50)) -> None:
+    from Fill import distribute_items_restrictive
+
+    for players in player_counts:
+        multiworld = setup_multiworld(game, players, gen_steps + ("pre_fill",))
+        progression = sum(1 for item in multiworld.itempool if item.advancement)
+        with TimeIt("distribute_items_restrictive") as fill_time:
+            distribute_items_restrictive(multiworld)
+        print(f"{players:>4} players | {progression:>6} progression items | {fill_time}")
+
+
+if __name__ == "__main__":
+    import warnings
+
+    import Utils
+    Utils.init_logging("Benchmark", loglevel="warning")
+    warnings.simplefilter("ignore")
+    if len(sys.argv) > 2:
+        run_fill_benchmark(sys.argv[1], [int(count) for count in sys.argv[2:]])
+    elif len(sys.argv) > 1:
+        run_fill_benchmark(sys.argv[1])
+    else:
+        run_fill_benchmark()
@@ -0,0 +1,74 @@
+"""
+Measures MultiServer.register_location_checks() for single checks and a release in a room full of connected clients.
+
+Usage: python -m test.benchmark.multi_server [client counts...]
+"""
+import random
+import sys
+import typing
+from unittest import mock
+
+from test.benchmark.time_it import TimeIt
+
+if typing.TYPE_CHECKING:
+    from MultiServer import Context
+
+locations_per_slot = 100
+
+
+def setup_context(clients: int) -> "Context":
+    """Creates a room with one connected client per slot, where each slot's items are spread over all slots."""
+    from MultiServer import Client, Context
+    from NetUtils import LocationStore
+
+    ctx = Context("", 0, "", "", 0, 0, False)
+    world_random = random.Random(0)
+    ctx.locations = LocationStore({
+        slot: {location: (location, world_random.randint(1, clients), 0)
+               for location in range(slot * locations_per_slot, (slot + 1) * locations_per_slot)}
+        for slot in range(1, clients + 1)
+    })
+    ctx.player_names = {(0, slot): f"Player{slot}" for slot in range(1, clients + 1)}
+    ctx.clients = {0: {}}
+    for slot in range(1, clients + 1):
+        client = Client(None, ctx)
+        client.team, client.slot = 0, slot
+        client.no_items, client.remote_items, client.remote_start_inventory = False, True, False
+        ctx.clients[0][slot] = [client]
+    ctx.save = lambda: None
+    return ctx
+
+
+def run_multi_server_benchmark(client_counts: typing.Sequence[int] = (50, 500)) -> None:
+    from MultiServer import register_location_checks, release_player
+
+    for clients in client_counts:
+        ctx = setup_context(clients)
+        sent_messages = 0
+
+        def send_msgs(client: typing.Any, msgs: typing.List[dict]) -> None:
+            nonlocal sent_messages
+            sent_messages += 1
+
+        ctx.send_msgs = send_msgs
+        ctx.broadcast_send_encoded_msgs = lambda endpoints, msg: list(endpoints)
+        with mock.patch("MultiServer.async_start", lambda coroutine: None):
+            checks = range(locations_per_slot, locations_per_slot + locations_per_slot // 2)
+            with TimeIt("single check", len(checks)) as check_time:
+                for location in checks:
+                    register_location_checks(ctx, 0, 1, [location])
+            with TimeIt("release") as release_time:
+                release_player(ctx, 0, 2)
+        print(f"{clients:>4} clients | {check_time} | {release_time} | {sent_messages} ReceivedItems sent")
+
+
+if __name__ == "__main__":
+    import warnings
+
+    import Utils
+    Utils.init_logging("Benchmark", loglevel="warning")
+    warnings.simplefilter("ignore")
+    if len(sys.argv) > 1:
+        run_multi_server_benchmark([int(count) for count in sys.argv[1:]])
+    else:
+        run_multi_server_benchmark()
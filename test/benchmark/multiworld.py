@@ -0,0 +1,27 @@
+import typing
+from argparse import Namespace
+
+if typing.TYPE_CHECKING:
+    from BaseClasses import MultiWorld
+
+gen_steps = ("generate_early", "create_regions", "create_items", "set_rules", "generate_basic")
+
+
+def setup_multiworld(game: str, players: int, steps: typing.Sequence[str] = gen_steps) -> "MultiWorld":
+    from BaseClasses import MultiWorld, CollectionState
+    from worlds import AutoWorld
+    from worlds.AutoWorld import call_all
+
+    world_type = AutoWorld.AutoWorldRegister.world_types[game]
+    multiworld = MultiWorld(players)
+    multiworld.game = {player: game for player in multiworld.player_ids}
+    multiworld.player_name = {player: f"Tester{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(0)
+    multiworld.state = CollectionState(multiworld)
+    args = Namespace()
+    for name, option in world_type.options_dataclass.type_hints.items():
+        setattr(args, name, {player: option.from_any(option.default) for player in multiworld.player_ids})
+    multiworld.set_options(args)
+    for step in steps:
+        call_all(multiworld, step)
+    return multiworld
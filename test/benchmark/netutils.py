@@ -0,0 +1,59 @@
+"""
+Measures NetUtils.encode() with and without orjson and NetUtils.decode() for typical packets of a large room.
+
+Usage: python -m test.benchmark.netutils [players]
+"""
+import sys
+import typing
+from unittest import mock
+
+from test.benchmark.time_it import TimeIt
+
+
+def create_packets(players: int) -> typing.Dict[str, typing.List[dict]]:
+    from NetUtils import NetworkItem, NetworkPlayer, NetworkSlot, SlotType
+
+    items = [NetworkItem(index, 1000 + index, index % players + 1, index % 3) for index in range(players * 100)]
+    return {
+        "Connected": [{
+            "cmd": "Connected", "team": 0, "slot": 1, "hint_points": 0,
+            "players": [NetworkPlayer(0, slot, f"Player{slot}", f"Player{slot}") for slot in range(1, players + 1)],
+            "missing_locations": list(range(500)), "checked_locations": list(range(500, 1000)),
+            "slot_info": {slot: NetworkSlot(f"Player{slot}", "Clique", SlotType.player)
+                          for slot in range(1, players + 1)},
+            "slot_data": {"goal": 1, "options": {f"option{index}": index for index in range(50)}},
+        }],
+        "ReceivedItems": [{"cmd": "ReceivedItems", "index": 0, "items": items}],
+        "PrintJSON": [{"cmd": "PrintJSON", "type": "ItemSend", "receiving": 2, "item": items[0], "data": [
+            {"type": "player_id", "text": "1"}, {"text": " sent "},
+            {"type": "item_id", "text": "1", "player": 2, "flags": 1}, {"text": " to "},
+            {"type": "player_id", "text": "2"}, {"text": " ("}, {"type": "location_id", "text": "1000", "player": 1},
+            {"text": ")"}]}],
+        "RoomUpdate": [{"cmd": "RoomUpdate", "hint_points": 5, "checked_locations": set(range(players * 100))}],
+    }
+
+
+def run_netutils_benchmark(players: int = 500) -> None:
+    import NetUtils
+    from NetUtils import decode, encode
+
+    for name, packet in create_packets(players).items():
+        repetitions = 10 if name in {"ReceivedItems", "RoomUpdate"} else 1000
+        with TimeIt("encode", repetitions) as encode_time:
+            for _ in range(repetitions):
+                encoded = encode(packet)
+        with mock.patch.object(NetUtils, "orjson", None):
+            with TimeIt("encode without orjson", repetitions) as fallback_time:
+                for _ in range(repetitions):
+                    encode(packet)
+        with TimeIt("decode", repetitions) as decode_time:
+            for _ in range(repetitions):
+                decode(encoded)
+        print(f"{name:>13} | {len(encoded):>8} chars | {encode_time} | {fallback_time} | {decode_time}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_netutils_benchmark(int(sys.argv[1]))
+    else:
+        run_netutils_benchmark()
@@ -0,0 +1,31 @@
+import time
+import typing
+
+
+class TimeIt:
+    """Context manager collecting the wall time of its body, optionally averaged over a number of repetitions."""
+    name: str
+    repetitions: int
+    start: float
+    elapsed: float
+
+    def __init__(self, name: str, repetitions: int = 1) -> None:
+        self.name = name
+        self.repetitions = repetitions
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "TimeIt":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.elapsed = time.perf_counter() - self.start
+
+    @property
+    def per_repetition(self) -> float:
+        return self.elapsed / self.repetitions
+
+    def __str__(self) -> str:
+        if self.repetitions > 1:
+            return f"{self.name}: {self.per_repetition * 1_000_000:.1f} µs x {self.repetitions}"
+        return f"{self.name}: {self.elapsed * 1000:.2f} ms"
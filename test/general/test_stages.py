@@ -0,0 +1,64 @@
+import unittest
+from argparse import Namespace
+from typing import List, Tuple
+
+from BaseClasses import CollectionState, MultiWorld
+from Fill import distribute_items_restrictive
+from worlds.AutoWorld import AutoWorldRegister, call_all
+games = ("Clique", "ChecksFinder", "Clique", "Clique")
+stages = ("generate_early", "create_regions", "create_items", "set_rules", "generate_basic")
+
+
+def setup_multiworld(workers: int, seed: int = 0) -> MultiWorld:
+    multiworld = MultiWorld(len(games))
+    for player, game in enumerate(games, 1):
+        multiworld.game[player] = game
+    multiworld.player_name = {player: f"Tester{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(seed)
+    multiworld.state = CollectionState(multiworld)
+    args = Namespace()
+    for player, game in multiworld.game.items():
+        for name, option in AutoWorldRegister.world_types[game].options_dataclass.type_hints.items():
+            vars(args).setdefault(name, {})[player] = option.from_any(option.default)
+    multiworld.set_options(args)
+    for stage in stages:
+        call_all(multiworld, stage, workers=workers)
+    return multiworld
+
+
+def pool_of(multiworld: MultiWorld) -> List[Tuple[str, int]]:
+    return [(item.name, item.player) for item in multiworld.itempool]
+
+
+def placements_of(multiworld: MultiWorld) -> List[Tuple[str, int, str, int]]:
+    call_all(multiworld, "pre_fill")
+    distribute_items_restrictive(multiworld)
+    call_all(multiworld, "post_fill")
+    return [(location.name, location.player, location.item.name, location.item.player)
+            for location in multiworld.get_locations()]
+
+
+class TestStageWorkers(unittest.TestCase):
+    def test_same_as_serial(self) -> None:
+        """Tests that running thread-safe worlds concurrently creates the same item pool and regions"""
+        serial = setup_multiworld(0)
+        concurrent = setup_multiworld(2)
+        self.assertEqual(pool_of(serial), pool_of(concurrent))
+        self.assertEqual([region.name for region in serial.regions], [region.name for region in concurrent.regions])
+        self.assertIs(list, type(concurrent.itempool))
+
+    def test_same_placements_across_runs(self) -> None:
+        """Tests that generating with stage workers places the same items as a serial run, every time"""
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                serial = placements_of(setup_multiworld(0, seed))
+                for _ in range(3):
+                    self.assertEqual(serial, placements_of(setup_multiworld(3, seed)))
+
+    def test_shared_random_is_blocked(self) -> None:
+        """Tests that a thread-safe world can't draw from the shared random while other worlds run"""
+        multiworld = setup_multiworld(0)
+        multiworld.worlds[1].generate_basic = lambda: multiworld.random.random()
+        with self.assertRaises(RuntimeError):
+            call_all(multiworld, "generate_basic", workers=2)
+        self.assertTrue(multiworld.random.passthrough)
@@ -0,0 +1,308 @@
+import random
+import unittest
+
+from BaseClasses import CollectionState, Item, MultiWorld
+from worlds.AutoWorld import AutoWorldRegister, World, call_all
+from . import gen_steps, setup_solo_multiworld
+from .test_fill import generate_multi_world, generate_player_data
+
+
+class TestCollectionStateCopy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_multi_world(2)
+        self.player1 = generate_player_data(self.multiworld, 1, 2, 2)
+        self.player2 = generate_player_data(self.multiworld, 2, 2, 2)
+        self.region = self.player1.generate_region(self.player1.menu, 1,
+                                                   lambda state: state.has(self.player1.prog_items[0].name, 1))
+
+    def test_copy_shares_until_written(self) -> None:
+        """Tests that a copy shares per-player layers until a player is collected into"""
+        state = CollectionState(self.multiworld)
+        copied = state.copy()
+        self.assertIs(state.prog_items[1], copied.prog_items[1])
+        copied.collect(self.player1.prog_items[0], True)
+        self.assertIsNot(state.prog_items[1], copied.prog_items[1])
+        self.assertIs(state.prog_items[2], copied.prog_items[2])
+
+    def test_copy_is_independent(self) -> None:
+        """Tests that collecting into a copy or its source does not leak into the other"""
+        state = CollectionState(self.multiworld)
+        copied = state.copy()
+        copied.collect(self.player1.prog_items[0], True)
+        self.assertTrue(self.region.can_reach(copied))
+        self.assertFalse(self.region.can_reach(state))
+        self.assertEqual(0, state.count(self.player1.prog_items[0].name, 1))
+
+        state.collect(self.player2.prog_items[0], True)
+        self.assertEqual(0, copied.count(self.player2.prog_items[0].name, 2))
+
+    def test_remove_from_copy(self) -> None:
+        """Tests that removing from a copy keeps the source's reachability intact"""
+        state = CollectionState(self.multiworld)
+        state.collect(self.player1.prog_items[0], True)
+        self.assertTrue(self.region.can_reach(state))
+        copied = state.copy()
+        copied.remove(self.player1.prog_items[0])
+        self.assertFalse(self.region.can_reach(copied))
+        self.assertTrue(self.region.can_reach(state))
+
+    def test_mixin_without_materialize(self) -> None:
+        """Tests that copies run init_mixin of logic mixins, which don't share their data until materialized"""
+        from unittest import mock
+        from worlds.AutoWorld import LogicMixin
+        with mock.patch.object(CollectionState, "additional_init_functions", []), \
+                mock.patch.object(CollectionState, "additional_copy_functions", []), \
+                mock.patch.object(CollectionState, "copy_init_functions", []):
+            class LegacyLogic(LogicMixin):
+                def init_mixin(self, parent: MultiWorld) -> None:
+                    self.legacy_cache = {}
+
+                def copy_mixin(self, ret: CollectionState) -> CollectionState:
+                    ret.legacy_cache.update(self.legacy_cache)
+                    return ret
+
+            state = CollectionState(self.multiworld)
+            state.legacy_cache["key"] = 1
+            copied = state.copy()
+        self.assertEqual({"key": 1}, copied.legacy_cache)
+        self.assertIsNot(state.legacy_cache, copied.legacy_cache)
+
+    def test_copy_during_oot_search(self) -> None:
+        """Tests that a rule copying the state while OoT searches its regions does not share the search with the copy"""
+        from worlds.oot import OOTWorld
+        multiworld = setup_solo_multiworld(OOTWorld, ("generate_early", "create_regions", "create_items",
+                                                      "set_rules"))
+        entrance = multiworld.get_region("Menu", 1).exits[0]
+        copies = []
+        access_rule = entrance.access_rule
+
+        def copying_rule(state: CollectionState) -> bool:
+            if not copies:
+                copies.append(state.copy())
+            return access_rule(state)
+
+        entrance.access_rule = copying_rule
+        state = CollectionState(multiworld)
+        state._oot_update_age_reachable_regions(1)
+        copied = copies[0]
+        self.assertEqual({multiworld.get_region("Menu", 1)}, copied.child_reachable_regions[1])
+        self.assertGreater(len(state.child_reachable_regions[1]), 1)
+
+
+class TestEventLocationIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_multi_world()
+        self.player1 = generate_player_data(self.multiworld, 1, 2, 2, 1)
+
+    def test_event_flag_updates_index(self) -> None:
+        """Tests that flagging a location as event registers it with the multiworld and unflagging removes it"""
+        location = self.player1.locations[0]
+        self.assertNotIn(location, self.multiworld.get_event_locations())
+        location.place_locked_item(self.player1.prog_items[0])
+        self.assertIn(location, self.multiworld.get_event_locations(1))
+        location.event = False
+        self.assertNotIn(location, self.multiworld.get_event_locations())
+
+    def test_swap_moves_event(self) -> None:
+        """Tests that swapping items between locations keeps the index in sync"""
+        from Fill import swap_location_item
+        location_1, location_2 = self.player1.locations
+        self.multiworld.push_item(location_1, self.player1.prog_items[0], False)
+        location_1.event = True
+        self.multiworld.push_item(location_2, self.player1.basic_items[0], False)
+        swap_location_item(location_1, location_2)
+        self.assertEqual([location_2], list(self.multiworld.get_event_locations()))
+
+    def test_removed_location_leaves_index(self) -> None:
+        """Tests that removing a location from its region also removes it from the index"""
+        location = self.player1.locations[0]
+        location.place_locked_item(self.player1.prog_items[0])
+        self.player1.menu.locations.remove(location)
+        self.assertNotIn(location, self.multiworld.get_event_locations())
+
+    def test_sweep_collects_indexed_events(self) -> None:
+        """Tests that sweep_for_events collects events found through the index"""
+        region = self.player1.generate_region(self.player1.menu, 1,
+                                              lambda state: state.has(self.player1.prog_items[0].name, 1))
+        self.player1.locations[0].place_locked_item(self.player1.prog_items[0])
+        region.locations[0].place_locked_item(self.player1.prog_items[1])
+        state = CollectionState(self.multiworld)
+        state.sweep_for_events()
+        self.assertTrue(state.has(self.player1.prog_items[1].name, 1))
+
+    def test_sweep_collects_locked_dungeon_items(self) -> None:
+        """Tests that sweep_for_events collects locked dungeon items, which are not events"""
+        class DungeonItem(Item):
+            locked_dungeon_item = True
+
+        item = self.player1.prog_items[0]
+        location = self.player1.locations[0]
+        self.multiworld.push_item(location, DungeonItem(item.name, item.classification, item.code, 1), False)
+        location.locked = True
+        self.assertIn(location, self.multiworld.get_locked_locations(1))
+        self.assertNotIn(location, self.multiworld.get_event_locations())
+        state = CollectionState(self.multiworld)
+        state.sweep_for_events()
+        self.assertTrue(state.has(item.name, 1))
+        location.locked = False
+        self.assertNotIn(location, self.multiworld.get_locked_locations())
+
+
+class TestEntranceDependencies(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_multi_world(2)
+        self.multiworld.worlds[1].trace_rule_dependencies = True
+        self.player1 = generate_player_data(self.multiworld, 1, 0, 3)
+        self.player2 = generate_player_data(self.multiworld, 2, 0, 1)
+        self.item_a, self.item_b, self.item_c = self.player1.prog_items
+        self.evaluations = 0
+
+    def counting(self, rule):
+        def counted_rule(state: CollectionState) -> bool:
+            self.evaluations += 1
+            return rule(state)
+        return counted_rule
+
+    def test_only_dependents_are_retested(self) -> None:
+        """Tests that collecting an item only re-tests the blocked entrances whose rule read it"""
+        region = self.player1.generate_region(self.player1.menu, 0, self.counting(
+            lambda state: state.has(self.item_a.name, 1) and state.has(self.item_b.name, 1)))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(region.can_reach(state))
+        evaluations = self.evaluations
+
+        state.collect(self.item_c, True)
+        self.assertFalse(region.can_reach(state))
+        self.assertEqual(evaluations, self.evaluations)
+
+        # the rule short-circuits before reading item_b, so item_b is only a dependency once item_a is collected
+        state.collect(self.item_a, True)
+        self.assertFalse(region.can_reach(state))
+        self.assertGreater(self.evaluations, evaluations)
+        state.collect(self.item_b, True)
+        self.assertTrue(region.can_reach(state))
+
+    def test_untraceable_rule_is_always_retested(self) -> None:
+        """Tests that a rule reading another player's items falls back to being re-tested on every update"""
+        region = self.player1.generate_region(self.player1.menu, 0, self.counting(
+            lambda state: state.has(self.player2.prog_items[0].name, 2)))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(region.can_reach(state))
+        state.collect(self.player2.prog_items[0], True)
+        evaluations = self.evaluations
+        state.collect(self.item_c, True)
+        self.assertTrue(region.can_reach(state))
+        self.assertGreater(self.evaluations, evaluations)
+
+    def test_indirect_condition(self) -> None:
+        """Tests that a region checked by a rule unblocks it through its registered indirect condition"""
+        gate = self.player1.generate_region(self.player1.menu, 0, lambda state: state.has(self.item_a.name, 1))
+        region = self.player1.generate_region(self.player1.menu, 0,
+                                              lambda state: state.can_reach(gate.name, "Region", 1))
+        self.multiworld.register_indirect_condition(gate, self.player1.menu.exits[1])
+        state = CollectionState(self.multiworld)
+        self.assertFalse(region.can_reach(state))
+        state.collect(self.item_a, True)
+        self.assertTrue(region.can_reach(state))
+
+    def test_replaced_rule_is_forgotten(self) -> None:
+        """Tests that replacing an access rule drops the dependencies recorded for the old one"""
+        region = self.player1.generate_region(self.player1.menu, 0, lambda state: state.has(self.item_a.name, 1))
+        entrance = self.player1.menu.exits[0]
+        state = CollectionState(self.multiworld)
+        self.assertFalse(region.can_reach(state))
+        self.assertIn(entrance, self.multiworld.entrance_dependencies.known)
+        entrance.access_rule = lambda state: state.has(self.item_b.name, 1)
+        self.assertNotIn(entrance, self.multiworld.entrance_dependencies.known)
+        state.collect(self.item_b, True)
+        self.assertTrue(region.can_reach(state))
+
+    def test_only_used_by_opted_in_players(self) -> None:
+        """Tests that players not using entrance dependencies keep plain counters and entrances"""
+        from collections import Counter
+        from BaseClasses import Entrance, ItemCounter
+        traced = self.player1.generate_region(self.player1.menu, 0, lambda state: state.has(self.item_a.name, 1))
+        untraced = self.player2.generate_region(self.player2.menu, 0,
+                                                lambda state: state.has(self.player2.prog_items[0].name, 2, 2))
+        state = CollectionState(self.multiworld)
+        self.assertFalse(traced.can_reach(state))
+        self.assertFalse(untraced.can_reach(state))
+        state.collect(self.player2.prog_items[0], True)
+        self.assertFalse(untraced.can_reach(state))
+        self.assertIs(Counter, type(state.prog_items[2]))
+        self.assertIs(Entrance, type(untraced.entrances[0]))
+        self.assertIsInstance(state.prog_items[1], ItemCounter)
+        self.assertIsNot(Entrance, type(traced.entrances[0]))
+        self.assertIsInstance(traced.entrances[0], Entrance)
+
+    def test_declared_dependencies(self) -> None:
+        """Tests that declared dependencies are used instead of tracing"""
+        self.multiworld.worlds[1].trace_rule_dependencies = False
+        region = self.player1.generate_region(self.player1.menu, 0, self.counting(
+            lambda state: state.has(self.item_a.name, 1)))
+        self.multiworld.entrance_dependencies.declare(self.player1.menu.exits[0], [self.item_a.name])
+        state = CollectionState(self.multiworld)
+        self.assertFalse(region.can_reach(state))
+        evaluations = self.evaluations
+        state.collect(self.item_c, True)
+        self.assertFalse(region.can_reach(state))
+        self.assertEqual(evaluations, self.evaluations)
+        state.collect(self.item_a, True)
+        self.assertTrue(region.can_reach(state))
+
+
+class TestReversibleCollect(unittest.TestCase):
+    def assert_round_trip(self, multiworld: MultiWorld) -> None:
+        """Tests that collecting all progression and removing one item equals collecting all but that item"""
+        items = [item for item in multiworld.itempool if item.advancement]
+        random.Random(0).shuffle(items)
+        full_state = CollectionState(multiworld)
+        for item in items:
+            full_state.collect(item, True)
+        tested = set()
+        for index, item in enumerate(items):
+            if item.name in tested:
+                continue
+            tested.add(item.name)
+            with self.subTest(item=item.name):
+                removed_state = full_state.copy()
+                removed_state.remove(item, True)
+                expected_state = CollectionState(multiworld)
+                for other_item in items[:index] + items[index + 1:]:
+                    expected_state.collect(other_item, True)
+                self.assertEqual({name: count for name, count in expected_state.prog_items[1].items() if count},
+                                 {name: count for name, count in removed_state.prog_items[1].items() if count})
+
+    def test_reversible_worlds(self) -> None:
+        """Tests every world that overrides collect or remove and declares reversible_collect"""
+        for game_name, world_type in AutoWorldRegister.world_types.items():
+            if world_type.reversible_collect and \
+                    (world_type.collect is not World.collect or world_type.remove is not World.remove):
+                with self.subTest(game_name):
+                    self.assert_round_trip(setup_solo_multiworld(world_type))
+
+    def test_hk_split_cloak(self) -> None:
+        """Tests that the Hollow Knight dash levels don't depend on the order the split cloaks are collected in"""
+        multiworld = setup_solo_multiworld(AutoWorldRegister.world_types["Hollow Knight"], ())
+        multiworld.SplitMothwingCloak[1].value = True
+        for step in gen_steps:
+            call_all(multiworld, step)
+        self.assertTrue(any(item.name == "Left_Mothwing_Cloak" for item in multiworld.itempool))
+        self.assert_round_trip(multiworld)
+
+    def test_overriding_worlds_opt_in(self) -> None:
+        class CustomCollect(World):
+            item_name_to_id = {}
+            location_name_to_id = {}
+
+            def collect(self, state, item) -> bool:
+                return super().collect(state, item)
+
+        class DeclaredCustomCollect(CustomCollect):
+            item_name_to_id = {}
+            location_name_to_id = {}
+            reversible_collect = True
+
+        self.assertTrue(World.reversible_collect)
+        self.assertFalse(CustomCollect.reversible_collect)
+        self.assertTrue(DeclaredCustomCollect.reversible_collect)
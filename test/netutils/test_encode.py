@@ -0,0 +1,57 @@
+# Tests for NetUtils.encode
+import unittest
+
+import NetUtils
+from NetUtils import ClientStatus, Hint, JSONFragment, NetworkItem, NetworkPlayer, NetworkSlot, SlotType, decode, \
+    encode, encode_messages
+from Utils import Version
+
+sample_messages = [
+    {"cmd": "Connected", "team": 0, "slot": 1, "players": [NetworkPlayer(0, 1, "Ä ", "Player\t1")],
+     "missing_locations": [1, 2, 3], "checked_locations": set(), "hint_points": 0,
+     "slot_info": {1: NetworkSlot("Player1", "Clique", SlotType.player),
+                   2: NetworkSlot("Group", "Clique", SlotType.group, [1])},
+     "slot_data": {"goal": True, "nested": {"list": [1.5, None, "\x00\x7f\"\\"]}}},
+    {"cmd": "ReceivedItems", "index": 0, "items": [NetworkItem(1, 2, 3, 4), NetworkItem(-1, -2, 0)]},
+    {"cmd": "PrintJSON", "type": "Hint", "data": [{"text": "x", "type": "player_id"}], "found": False,
+     "item": NetworkItem(1, 2, 3, 0b100)},
+    {"cmd": "RoomUpdate", "checked_locations": frozenset(range(1000)), "version": Version(0, 4, 4)},
+    {"cmd": "SetReply", "key": "key", "value": {"status": ClientStatus.CLIENT_GOAL, "big": 2 ** 70},
+     "original_value": (1, 2), "hint": Hint(1, 2, 3, 4, False)},
+]
+
+
+class TestEncode(unittest.TestCase):
+    def test_fallback_is_identical(self) -> None:
+        """Tests that the json module fallback produces the same JSON as orjson"""
+        if not NetUtils.orjson:
+            self.skipTest("orjson is not installed")
+        for message in sample_messages:
+            with self.subTest(cmd=message["cmd"]):
+                self.assertEqual(NetUtils._encode(NetUtils._scan_for_TypedTuples([message])), encode([message]))
+
+    def test_converters_match_fields(self) -> None:
+        """Tests that the NamedTuple converters produce the same dicts as _asdict"""
+        for typed_tuple in (NetworkItem(1, 2, 3, 4), NetworkPlayer(0, 1, "a", "b"),
+                            NetworkSlot("a", "b", SlotType.group, [1])):
+            with self.subTest(cls=type(typed_tuple).__name__):
+                self.assertEqual({**typed_tuple._asdict(), "class": type(typed_tuple).__name__},
+                                 NetUtils._typed_tuple_to_dict(typed_tuple))
+
+    def test_round_trip(self) -> None:
+        """Tests that protocol types decode back to what was encoded"""
+        received_items = decode(encode([sample_messages[1]]))[0]
+        self.assertEqual(sample_messages[1]["items"], received_items["items"])
+        self.assertIsInstance(received_items["items"][0], NetworkItem)
+
+    def test_unserializable(self) -> None:
+        """Tests that objects that aren't part of the protocol are rejected"""
+        with self.assertRaises(TypeError):
+            encode([{"cmd": "Bounce", "data": object()}])
+
+    def test_fragments(self) -> None:
+        """Tests that messages with pre-encoded values encode like the messages with the values themselves"""
+        connected = sample_messages[0]
+        with_fragments = {key: JSONFragment(encode(value)) if key in {"players", "slot_info"} else value
+                          for key, value in connected.items()}
+        self.assertEqual(encode([connected, sample_messages[1]]), encode_messages([with_fragments, sample_messages[1]]))
@@ -2,7 +2,7 @@
 import typing
 import unittest
 import warnings
-from NetUtils import LocationStore, _LocationStore
+from NetUtils import LocationStore, _LocationStore, pack_locations
 
 State = typing.Dict[typing.Tuple[int, int], typing.Set[int]]
 RawLocations = typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]]
@@ -93,9 +93,18 @@ class Base:
             self.assertEqual(sorted(self.store.find_item({3, 4}, 99)),
                              [(3, 9, 99, 4, 0), (4, 9, 99, 3, 0)])
 
+        def test_find_item_order(self) -> None:
+            self.assertEqual(list(self.store.find_item({4, 3}, 99)),
+                             [(3, 9, 99, 4, 0), (4, 9, 99, 3, 0)])
+            self.assertEqual(list(self.store.find_item({0, 3}, 99)),
+                             [(4, 9, 99, 3, 0)])
+
         def test_get_for_player(self) -> None:
             self.assertEqual(self.store.get_for_player(3), {4: {9}})
             self.assertEqual(self.store.get_for_player(1), {1: {13}, 2: {22, 23}})
+            self.assertEqual(list(self.store.get_for_player(1)), [1, 2])
+            self.assertEqual(self.store.get_for_player(0), {})
+            self.assertEqual(self.store.get_for_player(5), {})
 
         def test_get_checked(self) -> None:
             self.assertEqual(self.store.get_checked(full_state, 0, 1), [11, 12, 13])
@@ -189,6 +198,13 @@ class TestPurePythonLocationStore(Base.TestLocationStore):
         super().setUp()
 
 
+class TestPurePythonLocationStoreFromBuffer(Base.TestLocationStore):
+    """Run base method tests for the pure python implementation loaded from packed locations."""
+    def setUp(self) -> None:
+        self.store = _LocationStore.from_buffer(pack_locations(sample_data))
+        super().setUp()
+
+
 class TestPurePythonLocationStoreConstructor(Base.TestLocationStoreConstructor):
     """Run base constructor tests for the pure python implementation."""
     def setUp(self) -> None:
@@ -204,6 +220,30 @@ class TestSpeedupsLocationStore(Base.TestLocationStore):
         super().setUp()
 
 
+@unittest.skipIf(LocationStore is _LocationStore, "_speedups not available")
+class TestSpeedupsLocationStoreFromBuffer(Base.TestLocationStore):
+    """Run base method tests for cython implementation using packed locations in place."""
+    def setUp(self) -> None:
+        self.store = LocationStore.from_buffer(pack_locations(sample_data))
+        super().setUp()
+
+    def test_unaligned(self) -> None:
+        buffer = bytearray(1) + pack_locations(sample_data)
+        store = LocationStore.from_buffer(memoryview(buffer)[1:])
+        buffer[:] = bytes(len(buffer))  # unaligned buffers are copied
+        self.assertEqual(store[1][11], (21, 2, 7))
+
+    def test_truncated(self) -> None:
+        with self.assertRaises(ValueError):
+            LocationStore.from_buffer(pack_locations(sample_data)[:-1])
+
+    def test_wrong_sender(self) -> None:
+        buffer = bytearray(pack_locations(sample_data))
+        buffer[-24] = 3  # sender of the last entry
+        with self.assertRaises(ValueError):
+            LocationStore.from_buffer(bytes(buffer))
+
+
 @unittest.skipIf(LocationStore is _LocationStore, "_speedups not available")
 class TestSpeedupsLocationStoreConstructor(Base.TestLocationStoreConstructor):
     """Run base constructor tests and tests the additional constraints for cython implementation."""
@@ -0,0 +1,59 @@
+# Tests for NetUtils.dump_multidata and NetUtils.load_multidata
+import pickle
+import unittest
+import zlib
+
+from NetUtils import Hint, LocationStore, MultiData, NetworkSlot, SlotType, dump_multidata, load_multidata
+from Utils import VersionException
+
+sample_multidata = {
+    "slot_data": {1: {"goal": 1}, 2: {}},
+    "slot_info": {1: NetworkSlot("A", "Clique", SlotType.player), 2: NetworkSlot("B", "Clique", SlotType.player)},
+    "locations": {1: {11: (21, 2, 0)}, 2: {21: (11, 1, 0)}},
+    "precollected_hints": {1: {Hint(2, 1, 11, 21, False)}, 2: set()},
+    "datapackage": {"Clique": {"checksum": "abc", "version": 0}},
+    "seed_name": "12345",
+}
+
+
+class TestMultiData(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        """Tests that sectioned multidata reads back as what was written"""
+        multidata = load_multidata(dump_multidata(sample_multidata))
+        self.assertIsInstance(multidata, MultiData)
+        self.assertEqual(list(sample_multidata), list(multidata))
+        for key, value in sample_multidata.items():
+            if key == "locations":
+                self.assertIsInstance(multidata[key], LocationStore)
+                self.assertEqual(value, {player: dict(locations.items())
+                                         for player, locations in multidata[key].items()})
+            else:
+                self.assertEqual(value, dict(multidata[key]) if isinstance(value, dict) else multidata[key])
+
+    def test_lazy_sections(self) -> None:
+        """Tests that only accessed sections are decompressed"""
+        multidata = load_multidata(dump_multidata(sample_multidata))
+        self.assertEqual({"goal": 1}, multidata["slot_data"][1])
+        self.assertEqual(["slot_data"], list(multidata._loaded))
+        self.assertEqual([1], list(multidata["slot_data"]._loaded))
+
+    def test_modify(self) -> None:
+        """Tests that changes to loaded multidata are written back out"""
+        multidata = load_multidata(dump_multidata(sample_multidata))
+        del multidata["datapackage"]["Clique"]
+        multidata["slot_data"][2] = {"goal": 2}
+        multidata["tags"] = ["AP"]
+        multidata = load_multidata(dump_multidata(multidata))
+        self.assertEqual({}, dict(multidata["datapackage"]))
+        self.assertEqual({"goal": 2}, multidata["slot_data"][2])
+        self.assertEqual(["AP"], multidata["tags"])
+
+    def test_version_3(self) -> None:
+        """Tests that the single compressed blob format can still be read"""
+        data = bytes([3]) + zlib.compress(pickle.dumps(sample_multidata), 9)
+        self.assertEqual(sample_multidata, load_multidata(data))
+
+    def test_newer_version(self) -> None:
+        """Tests that multidata of a newer format is rejected"""
+        with self.assertRaises(VersionException):
+            load_multidata(bytes([5]) + dump_multidata(sample_multidata)[1:])
@@ -0,0 +1,134 @@
+import asyncio
+import base64
+import json
+import struct
+import unittest
+
+
+class FakeConnector:
+    """Speaks the connector script protocol over a fake memory, answering binary frames in reverse order."""
+
+    def __init__(self, memory: bytearray, version: int) -> None:
+        self.memory = memory
+        self.version = version
+        self.frames = 0
+
+    def process(self, requests, data: bytes):
+        responses = []
+        read_data = []
+        for req in requests:
+            if req["type"] == "GUARD":
+                if "size" in req:
+                    expected, data = data[:req["size"]], data[req["size"]:]
+                else:
+                    expected = base64.b64decode(req["expected_data"])
+                address = req["address"]
+                responses.append({"type": "GUARD_RESPONSE", "address": address,
+                                  "value": bytes(self.memory[address:address + len(expected)]) == expected})
+            elif req["type"] == "READ":
+                value = bytes(self.memory[req["address"]:req["address"] + req["size"]])
+                if data is not None:
+                    read_data.append(value)
+                    responses.append({"type": "READ_RESPONSE", "size": len(value)})
+                else:
+                    responses.append({"type": "READ_RESPONSE", "value": base64.b64encode(value).decode("ascii")})
+            elif req["type"] == "WRITE":
+                if "size" in req:
+                    value, data = data[:req["size"]], data[req["size"]:]
+                else:
+                    value = base64.b64decode(req["value"])
+                self.memory[req["address"]:req["address"] + len(value)] = value
+                responses.append({"type": "WRITE_RESPONSE"})
+            else:
+                responses.append({"type": "PING_RESPONSE"} if req["type"] == "PING" else
+                                 {"type": "ERROR", "err": f"Unknown type {req['type']}"})
+        return responses, b"".join(read_data)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            line = (await reader.readline()).decode("utf-8").strip()
+            if line == "VERSION":
+                writer.write(f"{self.version}\n".encode("utf-8"))
+            elif line == "BINARY" and self.version >= 2:
+                writer.write(b"BINARY\n")
+                break
+            else:
+                writer.write(json.dumps(self.process(json.loads(line), None)[0]).encode("utf-8") + b"\n")
+            await writer.drain()
+
+        frames = []
+        while True:
+            try:
+                size, request_id, header_size = struct.unpack(">III", await reader.readexactly(12))
+                payload = await reader.readexactly(size - 8)
+            except asyncio.IncompleteReadError:
+                return
+            frames.append((request_id, payload[:header_size], payload[header_size:]))
+            self.frames += 1
+            if len(frames) < 2:
+                continue
+            for request_id, header, data in reversed(frames):
+                responses, read_data = self.process(json.loads(header), data)
+                header = json.dumps(responses).encode("utf-8")
+                writer.write(struct.pack(">III", 8 + len(header) + len(read_data), request_id, len(header))
+                             + header + read_data)
+            frames.clear()
+            await writer.drain()
+
+
+class TestBizHawkConnector(unittest.IsolatedAsyncioTestCase):
+    async def start(self, version: int):
+        from worlds._bizhawk import BizHawkContext, ConnectionStatus, get_script_version
+        self.connector = FakeConnector(bytearray(range(64)), version)
+        server = await asyncio.start_server(self.connector.handle, "127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        ctx = BizHawkContext()
+        ctx.streams = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        ctx.connection_status = ConnectionStatus.TENTATIVE
+        self.addCleanup(ctx._close)
+        self.assertEqual(version, await get_script_version(ctx))
+        return ctx
+
+    async def test_binary_pipelined(self) -> None:
+        """Tests that concurrent binary requests each get their own response, even when answered out of order"""
+        from worlds._bizhawk import enable_binary_protocol, guarded_read, guarded_write, send_requests
+        ctx = await self.start(2)
+        await enable_binary_protocol(ctx)
+        self.assertTrue(ctx.binary_protocol)
+
+        first, second = await asyncio.gather(guarded_read(ctx, [(4, 3, "RAM"), (60, 4, "RAM")], []),
+                                             guarded_write(ctx, [(0, b"\xff\x00", "RAM")], [(2, [2], "RAM")]))
+        self.assertEqual([bytes([4, 5, 6]), bytes([60, 61, 62, 63])], first)
+        self.assertTrue(second)
+        self.assertEqual(b"\xff\x00", self.connector.memory[:2])
+
+        responses, guarded = await asyncio.gather(
+            send_requests(ctx, [{"type": "READ", "address": 0, "size": 2, "domain": "RAM"}]),
+            guarded_read(ctx, [(0, 1, "RAM")], [(1, [1], "RAM")]))
+        self.assertEqual(base64.b64encode(b"\xff\x00").decode("ascii"), responses[0]["value"])
+        self.assertIsNone(guarded)
+        self.assertEqual(4, self.connector.frames)
+
+    async def test_json_fallback(self) -> None:
+        """Tests that scripts of version 1 are still talked to with JSON"""
+        from worlds._bizhawk import guarded_read, guarded_write, send_requests
+        ctx = await self.start(1)
+        self.assertFalse(ctx.binary_protocol)
+        self.assertTrue(await guarded_write(ctx, [(8, b"\x01\x02", "RAM")], [(9, [9], "RAM")]))
+        self.assertEqual([bytes([1, 2, 10])], await guarded_read(ctx, [(8, 3, "RAM")], []))
+        responses = await send_requests(ctx, [{"type": "READ", "address": 8, "size": 1, "domain": "RAM"}])
+        self.assertEqual(base64.b64encode(b"\x01").decode("ascii"), responses[0]["value"])
+        self.assertEqual(0, self.connector.frames)
+
+    async def test_connection_closed(self) -> None:
+        """Tests that requests waiting for a response fail when the connection closes"""
+        from worlds._bizhawk import ConnectionStatus, RequestFailedError, enable_binary_protocol, guarded_read
+        ctx = await self.start(2)
+        await enable_binary_protocol(ctx)
+        read = asyncio.create_task(guarded_read(ctx, [(0, 1, "RAM")], []))
+        await asyncio.sleep(0.05)
+        ctx.streams[1].close()
+        with self.assertRaises(RequestFailedError):
+            await read
+        self.assertEqual(ConnectionStatus.NOT_CONNECTED, ctx.connection_status)
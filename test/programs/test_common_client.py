@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+
+class TestDataPackageCache(unittest.IsolatedAsyncioTestCase):
+    game_package = {"item_name_to_id": {"Sword": 0x1000}, "location_name_to_id": {"Chest": 0x2000},
+                    "version": 0, "checksum": "abc123"}
+
+    async def asyncSetUp(self) -> None:
+        import Utils
+        from CommonClient import CommonContext
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        cache_path = unittest.mock.patch.object(Utils.cache_path, "cached_path", temp_dir.name, create=True)
+        cache_path.start()
+        self.addCleanup(cache_path.stop)
+        self.ctx = CommonContext(None, None)
+        self.addAsyncCleanup(self.ctx.shutdown)
+        self.ctx.send_msgs = unittest.mock.AsyncMock()
+
+    async def test_cached_game_is_loaded_lazily(self) -> None:
+        """Tests that a cached data package is only loaded when one of its ids is looked up"""
+        import Utils
+        Utils.store_data_package_for_checksum("Cached Game", self.game_package)
+        self.assertTrue(os.path.exists(Utils.cache_path("datapackage", "Cached Game", "abc123.pickle")))
+        self.assertTrue(Utils.has_data_package_for_checksum("Cached Game", "abc123"))
+        self.assertFalse(Utils.has_data_package_for_checksum("Cached Game", "def456"))
+
+        with unittest.mock.patch.object(Utils, "load_data_package_for_checksum",
+                                        wraps=Utils.load_data_package_for_checksum) as load:
+            await self.ctx.prepare_data_package({"Cached Game"}, {}, {"Cached Game": "abc123"})
+            self.ctx.send_msgs.assert_not_called()
+            load.assert_not_called()
+            self.assertEqual("Sword", self.ctx.item_names[0x1000])
+            self.assertEqual("Chest", self.ctx.location_names[0x2000])
+            load.assert_called_once_with("Cached Game", "abc123")
+        self.assertEqual("Unknown item (ID:4097)", self.ctx.item_names[0x1001])
+
+    async def test_broken_cache_is_requested(self) -> None:
+        """Tests that a cached data package, which is corrupt or has the wrong checksum, is requested instead"""
+        import asyncio
+        import pickle
+        import Utils
+        Utils.store_data_package_for_checksum("Cached Game", self.game_package)
+        with open(Utils.cache_path("datapackage", "Cached Game", "abc123.pickle"), "r+b") as f:
+            f.truncate(10)
+        Utils.store_data_package_for_checksum("Other Game", {**self.game_package, "checksum": "def456"})
+        with open(Utils.cache_path("datapackage", "Other Game", "def456.pickle"), "wb") as f:
+            pickle.dump(self.game_package, f)
+
+        for game, checksum in (("Cached Game", "abc123"), ("Other Game", "def456")):
+            with self.subTest(game=game):
+                self.ctx.send_msgs.reset_mock()
+                await self.ctx.prepare_data_package({game}, {}, {game: checksum})
+                self.ctx.send_msgs.assert_not_called()
+                self.assertEqual("Unknown item (ID:4096)", self.ctx.item_names[0x1000])
+                await asyncio.sleep(0)
+                self.ctx.send_msgs.assert_called_once_with([{"cmd": "GetDataPackage", "games": [game]}])
+
+    def test_store_replaces_atomically(self) -> None:
+        """Tests that data packages are stored through a temporary file, which does not stay behind"""
+        import Utils
+        with unittest.mock.patch.object(os, "replace", wraps=os.replace) as replace:
+            Utils.store_data_package_for_checksum("Cached Game", self.game_package)
+        path = Utils.cache_path("datapackage", "Cached Game", "abc123.pickle")
+        replace.assert_called_once()
+        self.assertEqual(path, replace.call_args.args[1])
+        self.assertEqual(["abc123.pickle"], os.listdir(os.path.dirname(path)))
+        self.assertEqual(self.game_package, Utils.load_data_package_for_checksum("Cached Game", "abc123"))
+
+    async def test_only_room_games_resident(self) -> None:
+        """Tests that games of a previous room are dropped and missing games are requested"""
+        from worlds import network_data_package
+        archipelago = network_data_package["games"]["Archipelago"]
+        item_name, item_id = next(iter(archipelago["item_name_to_id"].items()))
+        self.assertEqual(item_name, self.ctx.item_names[item_id])
+
+        self.ctx.consume_network_data_package({"games": {"Cached Game": self.game_package}})
+        self.assertEqual("Sword", self.ctx.item_names[0x1000])
+
+        await self.ctx.prepare_data_package({"Other Game"}, {}, {"Other Game": "def456",
+                                                                 "Archipelago": archipelago["checksum"]})
+        self.ctx.send_msgs.assert_called_once_with([{"cmd": "GetDataPackage", "games": ["Other Game"]}])
+        self.assertEqual(item_name, self.ctx.item_names[item_id])
+        self.assertEqual("Unknown item (ID:4096)", self.ctx.item_names[0x1000])
+
+    async def test_lookups_load_pending_games(self) -> None:
+        """Tests that get, in and iteration load deferred games like indexing does"""
+        self.ctx.item_names.clear()
+        checks = {"get": lambda names: names.get(0x1000), "in": lambda names: 0x1000 in names and names[0x1000],
+                  "items": lambda names: dict(names.items()).get(0x1000)}
+        for name, check in checks.items():
+            with self.subTest(name):
+                self.ctx.defer_game("Cached Game", lambda: self.game_package)
+                self.assertEqual("Sword", check(self.ctx.item_names))
+                self.ctx.item_names.clear()
+        self.assertIsNone(self.ctx.item_names.get(0x1000))
+        self.assertNotIn(0x1000, self.ctx.item_names)
+
+    def test_cache_miss(self) -> None:
+        """Tests that cached files are found through the folder listing and a miss does not read the old cache"""
+        import Utils
+        Utils.store_data_package_for_checksum("Cached Game", self.game_package)
+        with unittest.mock.patch.object(os.path, "exists") as exists, \
+                unittest.mock.patch.object(Utils, "persistent_load") as persistent_load:
+            self.assertTrue(Utils.has_data_package_for_checksum("Cached Game", "abc123"))
+            self.assertEqual({}, Utils.load_data_package_for_checksum("Cached Game", "def456"))
+            self.assertEqual({}, Utils.load_data_package_for_checksum("Unknown Game", "abc123"))
+        exists.assert_not_called()
+        persistent_load.assert_not_called()
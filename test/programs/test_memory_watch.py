@@ -0,0 +1,34 @@
+import unittest
+
+from worlds.MemoryWatch import LocationFlag, MemoryWatcher, WatchedRegion
+
+
+class TestMemoryWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.watcher = MemoryWatcher(
+            [WatchedRegion("state", 0x10, 1), WatchedRegion("flags", 0x20, 2)],
+            [LocationFlag(1, "flags", 0, 0), LocationFlag(2, "flags", 0, 7), LocationFlag(3, "flags", 1, 2),
+             LocationFlag(4, "flags", 1, 3, inverted=True)])
+
+    def test_only_changes_are_reported(self) -> None:
+        """Tests that the first update reports all checked flags and later ones only flags that became checked"""
+        self.assertEqual({1, 4}, self.watcher.update([b"\x00", bytes([0b1, 0b0])]))
+        self.assertEqual(set(), self.watcher.update([b"\x01", bytes([0b1, 0b0])]))
+        self.assertEqual({2, 3}, self.watcher.update([b"\x01", bytes([0b10000000, 0b1100])]))
+        self.assertEqual({4}, self.watcher.update([b"\x01", bytes([0b10000000, 0b0100])]))
+        self.assertEqual(bytes([0b10000000, 0b0100]), self.watcher.snapshot["flags"])
+
+    def test_reset(self) -> None:
+        """Tests that resetting or changing source reports every checked flag again"""
+        data = [b"\x00", bytes([0b1, 0b100])]
+        self.assertEqual({1, 3, 4}, self.watcher.update(data, "rom"))
+        self.assertEqual(set(), self.watcher.update(data, "rom"))
+        self.watcher.reset()
+        self.assertEqual({1, 3, 4}, self.watcher.update(data, "rom"))
+        self.assertEqual({1, 3, 4}, self.watcher.update(data, "other rom"))
+
+    def test_invalid_flags(self) -> None:
+        with self.assertRaises(ValueError):
+            MemoryWatcher([WatchedRegion("flags", 0x20, 2)], [LocationFlag(1, "flags", 2, 0)])
+        with self.assertRaises(ValueError):
+            MemoryWatcher([WatchedRegion("flags", 0x20, 2)], [LocationFlag(1, "other", 0, 0)])
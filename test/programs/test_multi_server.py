@@ -1,5 +1,15 @@
+import asyncio
+import os
+import pickle
+import tempfile
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+import unittest.mock
+import zlib
+
+from MultiServer import Client, Context, KeyTrie, ServerCommandProcessor, apply_save_journal, on_client_left, \
+    process_client_cmd, read_save_journal, register_location_checks, send_items_to, send_new_items
+from NetUtils import LocationStore, NetworkItem, decode, encode
+from Utils import restricted_loads
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +48,291 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestRegisterLocationChecks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.locations = LocationStore({
+            1: {101: (201, 2, 0), 102: (202, 2, 0), 103: (203, 1, 0)},
+            2: {104: (204, 1, 0)},
+            3: {105: (205, 1, 0)},
+        })
+        self.ctx.player_names = {(0, slot): f"Player{slot}" for slot in (1, 2, 3)}
+        self.ctx.clients = {0: {1: [], 2: [], 3: []}}
+        self.sent = []
+        self.broadcasts = []
+        self.ctx.send_msgs = lambda client, msgs: self.sent.append((client, msgs))
+        self.ctx.broadcast_team = lambda team, msgs: self.broadcasts.append(msgs)
+        self.ctx.broadcast = lambda endpoints, msgs: None
+        self.ctx.save = lambda: None
+
+    def add_client(self, slot: int) -> Client:
+        client = Client(None, self.ctx)
+        client.team, client.slot, client.no_items, client.remote_items, client.remote_start_inventory = \
+            0, slot, False, True, False
+        self.ctx.clients[0][slot].append(client)
+        return client
+
+    def test_batched_messages(self) -> None:
+        """Tests that a batch of checks causes one broadcast and one ReceivedItems per receiving client"""
+        receiver, finder, bystander = self.add_client(2), self.add_client(1), self.add_client(3)
+        with unittest.mock.patch("MultiServer.async_start", lambda coroutine: None):
+            register_location_checks(self.ctx, 0, 1, [101, 102, 103])
+        self.assertEqual(1, len(self.broadcasts))
+        self.assertEqual(3, len(self.broadcasts[0]))
+        self.assertEqual({receiver: 2, finder: 1}, {client: len(msgs[0]["items"]) for client, msgs in self.sent})
+        self.assertEqual(2, receiver.send_index)
+        self.assertEqual(0, bystander.send_index)
+
+    def test_only_receivers_are_notified(self) -> None:
+        """Tests that send_new_items only sends to slots that received items since it last ran"""
+        receiver, bystander = self.add_client(2), self.add_client(3)
+        self.ctx.received_items[0, 3, True] = [NetworkItem(205, 105, 3, 0)]
+        with unittest.mock.patch("MultiServer.async_start", lambda coroutine: None):
+            send_items_to(self.ctx, 0, 2, NetworkItem(201, 101, 1, 0))
+            self.assertEqual({(0, 2)}, self.ctx.item_receivers)
+            send_new_items(self.ctx)
+        self.assertEqual([receiver], [client for client, msgs in self.sent])
+        self.assertEqual(0, bystander.send_index)
+        self.assertFalse(self.ctx.item_receivers)
+
+    def test_tracker_events(self) -> None:
+        """Tests that the changes caused by checks are published as one batch of tracker events"""
+        subscriber = Client(None, self.ctx)
+        self.ctx.tracker_subscribers.add(subscriber)
+        tracker_broadcasts = []
+        self.ctx.broadcast = lambda endpoints, msgs: msgs[0]["cmd"] == "TrackerEvents" and \
+            tracker_broadcasts.append((list(endpoints), msgs))
+
+        async def check():
+            register_location_checks(self.ctx, 0, 1, [101, 103])
+            register_location_checks(self.ctx, 0, 2, [104])
+            await asyncio.sleep(0)
+
+        with unittest.mock.patch("MultiServer.async_start", lambda coroutine: None):
+            asyncio.run(check())
+        self.assertEqual(1, len(tracker_broadcasts))
+        endpoints, [msg] = tracker_broadcasts[0]
+        self.assertEqual([subscriber], endpoints)
+        self.assertEqual("TrackerEvents", msg["cmd"])
+        events = sorted(event for event in msg["events"] if event[0] == "checks")
+        self.assertEqual([["checks", 0, 1, 2, {101, 103}], ["checks", 0, 2, 1, {104}]], events)
+        self.assertIn(["items", 0, 2, 1, [201]], msg["events"])
+
+
+class TestDataStorage(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.send_msgs = unittest.mock.AsyncMock()
+        self.broadcasts = []
+        self.ctx.broadcast_send_encoded_msgs = lambda endpoints, msg: self.broadcasts.append((set(endpoints), msg))
+        patcher = unittest.mock.patch("MultiServer.async_start", lambda coroutine: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clients = []
+        for slot in (1, 2, 3):
+            client = Client(None, self.ctx)
+            client.auth, client.team, client.slot = True, 0, slot
+            self.clients.append(client)
+
+    async def set(self, client: Client, key: str, value: int, want_reply: bool = False) -> None:
+        await process_client_cmd(self.ctx, client, {"cmd": "Set", "key": key, "want_reply": want_reply,
+                                                    "operations": [{"operation": "replace", "value": value}]})
+
+    def test_key_trie(self) -> None:
+        trie = KeyTrie()
+        first, second = self.clients[:2]
+        trie.add("slot_1_", first)
+        trie.add("slot_", second)
+        trie.add("", second)
+        self.assertEqual({first, second}, trie.get_clients("slot_1_position"))
+        self.assertEqual({second}, trie.get_clients("slot_2_position"))
+        self.assertEqual({second}, trie.get_clients("other"))
+
+    async def test_prefix_notify_coalesced(self) -> None:
+        """Tests that Sets in the same tick reach prefix subscribers as one message each"""
+        subscriber, other_subscriber, setter = self.clients
+        await process_client_cmd(self.ctx, subscriber, {"cmd": "SetNotify", "keys": [], "prefixes": ["pos_"]})
+        await process_client_cmd(self.ctx, other_subscriber, {"cmd": "SetNotify", "keys": ["pos_1"]})
+        await self.set(setter, "pos_1", 1, want_reply=True)
+        await self.set(setter, "pos_2", 2)
+        await self.set(setter, "pos_1", 3)
+        await self.set(setter, "other", 4)
+        self.assertEqual([], self.broadcasts)
+        await asyncio.sleep(0)
+
+        messages = {frozenset(endpoints): decode(msg) for endpoints, msg in self.broadcasts}
+        self.assertEqual(3, len(self.broadcasts))
+        self.assertEqual([("pos_1", 1), ("pos_2", 2), ("pos_1", 3)],
+                         [(msg["key"], msg["value"]) for msg in messages[frozenset({subscriber})]])
+        self.assertEqual([("pos_1", 1), ("pos_1", 3)],
+                         [(msg["key"], msg["value"]) for msg in messages[frozenset({other_subscriber})]])
+        self.assertEqual([("pos_1", 1)], [(msg["key"], msg["value"]) for msg in messages[frozenset({setter})]])
+
+    async def test_get_prefix_paged(self) -> None:
+        """Tests that Get finds keys by prefix, including ones set after the key index was built, and pages them"""
+        client = self.clients[0]
+        for slot in (3, 1, 2):
+            await self.set(client, f"slot_{slot}", slot)
+        await self.set(client, "other", 0)
+
+        await process_client_cmd(self.ctx, client, {"cmd": "Get", "keys": ["other"], "prefixes": ["slot_"]})
+        self.assertEqual({"other": 0, "slot_1": 1, "slot_2": 2, "slot_3": 3},
+                         self.ctx.send_msgs.call_args[0][1][0]["keys"])
+
+        await self.set(client, "slot_0", 0)
+        pages = []
+        offset = 0
+        while offset is not None:
+            await process_client_cmd(self.ctx, client, {"cmd": "Get", "keys": [], "prefixes": ["slot_"],
+                                                        "offset": offset, "limit": 3})
+            retrieved = self.ctx.send_msgs.call_args[0][1][0]
+            pages.append(list(retrieved["keys"]))
+            offset = retrieved["next_offset"]
+        self.assertEqual([["slot_0", "slot_1", "slot_2"], ["slot_3"]], pages)
+
+        await process_client_cmd(self.ctx, client, {"cmd": "Get", "keys": [], "prefixes": "slot_"})
+        self.assertEqual("InvalidPacket", self.ctx.send_msgs.call_args[0][1][0]["cmd"])
+
+
+class TestSaveJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.locations = LocationStore({1: {101: (201, 2, 0), 102: (202, 1, 0)}, 2: {103: (203, 1, 0)}})
+        self.ctx.player_names = {(0, 1): "Player1", (0, 2): "Player2"}
+        self.ctx.clients = {0: {1: [], 2: []}}
+        self.ctx.saving = True
+        self.ctx.save_filename = os.path.join(self.temp_dir.name, "test.apsave")
+        patcher = unittest.mock.patch("MultiServer.async_start", lambda coroutine: coroutine.close())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def load(self) -> dict:
+        with open(self.ctx.save_filename, "rb") as f:
+            savedata = restricted_loads(zlib.decompress(f.read()))
+        with open(self.ctx.journal_filename, "rb") as f:
+            apply_save_journal(savedata, read_save_journal(f.read()))
+        return savedata
+
+    def test_changes_are_journaled(self) -> None:
+        """Tests that state changes after a snapshot are appended to the journal and replay onto the snapshot"""
+        self.assertTrue(self.ctx._save())
+        snapshot_size = os.path.getsize(self.ctx.save_filename)
+        register_location_checks(self.ctx, 0, 1, [101])
+        self.assertTrue(self.ctx._save())
+        register_location_checks(self.ctx, 0, 2, [103])
+        self.ctx.stored_data["key"] = 1
+        self.ctx.journal("stored_data", "key", 1)
+        self.assertTrue(self.ctx._save())
+
+        self.assertEqual(snapshot_size, os.path.getsize(self.ctx.save_filename))
+        savedata = self.load()
+        expected = self.ctx.get_save()
+        for key in ("received_items", "location_checks", "client_activity_timers", "stored_data"):
+            self.assertEqual(expected[key], savedata[key], key)
+
+    def test_connection_timers_are_journaled(self) -> None:
+        """Tests that connection timers are replayed from the journal without a snapshot"""
+        self.ctx._save()
+        client = Client(None, self.ctx)
+        client.team, client.slot = 0, 1
+        asyncio.run(on_client_left(self.ctx, client))
+        self.assertFalse(self.ctx.snapshot_dirty)
+        self.ctx._save()
+        self.assertEqual(self.ctx.get_save()["client_connection_timers"], self.load()["client_connection_timers"])
+
+    def test_compaction(self) -> None:
+        """Tests that a snapshot is written once the journal is long enough, which empties the journal"""
+        self.ctx.journal_compaction_length = 2
+        self.ctx._save()
+        register_location_checks(self.ctx, 0, 1, [101, 102], count_activity=False)
+        self.ctx._save()
+        self.assertGreater(os.path.getsize(self.ctx.journal_filename), 0)
+        self.ctx._save()
+        self.assertEqual(0, os.path.getsize(self.ctx.journal_filename))
+        self.assertEqual({101, 102}, self.load()["location_checks"][0, 1])
+
+    def test_changes_during_snapshot(self) -> None:
+        """Tests that changes journaled while a snapshot is taken are kept, without replaying them twice"""
+        get_save = self.ctx.get_save
+        dumps = pickle.dumps
+
+        def get_save_while_changing() -> dict:
+            # this change makes it into the snapshot and the journal
+            send_items_to(self.ctx, 0, 2, NetworkItem(201, 101, 1, 0))
+            return get_save()
+
+        def dumps_while_changing(obj) -> bytes:
+            encoded = dumps(obj)
+            # these changes are journaled after the snapshot was encoded
+            send_items_to(self.ctx, 0, 2, NetworkItem(202, 102, 1, 0))
+            self.ctx.stored_data["during"] = 1
+            self.ctx.journal("stored_data", "during", 1)
+            return encoded
+
+        with unittest.mock.patch.object(self.ctx, "get_save", get_save_while_changing), \
+                unittest.mock.patch("MultiServer.pickle.dumps", dumps_while_changing):
+            self.assertTrue(self.ctx._save())
+        self.assertTrue(self.ctx._save())
+        savedata = self.load()
+        expected = self.ctx.get_save()
+        self.assertEqual(2, len(expected["received_items"][0, 2, True]))
+        for key in ("received_items", "stored_data"):
+            self.assertEqual(expected[key], savedata[key], key)
+
+    def test_stale_and_incomplete_records(self) -> None:
+        """Tests that records of an older snapshot and a record cut off by a crash are not replayed"""
+        self.ctx._save()
+        self.ctx.journal("stored_data", "old", 1)
+        self.ctx._save()
+        with open(self.ctx.journal_filename, "rb") as f:
+            old_record = f.read()
+        self.ctx.save(True)
+        self.ctx.journal("stored_data", "new", 1)
+        self.ctx.journal("stored_data", "cut off", 1)
+        self.ctx._save()
+        with open(self.ctx.journal_filename, "rb") as f:
+            new_record = f.read()
+        with open(self.ctx.journal_filename, "wb") as f:
+            f.write(old_record + new_record + new_record[:-5])
+        with self.assertLogs(level="WARNING"):
+            savedata = self.load()
+        self.assertEqual({"new": 1, "cut off": 1}, savedata["stored_data"])
+
+
+class TestDataPackageMessage(unittest.TestCase):
+    def test_same_as_encoded(self) -> None:
+        """Tests that spliced DataPackage messages decode to the same data as encoding the data package"""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        ctx.gamespackage = {
+            "Clique": ctx.gamespackage["Clique"],
+            "Custom": {"item_name_to_id": {"Ä": 1}, "location_name_to_id": {"\"\\": 2}, "version": 0},
+        }
+        ctx.item_name_groups.setdefault("Custom", {})
+        ctx._init_game_data()
+        self.assertEqual(decode(encode([{"cmd": "DataPackage", "data": {"games": ctx.gamespackage}}])),
+                         decode(ctx.get_data_package_msg()))
+        self.assertIs(ctx.get_data_package_msg(), ctx.get_data_package_msg())
+        self.assertEqual({"Custom": ctx.gamespackage["Custom"]},
+                         decode(ctx.get_data_package_msg({"Custom", "Unknown"}))[0]["data"]["games"])
+
+
+class TestEncodedFragments(unittest.TestCase):
+    def test_versioned_cache(self) -> None:
+        """Tests that fragments are only encoded again once their version changes"""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        created = []
+
+        def create() -> list:
+            created.append(None)
+            return [len(created)]
+
+        self.assertEqual("[1]", ctx.get_encoded_fragment("key", 0, create))
+        self.assertEqual("[1]", ctx.get_encoded_fragment("key", 0, create))
+        self.assertEqual("[2]", ctx.get_encoded_fragment("key", 1, create))
+        self.assertEqual(2, len(created))
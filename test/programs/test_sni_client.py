@@ -0,0 +1,55 @@
+import asyncio
+import json
+import unittest
+import unittest.mock
+
+
+class FakeSNESSocket:
+    """Answers GetAddress requests with the requested bytes of a fake memory, split into small chunks."""
+    open = True
+    closed = False
+
+    def __init__(self, ctx, memory: bytes) -> None:
+        self.ctx = ctx
+        self.memory = memory
+        self.requests = []
+
+    async def send(self, message: str) -> None:
+        request = json.loads(message)
+        self.requests.append(request)
+        operands = request["Operands"]
+        data = b"".join(self.memory[int(address, 16):int(address, 16) + int(size, 16)]
+                        for address, size in zip(operands[::2], operands[1::2]))
+        for start in range(0, len(data), 3):
+            self.ctx.snes_recv_queue.put_nowait(data[start:start + 3])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TestSNESReadMany(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        from SNIClient import SNESState, SNIContext
+        self.ctx = SNIContext("localhost", None, None)
+        self.ctx.snes_state = SNESState.SNES_ATTACHED
+        self.ctx.snes_socket = FakeSNESSocket(self.ctx, bytes(range(64)))
+
+    async def test_single_request(self) -> None:
+        """Tests that all ranges are read with one request and split back up in order"""
+        from SNIClient import snes_read, snes_read_many
+        self.assertEqual([bytes([10, 11]), bytes([2]), bytes(range(20, 28))],
+                         await snes_read_many(self.ctx, [(10, 2), (2, 1), (20, 8)]))
+        self.assertEqual([["a", "2", "2", "1", "14", "8"]], [request["Operands"]
+                                                            for request in self.ctx.snes_socket.requests])
+        self.assertEqual(bytes([5, 6, 7]), await snes_read(self.ctx, 5, 3))
+        self.assertEqual([], await snes_read_many(self.ctx, []))
+        self.assertEqual(2, len(self.ctx.snes_socket.requests))
+
+    async def test_short_reply(self) -> None:
+        """Tests that a reply missing data fails the whole read"""
+        from SNIClient import snes_read_many
+        self.ctx.snes_socket.memory = bytes(12)
+        wait_for = asyncio.wait_for
+        with unittest.mock.patch("asyncio.wait_for", lambda awaitable, timeout: wait_for(awaitable, 0.01)):
+            self.assertIsNone(await snes_read_many(self.ctx, [(10, 2), (20, 8)]))
+        self.assertTrue(self.ctx.snes_socket.closed)
@@ -0,0 +1,36 @@
+# Tests for FuzzyIndex in Utils.py
+
+import random
+import unittest
+
+from Utils import FuzzyIndex, get_fuzzy_results
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    """This tests that FuzzyIndex finds the same matches as get_fuzzy_results"""
+    words = ["Hookshot", "hookshot", "Longshot", "Progressive Hookshot", "Hover Boots", "Iron Boots", "Bow",
+             "Boomerang", "Bomb", "Bombs (5)", "Bombs (10)", "Megaton Hammer", "Hammer", "Lens of Truth", "Ab", "Ba"]
+
+    def test_matches_fuzzy_results(self) -> None:
+        index = FuzzyIndex(self.words)
+        for input_word in ("hookshot", "HOOK", "bombs", "Boots", "ba", "x", "Progresive Hooksht", "Lens", "bow"):
+            for limit in (None, 1, 2, 3, len(self.words)):
+                with self.subTest(input_word=input_word, limit=limit):
+                    self.assertEqual(get_fuzzy_results(input_word, self.words, limit),
+                                     index.get_results(input_word, limit))
+
+    def test_random_words(self) -> None:
+        rng = random.Random(0)
+        words = ["".join(rng.choice("abcAB ") for _ in range(rng.randint(1, 12))) for _ in range(300)]
+        index = FuzzyIndex(words)
+        for _ in range(100):
+            input_word = "".join(rng.choice("abcAB ") for _ in range(rng.randint(1, 12)))
+            with self.subTest(input_word=input_word):
+                self.assertEqual(get_fuzzy_results(input_word, words, 2), index.get_results(input_word, 2))
+
+    def test_exact(self) -> None:
+        index = FuzzyIndex(self.words)
+        self.assertEqual("Hookshot", index.get_exact("HOOKSHOT"))
+        self.assertEqual([("Hookshot", 100)], index.get_results("hookshot", 1))
+        self.assertIsNone(index.get_exact("Hooks"))
+        self.assertIsNone(index.get_exact(""))
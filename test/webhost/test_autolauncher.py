@@ -0,0 +1,289 @@
+import asyncio
+import threading
+import time
+import typing
+import unittest
+from uuid import uuid4
+
+
+class FakeInstance:
+    def __init__(self, alive: bool = True):
+        self.alive = alive
+        self.commands: typing.List[typing.Tuple[typing.Any, ...]] = []
+
+    def send_command(self, *args) -> bool:
+        if self.alive:
+            self.commands.append(args)
+        return self.alive
+
+
+def run_until_stopped(*args) -> None:
+    room_queue = args[6]
+    while room_queue.get() is not None:
+        pass
+
+
+def run_stuck(*args) -> None:
+    time.sleep(60)
+
+
+class TestDispatchCommands(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from WebHostLib.models import db
+        if not db.provider:
+            db.bind(provider="sqlite", filename=":memory:", create_db=True)
+            db.generate_mapping(create_tables=True)
+
+    def setUp(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib import autolauncher
+        from WebHostLib.models import Command, Room, Seed
+        owner = uuid4()
+        with db_session:
+            seed = Seed(multidata=b"", owner=owner)
+            self.rooms = [Room(seed=seed, owner=owner).id for _ in range(3)]
+            self.commands = [Command(room=Room.get(id=room_id), commandtext=f"/say {room_id}")
+                             for room_id in self.rooms]
+        self.commands = [command.id for command in self.commands]
+        self.multiworlds = autolauncher.multiworlds
+        self.room_workers_by_room = autolauncher.room_workers_by_room
+        self.addCleanup(self.multiworlds.clear)
+        self.addCleanup(self.room_workers_by_room.clear)
+        self.addCleanup(autolauncher.pending_commands.clear)
+        self.addCleanup(db_session(lambda: Command.select().delete(bulk=True)))
+
+    def dispatch(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.autolauncher import dispatch_commands
+        with db_session:
+            dispatch_commands()
+
+    def remaining(self) -> typing.List[str]:
+        from pony.orm import db_session
+        from WebHostLib.models import Command
+        with db_session:
+            return sorted(command.commandtext for command in Command.select())
+
+    def test_routes_commands(self) -> None:
+        """Tests that commands are forwarded to the process and the worker hosting their room"""
+        process, worker = FakeInstance(), FakeInstance()
+        self.multiworlds[self.rooms[0]] = process
+        self.room_workers_by_room[self.rooms[1]] = worker
+        self.dispatch()
+        self.assertEqual([(self.commands[0], f"/say {self.rooms[0]}")], process.commands)
+        self.assertEqual([(self.rooms[1], self.commands[1], f"/say {self.rooms[1]}")], worker.commands)
+
+    def test_keeps_undelivered_commands(self) -> None:
+        """Tests that commands for stopped rooms stay in the DB until the room runs again"""
+        process = FakeInstance(False)
+        self.multiworlds[self.rooms[0]] = process
+        self.dispatch()
+        self.assertEqual([], process.commands)
+        process.alive = True
+        self.dispatch()
+        self.assertEqual([(self.commands[0], f"/say {self.rooms[0]}")], process.commands)
+
+    def test_deleted_once_processed(self) -> None:
+        """Tests that commands stay in the DB until the room processed them, without being sent twice"""
+        from WebHostLib.customserver import acknowledge_command
+        process = FakeInstance()
+        self.multiworlds[self.rooms[0]] = process
+        self.dispatch()
+        self.dispatch()
+        self.assertEqual(1, len(process.commands))
+        self.assertEqual(3, len(self.remaining()))
+        acknowledge_command(self.commands[0])
+        self.dispatch()
+        self.assertEqual(sorted([f"/say {self.rooms[1]}", f"/say {self.rooms[2]}"]), self.remaining())
+        self.assertEqual(1, len(process.commands))
+
+    def test_sent_again_after_restart(self) -> None:
+        """Tests that commands are sent again, if their room stopped before processing them"""
+        from WebHostLib import autolauncher
+        process = FakeInstance()
+        self.multiworlds[self.rooms[0]] = process
+        self.dispatch()
+        with autolauncher.guardian_lock:
+            autolauncher.forget_pending_commands(self.rooms[0])
+        self.dispatch()
+        self.assertEqual([(self.commands[0], f"/say {self.rooms[0]}")] * 2, process.commands)
+
+
+class TestRoomScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestDispatchCommands.setUpClass()
+
+    def setUp(self) -> None:
+        from unittest import mock
+        from pony.orm import db_session
+        from WebHostLib import autolauncher
+        from WebHostLib.models import Room, Seed
+        owner = uuid4()
+        with db_session:
+            Room.select().delete(bulk=True)  # rooms of other tests would be scheduled as well
+            seed = Seed(multidata=b"", owner=owner)
+            self.room_id = Room(seed=seed, owner=owner).id
+        self.running: typing.Set[typing.Any] = set()
+        self.launches: typing.List[typing.Any] = []
+
+        def launch_room(room_id, config):
+            self.launches.append(room_id)
+            self.running.add(room_id)
+
+        for name, replacement in (("launch_room", launch_room),
+                                  ("room_is_running", lambda room_id: room_id in self.running),
+                                  ("dispatch_commands", lambda: False)):
+            patcher = mock.patch.object(autolauncher, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.scheduler = autolauncher.RoomScheduler({})
+
+    def set_last_activity(self, last_activity) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+        with db_session:
+            Room.get(id=self.room_id).last_activity = last_activity
+
+    def test_launches_once(self) -> None:
+        """Tests that an active room is launched once and unchanged rooms make the scheduler idle"""
+        self.assertTrue(self.scheduler.tick())
+        self.assertEqual([self.room_id], self.launches)
+        self.assertFalse(self.scheduler.tick())
+        self.assertEqual([self.room_id], self.launches)
+
+    def test_stopped_room_waits_for_activity(self) -> None:
+        """Tests that a stopped room is only launched again after new activity"""
+        import datetime
+        self.scheduler.tick()
+        self.running.clear()
+        self.set_last_activity(datetime.datetime.utcnow() - datetime.timedelta(hours=3))
+        self.scheduler.tick()
+        self.assertEqual([self.room_id], self.launches)
+        self.set_last_activity(datetime.datetime.utcnow())
+        self.scheduler.tick()
+        self.assertEqual([self.room_id, self.room_id], self.launches)
+
+    def test_crashed_room_is_relaunched(self) -> None:
+        """Tests that a room that stopped without shutting down is launched again while it is still active"""
+        self.scheduler.tick()
+        self.running.clear()
+        self.assertTrue(self.scheduler.tick())
+        self.assertEqual([self.room_id, self.room_id], self.launches)
+
+    def test_activity_while_stopping(self) -> None:
+        """Tests that activity seen in the same tick the room stopped in launches it again"""
+        import datetime
+        self.scheduler.tick()
+        self.running.clear()
+        self.set_last_activity(datetime.datetime.utcnow() + datetime.timedelta(seconds=1))
+        self.scheduler.tick()
+        self.assertEqual([self.room_id, self.room_id], self.launches)
+
+    def test_timed_out_room(self) -> None:
+        """Tests that rooms past their timeout are not launched"""
+        import datetime
+        self.set_last_activity(datetime.datetime.utcnow() - datetime.timedelta(hours=3))
+        self.assertFalse(self.scheduler.tick())
+        self.assertEqual([], self.launches)
+
+
+class TestRoomHostWorker(unittest.TestCase):
+    config = {"PONY": {}, "SELFLAUNCHCERT": None, "SELFLAUNCHKEY": None, "HOST_ADDRESS": ""}
+
+    def start_worker(self, target):
+        from unittest import mock
+        from WebHostLib import autolauncher
+        with mock.patch.object(autolauncher, "run_room_host_worker", target), \
+                mock.patch.object(autolauncher, "get_static_server_data", dict):
+            worker = autolauncher.RoomHostWorker("TestWorker", self.config)
+        self.addCleanup(worker.process.kill)
+        self.addCleanup(autolauncher.room_workers_by_room.clear)
+        worker.start_room(1)
+        return worker
+
+    def test_stop(self) -> None:
+        """Tests that a worker shuts down when asked to and forgets its rooms"""
+        from WebHostLib import autolauncher
+        worker = self.start_worker(run_until_stopped)
+        self.assertIs(worker, autolauncher.room_workers_by_room[1])
+        worker.stop(10)
+        self.assertEqual(0, worker.process.exitcode)
+        self.assertEqual({}, autolauncher.room_workers_by_room)
+        self.assertEqual(set(), worker.rooms)
+
+    def test_stop_terminates(self) -> None:
+        """Tests that a worker, which does not shut down in time, gets terminated"""
+        worker = self.start_worker(run_stuck)
+        worker.stop(0.5)
+        self.assertFalse(worker.process.is_alive())
+        self.assertNotEqual(0, worker.process.exitcode)
+
+
+class FakeRoom:
+    auto_save_interval = 0
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.save_dirty = True
+        self.exit_event = threading.Event()
+        self.saves: typing.List[typing.Tuple[str, bool, str]] = []
+
+    def _save(self, exit_save: bool = False) -> bool:
+        from WebHostLib.customserver import current_room
+        self.saves.append((current_room.get(), exit_save, threading.current_thread().name))
+        if self.fail:
+            raise Exception("Saving failed")
+        return True
+
+
+class TestSaveRooms(unittest.IsolatedAsyncioTestCase):
+    async def save_once(self, contexts: typing.Dict[str, FakeRoom]) -> None:
+        import concurrent.futures
+        from WebHostLib.customserver import save_rooms
+        with concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="TestSaver") as executor:
+            task = asyncio.create_task(save_rooms(contexts, executor, 0.01))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+    async def test_saves_changed_rooms(self) -> None:
+        """Tests that changed rooms are saved once, in the executor and with their room as log context"""
+        changed, unchanged, stopping = FakeRoom(), FakeRoom(), FakeRoom()
+        unchanged.save_dirty = False
+        stopping.exit_event.set()
+        await self.save_once({"1": changed, "2": unchanged, "3": stopping})
+        self.assertEqual(1, len(changed.saves))
+        room, exit_save, thread_name = changed.saves[0]
+        self.assertEqual(("1", False), (room, exit_save))
+        self.assertTrue(thread_name.startswith("TestSaver"))
+        self.assertEqual([], unchanged.saves)
+        self.assertEqual([], stopping.saves)
+
+    async def test_failed_save_is_retried(self) -> None:
+        """Tests that a room stays marked as changed when its save failed, so it is saved again"""
+        room = FakeRoom(fail=True)
+        with self.assertLogs() as logs:
+            await self.save_once({"1": room})
+        self.assertTrue(room.save_dirty)
+        self.assertGreater(len(room.saves), 1)
+        self.assertIn("Saving failed", logs.output[0])
+
+
+class TestCommandQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_acknowledged_after_processing(self) -> None:
+        """Tests that a room acknowledges a command from its queue only after processing it"""
+        import queue
+        from unittest import mock
+        from WebHostLib import customserver
+        events: typing.List[str] = []
+        ctx = mock.Mock(exit_event=threading.Event(), main_loop=asyncio.get_running_loop())
+        ctx.broadcast_text_all.side_effect = lambda text, data: events.append(text)
+        command_queue = queue.Queue()
+        command_queue.put((7, "hello"))
+        with mock.patch.object(customserver, "acknowledge_command",
+                               lambda command_id: (events.append(command_id), ctx.exit_event.set())):
+            await asyncio.to_thread(customserver.WebHostContext.listen_to_command_queue, ctx, command_queue)
+        self.assertEqual(["[Server]: hello", 7], events)
@@ -0,0 +1,79 @@
+import datetime
+import pickle
+import unittest
+from uuid import uuid4
+
+from NetUtils import NetworkItem, NetworkSlot, SlotType, dump_multidata
+
+
+class TestTrackerDataCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from WebHostLib.models import db
+        if not db.provider:
+            db.bind(provider="sqlite", filename=":memory:", create_db=True)
+            db.generate_mapping(create_tables=True)
+
+    def setUp(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import GameDataPackage, Room, Seed
+        from WebHostLib.tracker import _tracker_data_cache
+        self.addCleanup(_tracker_data_cache.clear)
+        checksum = uuid4().hex
+        multidata = {
+            "slot_info": {1: NetworkSlot("Tester", "Clique", SlotType.player)},
+            "locations": {1: {10: (20, 1, 0)}},
+            "datapackage": {"Clique": {"checksum": checksum}},
+            "seed_name": "12345",
+        }
+        owner = uuid4()
+        with db_session:
+            GameDataPackage(checksum=checksum, data=pickle.dumps({"item_name_to_id": {"Button": 20},
+                                                                  "location_name_to_id": {"Press": 10}}))
+            seed = Seed(multidata=dump_multidata(multidata), owner=owner)
+            self.room_id = Room(seed=seed, owner=owner, multisave=pickle.dumps({
+                "received_items": {(0, 1, True): [NetworkItem(20, 10, 1, 0)]},
+                "location_checks": {(0, 1): {10}},
+                "client_activity_timers": (),
+                "generation": 0,
+            })).id
+
+    def tracker_data(self):
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData
+        return TrackerData(Room.get(id=self.room_id))
+
+    def test_shares_unchanged_data(self) -> None:
+        """Tests that seed data and results computed from an unchanged save are reused by later requests"""
+        from pony.orm import db_session
+        with db_session:
+            first = self.tracker_data()
+            self.assertEqual({20: 1}, first.get_player_inventory_counts(0, 1))
+            self.assertEqual("Button", first.item_id_to_name["Clique"][20])
+        with db_session:
+            second = self.tracker_data()
+            self.assertIs(first._multidata, second._multidata)
+            self.assertIs(first._multisave, second._multisave)
+            self.assertIs(first.get_player_inventory_counts(0, 1), second.get_player_inventory_counts(0, 1))
+
+    def test_save_changes(self) -> None:
+        """Tests that a changed multisave or a new journal record is picked up"""
+        from pony.orm import db_session
+        from WebHostLib.models import Room, SaveJournal
+        with db_session:
+            first = self.tracker_data()
+            self.assertEqual(set(), first.get_player_missing_locations(0, 1))
+        with db_session:
+            room = Room.get(id=self.room_id)
+            room.multisave = pickle.dumps({"location_checks": {(0, 1): set()},
+                                           "client_activity_timers": (), "generation": 0})
+            room.last_activity += datetime.timedelta(seconds=1)
+        with db_session:
+            second = self.tracker_data()
+            self.assertIs(first._multidata, second._multidata)
+            self.assertEqual({10}, second.get_player_missing_locations(0, 1))
+
+        with db_session:
+            SaveJournal(room=Room.get(id=self.room_id), data=pickle.dumps((0, [("location_checks", (0, 1), {10})])))
+        with db_session:
+            self.assertEqual(set(), self.tracker_data().get_player_missing_locations(0, 1))
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
 import logging
 import pathlib
 import re
 import sys
+import threading
 import time
 from dataclasses import make_dataclass
-from typing import Any, Callable, ClassVar, Dict, Set, Tuple, FrozenSet, List, Optional, TYPE_CHECKING, TextIO, Type, \
-    Union
+from typing import Any, Callable, ClassVar, Dict, Iterable, Set, Tuple, FrozenSet, List, Optional, TYPE_CHECKING, \
+    TextIO, Type, Union
 
 from Options import PerGameCommonOptions
 from BaseClasses import CollectionState
@@ -84,6 +86,10 @@ class AutoWorldRegister(type):
             dct["options_dataclass"] = make_dataclass(f"{name}Options", dct["option_definitions"].items(),
                                                       bases=(PerGameCommonOptions,))
 
+        # worlds changing how items are collected have to declare that removing them is still exact
+        if ("collect" in dct or "remove" in dct) and "reversible_collect" not in dct:
+            dct["reversible_collect"] = False
+
         # construct class
         new_class = super().__new__(mcs, name, bases, dct)
         if "game" in dct:
@@ -110,6 +116,10 @@ class AutoLogicRegister(type):
                 CollectionState.additional_copy_functions.append(function)
             elif item_name == "init_mixin":
                 CollectionState.additional_init_functions.append(function)
+                if "materialize_mixin" not in dct:
+                    CollectionState.copy_init_functions.append(function)
+            elif item_name == "materialize_mixin":
+                CollectionState.additional_materialize_functions.append(function)
             elif not item_name.startswith("__"):
                 if hasattr(CollectionState, item_name):
                     raise Exception(f"Name conflict on Logic Mixin {name} trying to overwrite {item_name}")
@@ -123,11 +133,13 @@ def _timed_call(method: Callable[..., Any], *args: Any,
     ret = method(*args)
     taken = time.perf_counter() - start
     if taken > 1.0:
+        worker = threading.current_thread()
+        on_worker = "" if worker is threading.main_thread() else f" on {worker.name}"
         if player and multiworld:
             perf_logger.info(f"Took {taken:.4f} seconds in {method.__qualname__} for player {player}, "
-                             f"named {multiworld.player_name[player]}.")
+                             f"named {multiworld.player_name[player]}{on_worker}.")
         else:
-            perf_logger.info(f"Took {taken:.4f} seconds in {method.__qualname__}.")
+            perf_logger.info(f"Took {taken:.4f} seconds in {method.__qualname__}{on_worker}.")
     return ret
 
 
@@ -146,23 +158,118 @@ def call_single(multiworld: "MultiWorld", method_name: str, player: int, *args:
         return ret
 
 
-def call_all(multiworld: "MultiWorld", method_name: str, *args: Any) -> None:
-    world_types: Set[AutoWorldRegister] = set()
-    for player in multiworld.player_ids:
-        prev_item_count = len(multiworld.itempool)
-        world_types.add(multiworld.worlds[player].__class__)
-        call_single(multiworld, method_name, player, *args)
-        if __debug__:
-            new_items = multiworld.itempool[prev_item_count:]
-            for i, item in enumerate(new_items):
-                for other in new_items[i+1:]:
-                    assert item is not other, (
-                        f"Duplicate item reference of \"{item.name}\" in \"{multiworld.worlds[player].game}\" "
-                        f"of player \"{multiworld.player_name[player]}\". Please make a copy instead.")
+def call_all(multiworld: "MultiWorld", method_name: str, *args: Any, workers: int = 0) -> None:
+    """
+    Call method_name on every world, then the world types' stage_ method.
+    With workers, worlds that set thread_safe_stages run on that many threads, see _call_all_concurrently.
+    """
+    if workers:
+        _call_all_concurrently(multiworld, method_name, args, workers)
+    else:
+        for player in multiworld.player_ids:
+            prev_item_count = len(multiworld.itempool)
+            call_single(multiworld, method_name, player, *args)
+            if __debug__:
+                _assert_unique_items(multiworld, player, multiworld.itempool[prev_item_count:])
 
     call_stage(multiworld, method_name, *args)
 
 
+def _assert_unique_items(multiworld: "MultiWorld", player: int, new_items: List["Item"]) -> None:
+    for i, item in enumerate(new_items):
+        for other in new_items[i+1:]:
+            assert item is not other, (
+                f"Duplicate item reference of \"{item.name}\" in \"{multiworld.worlds[player].game}\" "
+                f"of player \"{multiworld.player_name[player]}\". Please make a copy instead.")
+
+
+class _StageItemPool(list):
+    """
+    Stands in for multiworld.itempool while a batch of worlds runs a stage concurrently.
+    Items added from a stage worker are held back per player, to be added to the real pool in player order.
+    """
+    added: Dict[int, List["Item"]]
+    local: threading.local
+
+    def __init__(self, items: List["Item"]) -> None:
+        super().__init__(items)
+        self.added = {}
+        self.local = threading.local()
+
+    def _added(self) -> Optional[List["Item"]]:
+        player: Optional[int] = getattr(self.local, "player", None)
+        return None if player is None else self.added.setdefault(player, [])
+
+    def append(self, item: "Item") -> None:
+        added = self._added()
+        if added is None:
+            super().append(item)
+        else:
+            added.append(item)
+
+    def extend(self, items: Iterable["Item"]) -> None:
+        added = self._added()
+        if added is None:
+            super().extend(items)
+        else:
+            added.extend(items)
+
+    def __iadd__(self, items: Iterable["Item"]) -> _StageItemPool:
+        self.extend(items)
+        return self
+
+    def call_single(self, multiworld: "MultiWorld", method_name: str, player: int, args: Tuple[Any, ...]) -> Any:
+        self.local.player = player
+        try:
+            return call_single(multiworld, method_name, player, *args)
+        finally:
+            self.local.player = None
+
+
+def _call_all_concurrently(multiworld: "MultiWorld", method_name: str, args: Tuple[Any, ...], workers: int) -> None:
+    """
+    Runs consecutive players whose worlds set thread_safe_stages concurrently, and every other world on its own in
+    player order once all players before it are done. Each world only randomizes through its own random, and items
+    are added to the pool in player order, so the result is the same as calling every world one after another.
+    """
+    batch: List[int] = []
+    with concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix=f"{method_name}_worker") as pool:
+        for player in multiworld.player_ids:
+            if multiworld.worlds[player].thread_safe_stages:
+                batch.append(player)
+                continue
+            _call_batch(multiworld, method_name, args, batch, pool)
+            batch = []
+            prev_item_count = len(multiworld.itempool)
+            call_single(multiworld, method_name, player, *args)
+            if __debug__:
+                _assert_unique_items(multiworld, player, multiworld.itempool[prev_item_count:])
+        _call_batch(multiworld, method_name, args, batch, pool)
+
+
+def _call_batch(multiworld: "MultiWorld", method_name: str, args: Tuple[Any, ...], batch: List[int],
+                pool: concurrent.futures.ThreadPoolExecutor) -> None:
+    if not batch:
+        return
+    itempool = _StageItemPool(multiworld.itempool)
+    multiworld.itempool = itempool
+    # no world may use the shared random while the batch runs, as the order of draws across threads is arbitrary
+    passthrough, multiworld.random.passthrough = multiworld.random.passthrough, False
+    try:
+        futures = [pool.submit(itempool.call_single, multiworld, method_name, player, args) for player in batch]
+        concurrent.futures.wait(futures)
+        for future in futures:
+            future.result()  # raises the exception of the first failed player
+    finally:
+        multiworld.random.passthrough = passthrough
+        multiworld.itempool = list(itempool)
+    for player in batch:
+        new_items = itempool.added.get(player, [])
+        if __debug__:
+            _assert_unique_items(multiworld, player, new_items)
+        multiworld.itempool += new_items
+
+
 def call_stage(multiworld: "MultiWorld", method_name: str, *args: Any) -> None:
     world_types = {multiworld.worlds[player].__class__ for player in multiworld.player_ids}
     for world_type in sorted(world_types, key=lambda world: world.__name__):
@@ -264,6 +371,29 @@ class World(metaclass=AutoWorldRegister):
     hidden: ClassVar[bool] = False
     """Hide World Type from various views. Does not remove functionality."""
 
+    reversible_collect: ClassVar[bool] = True
+    """
+    If remove exactly undoes collect, so that collecting a set of items and then removing one of them leaves the same
+    state.prog_items as only collecting the others, in any order. Fill relies on this to take items out of a state
+    instead of rebuilding it. Defaults to False for worlds overriding collect or remove, which have to opt in.
+    """
+
+    trace_rule_dependencies: ClassVar[bool] = False
+    """
+    Record which items each entrance access rule reads, so that collecting an item only re-tests the blocked entrances
+    that depend on it. Only set this if collect/remove only change counts in state.prog_items, and entrance rules only
+    depend on this player's items and on regions checked through can_reach. Reading anything else that can be detected,
+    like other players' items or regions without a registered indirect condition, makes that entrance fall back to
+    being re-tested on every update. See BaseClasses.EntranceDependencies.
+    """
+
+    thread_safe_stages: ClassVar[bool] = False
+    """
+    Allow generate_early, create_regions, create_items, set_rules and generate_basic of this world to run concurrently
+    with other worlds' when generating with stage workers. Only set this if these stages only randomize through
+    self.random, only add to multiworld.itempool without reading it, and otherwise only change state of this player.
+    """
+
     web: ClassVar[WebWorld] = WebWorld()
     """see WebWorld for options"""
 
@@ -481,7 +611,19 @@ class World(metaclass=AutoWorldRegister):
 # any methods attached to this can be used as part of CollectionState,
 # please use a prefix as all of them get clobbered together
 class LogicMixin(metaclass=AutoLogicRegister):
-    pass
+    """
+    Adds its methods to CollectionState. Besides those, a mixin may define hooks for its own per-state data:
+
+    init_mixin(self, parent: MultiWorld) sets up the data of a new state.
+    copy_mixin(self, ret: CollectionState) -> CollectionState copies the data of this state into ret.
+    materialize_mixin(self, player: int) makes the data of player belong to this state alone.
+
+    CollectionState.copy() does not run __init__, as a copy shares its per-player data with its source until either
+    state is about to modify a player, see CollectionState.materialize. copy_mixin may share per-player data as well,
+    if materialize_mixin copies it and the mixin calls self.materialize(player) before modifying it.
+    A mixin without materialize_mixin gets init_mixin run on the copy before copy_mixin, so copy_mixin has to copy
+    everything it shares.
+    """
 
 
 def data_package_checksum(data: "GamesPackage") -> str:
@@ -0,0 +1,126 @@
+"""
+Declarative memory watching for emulator clients.
+Handlers describe the memory regions they care about and which bits in them mean a location was checked,
+then poll a MemoryWatcher each tick. All regions are read in one request and only bits that changed since the previous
+poll are looked at, so the work per tick follows what changed in memory instead of how many locations there are.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from CommonClient import CommonContext
+    from SNIClient import SNIContext
+    from worlds._bizhawk.context import BizHawkClientContext
+
+
+class WatchedRegion(NamedTuple):
+    name: str
+    address: int
+    size: int
+    domain: str = ""
+    """memory domain of address, only used by BizHawk"""
+
+
+class LocationFlag(NamedTuple):
+    location_id: int
+    region: str
+    """name of the WatchedRegion the flag is in"""
+    byte: int
+    """offset of the byte from the start of the region"""
+    bit: int
+    """bit of that byte, with 0 being the least significant"""
+    inverted: bool = False
+    """if the location is checked when the bit is clear instead"""
+
+
+class MemoryWatcher:
+    regions: Tuple[WatchedRegion, ...]
+    snapshot: Dict[str, bytes]
+    """last data read for each region, by name"""
+    _flags: Tuple[Dict[int, List[LocationFlag]], ...]
+    _source: Optional[Hashable]
+
+    def __init__(self, regions: Iterable[WatchedRegion], flags: Iterable[LocationFlag]) -> None:
+        self.regions = tuple(regions)
+        region_indexes = {region.name: index for index, region in enumerate(self.regions)}
+        if len(region_indexes) != len(self.regions):
+            raise ValueError("Watched regions need unique names.")
+        self._flags = tuple({} for _ in self.regions)
+        for flag in flags:
+            if flag.region not in region_indexes:
+                raise ValueError(f"Location {flag.location_id} is flagged in unknown region {flag.region}.")
+            index = region_indexes[flag.region]
+            if not 0 <= flag.byte < self.regions[index].size or not 0 <= flag.bit < 8:
+                raise ValueError(f"Location {flag.location_id} is flagged outside of region {flag.region}.")
+            self._flags[index].setdefault(flag.byte * 8 + flag.bit, []).append(flag)
+        self.snapshot = {}
+        self._source = None
+
+    def reset(self) -> None:
+        """Forgets the previous snapshot, so the next update reports every location that is checked."""
+        self.snapshot.clear()
+
+    def update(self, data: Sequence[bytes], source: Optional[Hashable] = None) -> Set[int]:
+        """Takes data read for each region, in order, and returns the locations that became checked since the
+        previous update. Changing source, such as to a different ROM or slot, resets the snapshot first."""
+        if source != self._source:
+            self.reset()
+            self._source = source
+        checked: Set[int] = set()
+        for region, flags, new_data in zip(self.regions, self._flags, data):
+            if len(new_data) != region.size:
+                continue
+            old_data = self.snapshot.get(region.name)
+            self.snapshot[region.name] = new_data
+            if old_data == new_data or not flags:
+                continue
+            new_bits = int.from_bytes(new_data, "little")
+            if old_data is None:
+                positions: Iterable[int] = flags
+            else:
+                positions = _set_bit_positions(int.from_bytes(old_data, "little") ^ new_bits)
+            for position in positions:
+                for flag in flags.get(position, ()):
+                    if bool(new_bits >> position & 1) != flag.inverted:
+                        checked.add(flag.location_id)
+        return checked
+
+    async def poll_snes(self, ctx: SNIContext) -> Optional[Set[int]]:
+        """Reads all regions with one SNI request and returns the locations that became checked,
+        or None if memory could not be read."""
+        from SNIClient import snes_read_many
+
+        data = await snes_read_many(ctx, [(region.address, region.size) for region in self.regions])
+        if data is None:
+            return None
+        return self.update(data, (ctx.rom, ctx.seed_name, ctx.team, ctx.slot))
+
+    async def poll_bizhawk(self, ctx: BizHawkClientContext,
+                           guard_list: Sequence[Tuple[int, Iterable[int], str]] = ()) -> Optional[Set[int]]:
+        """Reads all regions with one BizHawk request and returns the locations that became checked,
+        or None if any guard in guard_list did not match."""
+        from worlds._bizhawk import guarded_read
+
+        data = await guarded_read(ctx.bizhawk_ctx, [(region.address, region.size, region.domain)
+                                                    for region in self.regions], list(guard_list))
+        if data is None:
+            return None
+        return self.update(data, (ctx.rom_hash, ctx.seed_name, ctx.team, ctx.slot))
+
+
+def _set_bit_positions(bits: int) -> Iterable[int]:
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+async def send_location_checks(ctx: CommonContext, locations: Iterable[int]) -> List[int]:
+    """Sends the locations that were not checked before to the server in one LocationChecks and returns them."""
+    new_locations = [location for location in locations if location not in ctx.locations_checked]
+    if new_locations:
+        ctx.locations_checked.update(new_locations)
+        await ctx.send_msgs([{"cmd": "LocationChecks", "locations": new_locations}])
+    return new_locations
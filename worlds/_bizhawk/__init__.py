@@ -9,6 +9,7 @@ import asyncio
 import base64
 import enum
 import json
+import struct
 import sys
 import typing
 
@@ -43,17 +44,47 @@ class SyncError(Exception):
     pass
 
 
+_FRAME_HEADER = struct.Struct(">III")
+"""frame size (counting everything after itself), request id, size of the JSON part"""
+_PAYLOAD_FIELDS = {"GUARD": "expected_data", "WRITE": "value"}
+"""request fields holding memory data, which the binary protocol sends raw after the JSON part"""
+
+
 class BizHawkContext:
     streams: typing.Optional[typing.Tuple[asyncio.StreamReader, asyncio.StreamWriter]]
     connection_status: ConnectionStatus
+    binary_protocol: bool
+    """Whether requests are sent as binary frames, which connector scripts of version 2 and above support"""
     _lock: asyncio.Lock
     _port: typing.Optional[int]
+    _pending: typing.Dict[int, "asyncio.Future[typing.Tuple[bytes, bytes]]"]
+    _next_request_id: int
+    _receive_task: typing.Optional["asyncio.Task[None]"]
 
     def __init__(self) -> None:
         self.streams = None
         self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.binary_protocol = False
         self._lock = asyncio.Lock()
         self._port = None
+        self._pending = {}
+        self._next_request_id = 0
+        self._receive_task = None
+
+    def _close(self, exc: typing.Optional[Exception] = None) -> None:
+        """Closes the connection, failing requests still waiting for a response with exc."""
+        if self.streams is not None:
+            self.streams[1].close()
+            self.streams = None
+        self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.binary_protocol = False
+        if self._receive_task is not None:
+            self._receive_task.cancel()
+        self._receive_task = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc or RequestFailedError("Connection closed"))
 
     async def _send_message(self, message: str):
         async with self._lock:
@@ -68,9 +99,7 @@ class BizHawkContext:
                 res = await asyncio.wait_for(reader.readline(), timeout=5)
 
                 if res == b"":
-                    writer.close()
-                    self.streams = None
-                    self.connection_status = ConnectionStatus.NOT_CONNECTED
+                    self._close()
                     raise RequestFailedError("Connection closed")
 
                 if self.connection_status == ConnectionStatus.TENTATIVE:
@@ -78,16 +107,61 @@ class BizHawkContext:
 
                 return res.decode("utf-8")
             except asyncio.TimeoutError as exc:
-                writer.close()
-                self.streams = None
-                self.connection_status = ConnectionStatus.NOT_CONNECTED
+                self._close()
                 raise RequestFailedError("Connection timed out") from exc
             except ConnectionResetError as exc:
-                writer.close()
-                self.streams = None
-                self.connection_status = ConnectionStatus.NOT_CONNECTED
+                self._close()
                 raise RequestFailedError("Connection reset") from exc
 
+    async def _enable_binary_protocol(self) -> None:
+        """Switches the connection to binary frames. Only connector scripts of version 2 and above support this."""
+        res = await self._send_message("BINARY")
+        if res.strip() != "BINARY":
+            raise SyncError(f"Expected BINARY acknowledgement but got {res.strip()}")
+        self.binary_protocol = True
+        self._receive_task = asyncio.create_task(self._receive_frames(self.streams[0]), name="BizHawkReceive")
+
+    async def _receive_frames(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                size, request_id, header_size = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+                payload = await reader.readexactly(size - 8)
+
+                if self.connection_status == ConnectionStatus.TENTATIVE:
+                    self.connection_status = ConnectionStatus.CONNECTED
+
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((payload[:header_size], payload[header_size:]))
+        except (asyncio.IncompleteReadError, ConnectionResetError) as exc:
+            self._receive_task = None
+            self._close(RequestFailedError("Connection closed"))
+            if not isinstance(exc, asyncio.IncompleteReadError):
+                raise
+
+    async def _send_frame(self, header: bytes, data: bytes) -> typing.Tuple[bytes, bytes]:
+        """Sends a frame and waits for the response to it, without blocking other requests in the meantime."""
+        if self.streams is None:
+            raise NotConnectedError("You tried to send a request before a connection to BizHawk was made")
+
+        self._next_request_id = request_id = (self._next_request_id + 1) & 0xFFFFFFFF
+        future: "asyncio.Future[typing.Tuple[bytes, bytes]]" = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            writer = self.streams[1]
+            writer.write(_FRAME_HEADER.pack(8 + len(header) + len(data), request_id, len(header)) + header + data)
+            async with self._lock:
+                await asyncio.wait_for(writer.drain(), timeout=5)
+            return await asyncio.wait_for(future, timeout=5)
+        except asyncio.TimeoutError as exc:
+            self._close()
+            raise RequestFailedError("Connection timed out") from exc
+        except ConnectionResetError as exc:
+            self._close()
+            raise RequestFailedError("Connection reset") from exc
+        finally:
+            self._pending.pop(request_id, None)
+
 
 async def connect(ctx: BizHawkContext) -> bool:
     """Attempts to establish a connection with a connector script. Returns True if successful."""
@@ -97,6 +171,7 @@ async def connect(ctx: BizHawkContext) -> bool:
 
     for port in ports:
         try:
+            ctx._close()
             ctx.streams = await asyncio.open_connection("127.0.0.1", port)
             ctx.connection_status = ConnectionStatus.TENTATIVE
             ctx._port = port
@@ -105,28 +180,71 @@ async def connect(ctx: BizHawkContext) -> bool:
             continue
     
     # No ports worked
-    ctx.streams = None
-    ctx.connection_status = ConnectionStatus.NOT_CONNECTED
+    ctx._close()
     return False
 
 
 def disconnect(ctx: BizHawkContext) -> None:
     """Closes the connection to the connector script."""
-    if ctx.streams is not None:
-        ctx.streams[1].close()
-        ctx.streams = None
-    ctx.connection_status = ConnectionStatus.NOT_CONNECTED
+    ctx._close()
 
 
 async def get_script_version(ctx: BizHawkContext) -> int:
     return int(await ctx._send_message("VERSION"))
 
 
+async def enable_binary_protocol(ctx: BizHawkContext) -> None:
+    """Switches to binary frames, which send memory without base64 and allow several requests in flight at once.
+    Requires a connector script of version 2 or above."""
+    await ctx._enable_binary_protocol()
+
+
 async def send_requests(ctx: BizHawkContext, req_list: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[typing.Dict[str, typing.Any]]:
     """Sends a list of requests to the BizHawk connector and returns their responses.
 
     It's likely you want to use the wrapper functions instead of this."""
-    responses = json.loads(await ctx._send_message(json.dumps(req_list)))
+    # memory is handled as bytes internally, so convert from and to base64 for callers expecting that
+    responses = await _send_requests(ctx, [
+        {**req, _PAYLOAD_FIELDS[req["type"]]: base64.b64decode(req[_PAYLOAD_FIELDS[req["type"]]])}
+        if req.get("type") in _PAYLOAD_FIELDS and isinstance(req.get(_PAYLOAD_FIELDS[req["type"]]), str) else req
+        for req in req_list
+    ])
+    for response in responses:
+        if response["type"] == "READ_RESPONSE":
+            response["value"] = base64.b64encode(response["value"]).decode("ascii")
+    return responses
+
+
+async def _send_requests(ctx: BizHawkContext, req_list: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[typing.Dict[str, typing.Any]]:
+    """Like send_requests, except memory data in requests and READ_RESPONSEs is bytes instead of base64."""
+    if ctx.binary_protocol:
+        header: typing.List[typing.Dict[str, typing.Any]] = []
+        data: typing.List[bytes] = []
+        for req in req_list:
+            field = _PAYLOAD_FIELDS.get(req["type"])
+            if field is not None:
+                payload = bytes(req[field])
+                req = {key: value for key, value in req.items() if key != field}
+                req["size"] = len(payload)
+                data.append(payload)
+            header.append(req)
+        response_header, response_data = await ctx._send_frame(json.dumps(header).encode("utf-8"), b"".join(data))
+        responses = json.loads(response_header)
+        position = 0
+        for response in responses:
+            if response["type"] == "READ_RESPONSE":
+                response["value"] = response_data[position:position + response["size"]]
+                position += response["size"]
+    else:
+        responses = json.loads(await ctx._send_message(json.dumps([
+            {**req, _PAYLOAD_FIELDS[req["type"]]: base64.b64encode(bytes(req[_PAYLOAD_FIELDS[req["type"]]])).decode("ascii")}
+            if req["type"] in _PAYLOAD_FIELDS else req
+            for req in req_list
+        ])))
+        for response in responses:
+            if response["type"] == "READ_RESPONSE":
+                response["value"] = base64.b64decode(response["value"])
+
     errors: typing.List[ConnectorError] = []
 
     for response in responses:
@@ -240,10 +358,10 @@ async def guarded_read(ctx: BizHawkContext, read_list: typing.List[typing.Tuple[
 
     Returns None if any item in guard_list failed to validate. Otherwise returns a list of bytes in the order they
     were requested."""
-    res = await send_requests(ctx, [{
+    res = await _send_requests(ctx, [{
         "type": "GUARD",
         "address": address,
-        "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
+        "expected_data": bytes(expected_data),
         "domain": domain
     } for address, expected_data, domain in guard_list] + [{
         "type": "READ",
@@ -261,7 +379,7 @@ async def guarded_read(ctx: BizHawkContext, read_list: typing.List[typing.Tuple[
             if item["type"] != "READ_RESPONSE":
                 raise SyncError(f"Expected response of type READ_RESPONSE or GUARD_RESPONSE but got {item['type']}")
 
-            ret.append(base64.b64decode(item["value"]))
+            ret.append(item["value"])
 
     return ret
 
@@ -293,15 +411,15 @@ async def guarded_write(ctx: BizHawkContext, write_list: typing.List[typing.Tupl
     - `domain` is the name of the region of memory the address corresponds to
 
     Returns False if any item in guard_list failed to validate. Otherwise returns True."""
-    res = await send_requests(ctx, [{
+    res = await _send_requests(ctx, [{
         "type": "GUARD",
         "address": address,
-        "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
+        "expected_data": bytes(expected_data),
         "domain": domain
     } for address, expected_data, domain in guard_list] + [{
         "type": "WRITE",
         "address": address,
-        "value": base64.b64encode(bytes(value)).decode("ascii"),
+        "value": bytes(value),
         "domain": domain
     } for address, value, domain in write_list])
 
@@ -14,12 +14,14 @@ from CommonClient import CommonContext, ClientCommandProcessor, get_base_parser,
 import Patch
 import Utils
 
-from . import BizHawkContext, ConnectionStatus, NotConnectedError, RequestFailedError, connect, disconnect, get_hash, \
-    get_script_version, get_system, ping
+from . import BizHawkContext, ConnectionStatus, NotConnectedError, RequestFailedError, connect, disconnect, \
+    enable_binary_protocol, get_hash, get_script_version, get_system, ping
 from .client import BizHawkClient, AutoBizHawkClientRegister
 
 
-EXPECTED_SCRIPT_VERSION = 1
+EXPECTED_SCRIPT_VERSION = 2
+MIN_SCRIPT_VERSION = 1
+"""oldest connector script still supported, which only speaks the JSON protocol"""
 
 
 class AuthStatus(enum.IntEnum):
@@ -148,11 +150,14 @@ async def _game_watcher(ctx: BizHawkClientContext):
 
                 script_version = await get_script_version(ctx.bizhawk_ctx)
 
-                if script_version != EXPECTED_SCRIPT_VERSION:
+                if not MIN_SCRIPT_VERSION <= script_version <= EXPECTED_SCRIPT_VERSION:
                     logger.info(f"Connector script is incompatible. Expected version {EXPECTED_SCRIPT_VERSION} but got {script_version}. Disconnecting.")
                     disconnect(ctx.bizhawk_ctx)
                     continue
 
+                if script_version >= 2:
+                    await enable_binary_protocol(ctx.bizhawk_ctx)
+
             showed_connecting_message = False
 
             await ping(ctx.bizhawk_ctx)
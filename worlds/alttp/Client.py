@@ -332,7 +332,7 @@ def should_collect(ctx, location_id: int) -> bool:
 
 
 async def track_locations(ctx, roomid, roomdata) -> bool:
-    from SNIClient import snes_read, snes_buffered_write, snes_flush_writes
+    from SNIClient import snes_read_many, snes_buffered_write, snes_flush_writes
     location_id: int
     new_locations = []
 
@@ -345,23 +345,6 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
             f'({len(ctx.checked_locations) + 1 if ctx.checked_locations else len(ctx.locations_checked)}/' +
             f'{len(ctx.missing_locations) + len(ctx.checked_locations)})')
 
-    try:
-        shop_data = await snes_read(ctx, SHOP_ADDR, SHOP_LEN)
-        shop_data_changed = False
-        shop_data = list(shop_data)
-        for cnt, b in enumerate(shop_data):
-            location_id = Shops.SHOP_ID_START + cnt
-            if int(b) and location_id not in ctx.locations_checked:
-                new_check(location_id)
-            if should_collect(ctx, location_id):
-                if not int(b):
-                    shop_data[cnt] += 1
-                    shop_data_changed = True
-        if shop_data_changed:
-            snes_buffered_write(ctx, SHOP_ADDR, bytes(shop_data))
-    except Exception as e:
-        snes_logger.info(f"Exception: {e}")
-
     for location_id, (loc_roomid, loc_mask) in location_table_uw_id.items():
         try:
             if location_id not in ctx.locations_checked and loc_roomid == roomid and \
@@ -385,24 +368,6 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
             uw_end = max(uw_end, roomid + 1)
             uw_checked[location_id] = (roomid, mask)
 
-    if uw_begin < uw_end:
-        uw_data = await snes_read(ctx, SAVEDATA_START + (uw_begin * 2), (uw_end - uw_begin) * 2)
-        if uw_data is not None:
-            for location_id, (roomid, mask) in uw_unchecked.items():
-                offset = (roomid - uw_begin) * 2
-                roomdata = uw_data[offset] | (uw_data[offset + 1] << 8)
-                if roomdata & mask != 0:
-                    new_check(location_id)
-            if uw_checked:
-                uw_data = list(uw_data)
-                for location_id, (roomid, mask) in uw_checked.items():
-                    offset = (roomid - uw_begin) * 2
-                    roomdata = uw_data[offset] | (uw_data[offset + 1] << 8)
-                    roomdata |= mask
-                    uw_data[offset] = roomdata & 0xFF
-                    uw_data[offset + 1] = roomdata >> 8
-                snes_buffered_write(ctx, SAVEDATA_START + (uw_begin * 2), bytes(uw_data))
-
     ow_begin = 0x82
     ow_unchecked = {}
     ow_checked = {}
@@ -414,51 +379,93 @@ async def track_locations(ctx, roomid, roomdata) -> bool:
             if should_collect(ctx, location_id):
                 ow_checked[location_id] = screenid
 
+    # read everything that is still tracked in one request, with the rom name last to verify the rest
+    reads = {"shop": (SHOP_ADDR, SHOP_LEN)}
+    if uw_begin < uw_end:
+        reads["uw"] = (SAVEDATA_START + (uw_begin * 2), (uw_end - uw_begin) * 2)
     if ow_begin < ow_end:
-        ow_data = await snes_read(ctx, SAVEDATA_START + 0x280 + ow_begin, ow_end - ow_begin)
-        if ow_data is not None:
-            for location_id, screenid in ow_unchecked.items():
-                if ow_data[screenid - ow_begin] & 0x40 != 0:
-                    new_check(location_id)
-            if ow_checked:
-                ow_data = list(ow_data)
-                for location_id, screenid in ow_checked.items():
-                    ow_data[screenid - ow_begin] |= 0x40
-                snes_buffered_write(ctx, SAVEDATA_START + 0x280 + ow_begin, bytes(ow_data))
-
+        reads["ow"] = (SAVEDATA_START + 0x280 + ow_begin, ow_end - ow_begin)
     if not ctx.locations_checked.issuperset(location_table_npc_id):
-        npc_data = await snes_read(ctx, SAVEDATA_START + 0x410, 2)
-        if npc_data is not None:
-            npc_value_changed = False
-            npc_value = npc_data[0] | (npc_data[1] << 8)
-            for location_id, mask in location_table_npc_id.items():
-                if npc_value & mask != 0 and location_id not in ctx.locations_checked:
-                    new_check(location_id)
-                if should_collect(ctx, location_id):
-                    npc_value |= mask
-                    npc_value_changed = True
-            if npc_value_changed:
-                npc_data = bytes([npc_value & 0xFF, npc_value >> 8])
-                snes_buffered_write(ctx, SAVEDATA_START + 0x410, npc_data)
-
+        reads["npc"] = (SAVEDATA_START + 0x410, 2)
     if not ctx.locations_checked.issuperset(location_table_misc_id):
-        misc_data = await snes_read(ctx, SAVEDATA_START + 0x3c6, 4)
-        if misc_data is not None:
-            misc_data = list(misc_data)
-            misc_data_changed = False
-            for location_id, (offset, mask) in location_table_misc_id.items():
-                assert (0x3c6 <= offset <= 0x3c9)
-                if misc_data[offset - 0x3c6] & mask != 0 and location_id not in ctx.locations_checked:
-                    new_check(location_id)
-                if should_collect(ctx, location_id):
-                    misc_data_changed = True
-                    misc_data[offset - 0x3c6] |= mask
-            if misc_data_changed:
-                snes_buffered_write(ctx, SAVEDATA_START + 0x3c6, bytes(misc_data))
+        reads["misc"] = (SAVEDATA_START + 0x3c6, 4)
+    reads["rom_name"] = (ROMNAME_START, ROMNAME_SIZE)
+    snapshot = dict(zip(reads, await snes_read_many(ctx, list(reads.values())) or ()))
+
+    shop_data = snapshot.get("shop")
+    if shop_data is not None:
+        shop_data_changed = False
+        shop_data = list(shop_data)
+        for cnt, b in enumerate(shop_data):
+            location_id = Shops.SHOP_ID_START + cnt
+            if int(b) and location_id not in ctx.locations_checked:
+                new_check(location_id)
+            if should_collect(ctx, location_id):
+                if not int(b):
+                    shop_data[cnt] += 1
+                    shop_data_changed = True
+        if shop_data_changed:
+            snes_buffered_write(ctx, SHOP_ADDR, bytes(shop_data))
+
+    uw_data = snapshot.get("uw")
+    if uw_data is not None:
+        for location_id, (roomid, mask) in uw_unchecked.items():
+            offset = (roomid - uw_begin) * 2
+            roomdata = uw_data[offset] | (uw_data[offset + 1] << 8)
+            if roomdata & mask != 0:
+                new_check(location_id)
+        if uw_checked:
+            uw_data = list(uw_data)
+            for location_id, (roomid, mask) in uw_checked.items():
+                offset = (roomid - uw_begin) * 2
+                roomdata = uw_data[offset] | (uw_data[offset + 1] << 8)
+                roomdata |= mask
+                uw_data[offset] = roomdata & 0xFF
+                uw_data[offset + 1] = roomdata >> 8
+            snes_buffered_write(ctx, SAVEDATA_START + (uw_begin * 2), bytes(uw_data))
+
+    ow_data = snapshot.get("ow")
+    if ow_data is not None:
+        for location_id, screenid in ow_unchecked.items():
+            if ow_data[screenid - ow_begin] & 0x40 != 0:
+                new_check(location_id)
+        if ow_checked:
+            ow_data = list(ow_data)
+            for location_id, screenid in ow_checked.items():
+                ow_data[screenid - ow_begin] |= 0x40
+            snes_buffered_write(ctx, SAVEDATA_START + 0x280 + ow_begin, bytes(ow_data))
+
+    npc_data = snapshot.get("npc")
+    if npc_data is not None:
+        npc_value_changed = False
+        npc_value = npc_data[0] | (npc_data[1] << 8)
+        for location_id, mask in location_table_npc_id.items():
+            if npc_value & mask != 0 and location_id not in ctx.locations_checked:
+                new_check(location_id)
+            if should_collect(ctx, location_id):
+                npc_value |= mask
+                npc_value_changed = True
+        if npc_value_changed:
+            npc_data = bytes([npc_value & 0xFF, npc_value >> 8])
+            snes_buffered_write(ctx, SAVEDATA_START + 0x410, npc_data)
+
+    misc_data = snapshot.get("misc")
+    if misc_data is not None:
+        misc_data = list(misc_data)
+        misc_data_changed = False
+        for location_id, (offset, mask) in location_table_misc_id.items():
+            assert (0x3c6 <= offset <= 0x3c9)
+            if misc_data[offset - 0x3c6] & mask != 0 and location_id not in ctx.locations_checked:
+                new_check(location_id)
+            if should_collect(ctx, location_id):
+                misc_data_changed = True
+                misc_data[offset - 0x3c6] |= mask
+        if misc_data_changed:
+            snes_buffered_write(ctx, SAVEDATA_START + 0x3c6, bytes(misc_data))
 
     if new_locations:
         # verify rom is still the same:
-        rom_name = await snes_read(ctx, ROMNAME_START, ROMNAME_SIZE)
+        rom_name = snapshot.get("rom_name")
         if rom_name is None or all(byte == b"\x00" for byte in rom_name) or rom_name[:2] != b"AP" or \
                 rom_name != ctx.rom:
             snes_logger.info(f"Discarding recent {len(new_locations)} checks as ROM Status has changed.")
@@ -473,9 +480,9 @@ class ALTTPSNIClient(SNIClient):
     game = "A Link to the Past"
 
     async def deathlink_kill_player(self, ctx):
-        from SNIClient import DeathState, snes_read, snes_buffered_write, snes_flush_writes
-        invincible = await snes_read(ctx, WRAM_START + 0x037B, 1)
-        last_health = await snes_read(ctx, WRAM_START + 0xF36D, 1)
+        from SNIClient import DeathState, snes_read, snes_read_many, snes_buffered_write, snes_flush_writes
+        invincible, last_health = await snes_read_many(ctx, [(WRAM_START + 0x037B, 1), (WRAM_START + 0xF36D, 1)]) \
+            or (None, None)
         await asyncio.sleep(0.25)
         health = await snes_read(ctx, WRAM_START + 0xF36D, 1)
         if not invincible or not last_health or not health:
@@ -516,17 +523,18 @@ class ALTTPSNIClient(SNIClient):
         return True
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_read, snes_buffered_write, snes_flush_writes
-        gamemode = await snes_read(ctx, WRAM_START + 0x10, 1)
+        from SNIClient import snes_read_many, snes_buffered_write, snes_flush_writes
+        snapshot = await snes_read_many(ctx, [(WRAM_START + 0x10, 1), (SAVEDATA_START + 0x443, 1),
+                                              (SAVEDATA_START + 0x42E, 4), (RECV_PROGRESS_ADDR, 8)])
+        if snapshot is None:
+            return
+        gamemode, gameend, game_timer, data = snapshot
         if "DeathLink" in ctx.tags and gamemode and ctx.last_death_link + 1 < time.time():
             currently_dead = gamemode[0] in DEATH_MODES
             await ctx.handle_deathlink_state(currently_dead,
                                              ctx.player_names[ctx.slot] + " ran out of hearts." if ctx.slot else "")
 
-        gameend = await snes_read(ctx, SAVEDATA_START + 0x443, 1)
-        game_timer = await snes_read(ctx, SAVEDATA_START + 0x42E, 4)
-        if gamemode is None or gameend is None or game_timer is None or \
-                (gamemode[0] not in INGAME_MODES and gamemode[0] not in ENDGAME_MODES):
+        if gamemode[0] not in INGAME_MODES and gamemode[0] not in ENDGAME_MODES:
             return
 
         if gameend[0]:
@@ -537,10 +545,6 @@ class ALTTPSNIClient(SNIClient):
         if gamemode in ENDGAME_MODES:  # triforce room and credits
             return
 
-        data = await snes_read(ctx, RECV_PROGRESS_ADDR, 8)
-        if data is None:
-            return
-
         recv_index = data[0] | (data[1] << 8)
         recv_item = data[2]
         roomid = data[4] | (data[5] << 8)
@@ -29,6 +29,7 @@ class CliqueWorld(World):
     game = "Clique"
     data_version = 3
     web = CliqueWebWorld()
+    thread_safe_stages = True
     option_definitions = clique_options
     location_name_to_id = location_table
     item_name_to_id = item_table
@@ -1,8 +1,10 @@
 import logging
 import asyncio
+import typing
 
 from NetUtils import ClientStatus, color
 from worlds.AutoSNIClient import SNIClient
+from worlds.MemoryWatch import LocationFlag, MemoryWatcher, WatchedRegion, send_location_checks
 
 snes_logger = logging.getLogger("SNES")
 
@@ -24,6 +26,23 @@ DEATH_LINK_ACTIVE_ADDR = DKC3_ROMNAME_START + 0x15     # DKC3_TODO: Find a perma
 
 class DKC3SNIClient(SNIClient):
     game = "Donkey Kong Country 3"
+    location_watcher: typing.Optional[MemoryWatcher] = None
+
+    def get_location_watcher(self) -> MemoryWatcher:
+        if self.location_watcher is None:
+            from worlds.dkc3.Rom import location_rom_data
+            # the save file name is read again after the location data, to verify they belong together
+            self.location_watcher = MemoryWatcher([
+                WatchedRegion("save_file_name", DKC3_FILE_NAME_ADDR, 0x5),
+                WatchedRegion("locations", WRAM_START + 0x5FE, 0x81),
+                WatchedRegion("verify_save_file_name", DKC3_FILE_NAME_ADDR, 0x5),
+                WatchedRegion("rom", DKC3_ROMHASH_START, ROMHASH_SIZE),
+                WatchedRegion("recv_count", DKC3_RECV_PROGRESS_ADDR, 1),
+            ], [
+                LocationFlag(loc_id, "locations", loc_data[0] - 0x5FE, loc_data[1], (len(loc_data) >= 3) and loc_data[2])
+                for loc_id, loc_data in location_rom_data.items()
+            ])
+        return self.location_watcher
 
     async def deathlink_kill_player(self, ctx):
         pass
@@ -51,47 +70,42 @@ class DKC3SNIClient(SNIClient):
 
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_many
         # DKC3_TODO: Handle Deathlink
-        save_file_name = await snes_read(ctx, DKC3_FILE_NAME_ADDR, 0x5)
-        if save_file_name is None or save_file_name[0] == 0x00 or save_file_name == bytes([0x55] * 0x05):
+        watcher = self.get_location_watcher()
+        # DKC3_TODO: Handle non-included checks
+        new_checks = await watcher.poll_snes(ctx)
+        if new_checks is None:
+            return
+        save_file_name = watcher.snapshot["save_file_name"]
+        verify_save_file_name = watcher.snapshot["verify_save_file_name"]
+        rom = watcher.snapshot["rom"]
+        recv_count = watcher.snapshot["recv_count"]
+        if save_file_name[0] == 0x00 or save_file_name == bytes([0x55] * 0x05):
             # We haven't loaded a save file
+            watcher.reset()
             return
 
-        new_checks = []
         from worlds.dkc3.Rom import location_rom_data, item_rom_data, boss_location_ids, level_unlock_map
-        location_ram_data = await snes_read(ctx, WRAM_START + 0x5FE, 0x81)
-        for loc_id, loc_data in location_rom_data.items():
-            if loc_id not in ctx.locations_checked:
-                data = location_ram_data[loc_data[0] - 0x5FE]
-                masked_data = data & (1 << loc_data[1])
-                bit_set = (masked_data != 0)
-                invert_bit = ((len(loc_data) >= 3) and loc_data[2])
-                if bit_set != invert_bit:
-                    # DKC3_TODO: Handle non-included checks
-                    new_checks.append(loc_id)
 
-        verify_save_file_name = await snes_read(ctx, DKC3_FILE_NAME_ADDR, 0x5)
-        if verify_save_file_name is None or verify_save_file_name[0] == 0x00 or verify_save_file_name == bytes([0x55] * 0x05) or verify_save_file_name != save_file_name:
+        if verify_save_file_name[0] == 0x00 or verify_save_file_name == bytes([0x55] * 0x05) or verify_save_file_name != save_file_name:
             # We have somehow exited the save file (or worse)
             ctx.rom = None
+            watcher.reset()
             return
 
-        rom = await snes_read(ctx, DKC3_ROMHASH_START, ROMHASH_SIZE)
         if rom != ctx.rom:
             ctx.rom = None
+            watcher.reset()
             # We have somehow loaded a different ROM
             return
 
-        for new_check_id in new_checks:
-            ctx.locations_checked.add(new_check_id)
+        for new_check_id in await send_location_checks(ctx, new_checks):
             location = ctx.location_names[new_check_id]
             snes_logger.info(
                 f'New Check: {location} ({len(ctx.locations_checked)}/{len(ctx.missing_locations) + len(ctx.checked_locations)})')
-            await ctx.send_msgs([{"cmd": 'LocationChecks', "locations": [new_check_id]}])
 
         # DKC3_TODO: Make this actually visually display new things received (ASM Hook required)
-        recv_count = await snes_read(ctx, DKC3_RECV_PROGRESS_ADDR, 1)
         recv_index = recv_count[0]
 
         if recv_index < len(ctx.items_received):
@@ -180,8 +194,12 @@ class DKC3SNIClient(SNIClient):
             await snes_flush_writes(ctx)
 
         # Handle Collected Locations
-        levels_to_tiles = await snes_read(ctx, ROM_START + 0x3FF800, 0x60)
-        tiles_to_levels = await snes_read(ctx, ROM_START + 0x3FF860, 0x60)
+        snapshot = await snes_read_many(ctx, [(ROM_START + 0x3FF800, 0x60), (ROM_START + 0x3FF860, 0x60),
+                                              (WRAM_START + 0xAAFD, 2), (WRAM_START + 0xAB9B, 2),
+                                              (ROM_START + 0x349857, 1)])
+        if snapshot is None:
+            return
+        levels_to_tiles, tiles_to_levels, boomer_cost_text, boomer_final_cost_text, boomer_cost = snapshot
         for loc_id in ctx.checked_locations:
             if loc_id not in ctx.locations_checked and loc_id not in boss_location_ids:
                 loc_data = location_rom_data[loc_id]
@@ -212,17 +230,13 @@ class DKC3SNIClient(SNIClient):
                 ctx.locations_checked.add(loc_id)
 
         # Calculate Boomer Cost Text
-        boomer_cost_text = await snes_read(ctx, WRAM_START + 0xAAFD, 2)
         if boomer_cost_text[0] == 0x31 and boomer_cost_text[1] == 0x35:
-            boomer_cost = await snes_read(ctx, ROM_START + 0x349857, 1)
             boomer_cost_tens = int(boomer_cost[0]) // 10
             boomer_cost_ones = int(boomer_cost[0]) % 10
             snes_buffered_write(ctx, WRAM_START + 0xAAFD, bytes([0x30 + boomer_cost_tens, 0x30 + boomer_cost_ones]))
             await snes_flush_writes(ctx)
 
-        boomer_final_cost_text = await snes_read(ctx, WRAM_START + 0xAB9B, 2)
         if boomer_final_cost_text[0] == 0x32 and boomer_final_cost_text[1] == 0x35:
-            boomer_cost = await snes_read(ctx, ROM_START + 0x349857, 1)
             boomer_cost_tens = boomer_cost[0] // 10
             boomer_cost_ones = boomer_cost[0] % 10
             snes_buffered_write(ctx, WRAM_START + 0xAB9B, bytes([0x30 + boomer_cost_tens, 0x30 + boomer_cost_ones]))
@@ -40,6 +40,7 @@ class DOOM1993World(World):
     option_definitions = Options.options
     game = "DOOM 1993"
     web = DOOM1993Web()
+    trace_rule_dependencies = True
     data_version = 3
     required_client_version = (0, 3, 9)
 
@@ -39,6 +39,7 @@ class HereticWorld(World):
     option_definitions = Options.options
     game = "Heretic"
     web = HereticWeb()
+    trace_rule_dependencies = True
     data_version = 3
     required_client_version = (0, 3, 9)
 
@@ -122,6 +122,11 @@ shop_cost_types: typing.Dict[str, typing.Tuple[str, ...]] = {
 }
 
 
+dash_effects = ("LEFTDASH", "RIGHTDASH")
+dash_items = {item_name: effects for item_name, effects in item_effects.items()
+              if any(effect_name in effects for effect_name in dash_effects)}
+
+
 class HKWeb(WebWorld):
     tutorials = [Tutorial(
         "Mod Setup and Use Guide",
@@ -155,6 +160,7 @@ class HKWorld(World):
     charm_costs: typing.List[int]
     cached_filler_items = {}
     data_version = 2
+    reversible_collect = True
 
     def __init__(self, world, player):
         super(HKWorld, self).__init__(world, player)
@@ -516,11 +522,8 @@ class HKWorld(World):
         if change:
             for effect_name, effect_value in item_effects.get(item.name, {}).items():
                 state.prog_items[item.player][effect_name] += effect_value
-        if item.name in {"Left_Mothwing_Cloak", "Right_Mothwing_Cloak"}:
-            if state.prog_items[item.player].get('RIGHTDASH', 0) and \
-                    state.prog_items[item.player].get('LEFTDASH', 0):
-                (state.prog_items[item.player]["RIGHTDASH"], state.prog_items[item.player]["LEFTDASH"]) = \
-                    ([max(state.prog_items[item.player]["RIGHTDASH"], state.prog_items[item.player]["LEFTDASH"])] * 2)
+            if item.name in dash_items:
+                self.update_dash(state)
         return change
 
     def remove(self, state, item: HKItem) -> bool:
@@ -528,12 +531,32 @@ class HKWorld(World):
 
         if change:
             for effect_name, effect_value in item_effects.get(item.name, {}).items():
+                if effect_name in dash_effects:
+                    continue
                 if state.prog_items[item.player][effect_name] == effect_value:
                     del state.prog_items[item.player][effect_name]
-                state.prog_items[item.player][effect_name] -= effect_value
+                else:
+                    state.prog_items[item.player][effect_name] -= effect_value
+            if item.name in dash_items:
+                self.update_dash(state)
 
         return change
 
+    def update_dash(self, state) -> None:
+        """Sets the dash levels from the collected cloaks, so they don't depend on the order they were collected in.
+        Once both halves of a split cloak are collected, both directions get the higher level."""
+        prog_items = state.prog_items[self.player]
+        levels = {effect_name: sum(prog_items.get(item_name, 0) * effects.get(effect_name, 0)
+                                   for item_name, effects in dash_items.items())
+                  for effect_name in dash_effects}
+        if prog_items.get("Left_Mothwing_Cloak") and prog_items.get("Right_Mothwing_Cloak"):
+            levels = dict.fromkeys(dash_effects, max(levels.values()))
+        for effect_name, level in levels.items():
+            if level:
+                prog_items[effect_name] = level
+            else:
+                prog_items.pop(effect_name, None)
+
     @classmethod
     def stage_write_spoiler(cls, world: MultiWorld, spoiler_handle):
         hk_players = world.get_game_players(cls.game)
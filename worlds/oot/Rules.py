@@ -62,6 +62,7 @@ class OOTLogic(LogicMixin):
         return self.age[player] == age
 
     def _oot_reach_at_time(self, regionname, tod, already_checked, player):
+        self.materialize(player)
         name_map = {
             TimeOfDay.DAY: self.day_reachable_regions[player],
             TimeOfDay.DAMPE: self.dampe_reachable_regions[player],
@@ -91,14 +92,19 @@ class OOTLogic(LogicMixin):
                 return True
         return False
 
+    def _oot_writable_regions(self, age, player):
+        # rules may copy this state mid-search, after which its sets are shared with the copy again
+        self.materialize(player)
+        return getattr(self, f'{age}_reachable_regions')[player], getattr(self, f'{age}_blocked_connections')[player]
+
     # Store the age before calling this!
     def _oot_update_age_reachable_regions(self, player): 
+        self.materialize(player)
         self.stale[player] = False
         for age in ['child', 'adult']: 
             self.age[player] = age
-            rrp = getattr(self, f'{age}_reachable_regions')[player]
-            bc = getattr(self, f'{age}_blocked_connections')[player]
-            queue = deque(getattr(self, f'{age}_blocked_connections')[player])
+            rrp, bc = self._oot_writable_regions(age, player)
+            queue = deque(bc)
             start = self.multiworld.get_region('Menu', player)
 
             # init on first call - this can't be done on construction since the regions don't exist yet
@@ -114,8 +120,10 @@ class OOTLogic(LogicMixin):
                 if new_region is None: 
                     continue
                 if new_region in rrp:
+                    rrp, bc = self._oot_writable_regions(age, player)
                     bc.remove(connection)
                 elif connection.can_reach(self):
+                    rrp, bc = self._oot_writable_regions(age, player)
                     rrp.add(new_region)
                     bc.remove(connection)
                     bc.update(new_region.exits)
@@ -53,20 +53,25 @@ class OOTCollectionState(metaclass=AutoLogicRegister):
         self.age = {player: None for player in oot_ids}
 
     def copy_mixin(self, ret) -> CollectionState:
-        ret.child_reachable_regions = {player: copy.copy(self.child_reachable_regions[player]) for player in
-                                       self.child_reachable_regions}
-        ret.adult_reachable_regions = {player: copy.copy(self.adult_reachable_regions[player]) for player in
-                                       self.adult_reachable_regions}
-        ret.child_blocked_connections = {player: copy.copy(self.child_blocked_connections[player]) for player in
-                                         self.child_blocked_connections}
-        ret.adult_blocked_connections = {player: copy.copy(self.adult_blocked_connections[player]) for player in
-                                         self.adult_blocked_connections}
-        ret.day_reachable_regions = {player: copy.copy(self.adult_reachable_regions[player]) for player in
-                                     self.day_reachable_regions}
-        ret.dampe_reachable_regions = {player: copy.copy(self.adult_reachable_regions[player]) for player in
-                                       self.dampe_reachable_regions}
+        # per-player sets are shared until materialize_mixin is called for that player
+        ret.child_reachable_regions = self.child_reachable_regions.copy()
+        ret.adult_reachable_regions = self.adult_reachable_regions.copy()
+        ret.child_blocked_connections = self.child_blocked_connections.copy()
+        ret.adult_blocked_connections = self.adult_blocked_connections.copy()
+        ret.day_reachable_regions = self.adult_reachable_regions.copy()
+        ret.dampe_reachable_regions = self.adult_reachable_regions.copy()
+        ret.age = {player: None for player in self.age}
         return ret
 
+    def materialize_mixin(self, player: int) -> None:
+        if player in self.child_reachable_regions:
+            self.child_reachable_regions[player] = self.child_reachable_regions[player].copy()
+            self.adult_reachable_regions[player] = self.adult_reachable_regions[player].copy()
+            self.child_blocked_connections[player] = self.child_blocked_connections[player].copy()
+            self.adult_blocked_connections[player] = self.adult_blocked_connections[player].copy()
+            self.day_reachable_regions[player] = self.day_reachable_regions[player].copy()
+            self.dampe_reachable_regions[player] = self.dampe_reachable_regions[player].copy()
+
 
 class OOTSettings(settings.Group):
     class RomFile(settings.UserFilePath):
@@ -856,6 +861,7 @@ class OOTWorld(World):
 
         def prefill_state(base_state):
             state = base_state.copy()
+            state.materialize(self.player)
             for item in self.get_pre_fill_items():
                 self.collect(state, item)
             state.sweep_for_events(locations=self.get_locations())
@@ -62,9 +62,14 @@ class SMCollectionState(metaclass=AutoLogicRegister):
             self.smbm = {}
 
     def copy_mixin(self, ret) -> CollectionState:
-        ret.smbm = {player: copy.deepcopy(self.smbm[player]) for player in self.smbm}
+        # SMBoolManagers are shared until materialize_mixin is called for that player
+        ret.smbm = self.smbm.copy()
         return ret
 
+    def materialize_mixin(self, player: int) -> None:
+        if player in self.smbm:
+            self.smbm[player] = copy.deepcopy(self.smbm[player])
+
     def get_game_players(self, multiword: MultiWorld, game_name: str):
         return tuple(player for player in multiword.get_all_ids() if multiword.game[player] == game_name)
 
@@ -427,6 +432,7 @@ class SMWorld(World):
         for player in world.get_game_players("Super Metroid"):
             for bossLoc in bossesLoc:
                 if not world.get_location(bossLoc, player).can_reach(new_state):
+                    world.state.materialize(player)
                     world.state.smbm[player].onlyBossLeft = True
                     break
 
@@ -59,20 +59,21 @@ class SMWSNIClient(SNIClient):
     game = "Super Mario World"
 
     async def deathlink_kill_player(self, ctx):
-        from SNIClient import DeathState, snes_buffered_write, snes_flush_writes, snes_read
-        game_state = await snes_read(ctx, SMW_GAME_STATE_ADDR, 0x1)
+        from SNIClient import DeathState, snes_buffered_write, snes_flush_writes, snes_read_many
+        snapshot = await snes_read_many(ctx, [(SMW_GAME_STATE_ADDR, 0x1), (SMW_MARIO_STATE_ADDR, 0x1),
+                                              (SMW_MESSAGE_BOX_ADDR, 0x1), (SMW_PAUSE_ADDR, 0x1)])
+        if snapshot is None:
+            return
+        game_state, mario_state, message_box, pause_state = snapshot
         if game_state[0] != 0x14:
             return
 
-        mario_state = await snes_read(ctx, SMW_MARIO_STATE_ADDR, 0x1)
         if mario_state[0] != 0x00:
             return
 
-        message_box = await snes_read(ctx, SMW_MESSAGE_BOX_ADDR, 0x1)
         if message_box[0] != 0x00:
             return
 
-        pause_state = await snes_read(ctx, SMW_PAUSE_ADDR, 0x1)
         if pause_state[0] != 0x00:
             return
 
@@ -128,36 +129,36 @@ class SMWSNIClient(SNIClient):
 
 
     async def handle_message_queue(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read_many
 
         if not hasattr(self, "message_queue") or len(self.message_queue) == 0:
             return
 
-        game_state = await snes_read(ctx, SMW_GAME_STATE_ADDR, 0x1)
+        snapshot = await snes_read_many(ctx, [(SMW_GAME_STATE_ADDR, 0x1), (SMW_MARIO_STATE_ADDR, 0x1),
+                                              (SMW_MESSAGE_BOX_ADDR, 0x1), (SMW_PAUSE_ADDR, 0x1),
+                                              (SMW_CURRENT_LEVEL_ADDR, 0x1), (SMW_BOSS_STATE_ADDR, 0x1),
+                                              (SMW_ACTIVE_BOSS_ADDR, 0x1)])
+        if snapshot is None:
+            return
+        game_state, mario_state, message_box, pause_state, current_level, boss_state, active_boss = snapshot
         if game_state[0] != 0x14:
             return
 
-        mario_state = await snes_read(ctx, SMW_MARIO_STATE_ADDR, 0x1)
         if mario_state[0] != 0x00:
             return
 
-        message_box = await snes_read(ctx, SMW_MESSAGE_BOX_ADDR, 0x1)
         if message_box[0] != 0x00:
             return
 
-        pause_state = await snes_read(ctx, SMW_PAUSE_ADDR, 0x1)
         if pause_state[0] != 0x00:
             return
 
-        current_level = await snes_read(ctx, SMW_CURRENT_LEVEL_ADDR, 0x1)
         if current_level[0] in SMW_BAD_TEXT_BOX_LEVELS:
             return
 
-        boss_state = await snes_read(ctx, SMW_BOSS_STATE_ADDR, 0x1)
         if boss_state[0] in SMW_BOSS_STATES:
             return
 
-        active_boss = await snes_read(ctx, SMW_ACTIVE_BOSS_ADDR, 0x1)
         if active_boss[0] != 0x00:
             return
 
@@ -177,20 +178,23 @@ class SMWSNIClient(SNIClient):
 
 
     async def handle_trap_queue(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_many
 
         if not hasattr(self, "trap_queue") or len(self.trap_queue) == 0:
             return
 
-        game_state = await snes_read(ctx, SMW_GAME_STATE_ADDR, 0x1)
+        snapshot = await snes_read_many(ctx, [(SMW_GAME_STATE_ADDR, 0x1), (SMW_MARIO_STATE_ADDR, 0x1),
+                                              (SMW_PAUSE_ADDR, 0x1), (SMW_CURRENT_LEVEL_ADDR, 0x1),
+                                              (SMW_BOSS_STATE_ADDR, 0x1), (SMW_ACTIVE_BOSS_ADDR, 0x1)])
+        if snapshot is None:
+            return
+        game_state, mario_state, pause_state, current_level, boss_state, active_boss = snapshot
         if game_state[0] != 0x14:
             return
 
-        mario_state = await snes_read(ctx, SMW_MARIO_STATE_ADDR, 0x1)
         if mario_state[0] != 0x00:
             return
 
-        pause_state = await snes_read(ctx, SMW_PAUSE_ADDR, 0x1)
         if pause_state[0] != 0x00:
             return
 
@@ -223,15 +227,12 @@ class SMWSNIClient(SNIClient):
                     new_item_count = trap_rom_data[next_trap.item][1]
                     snes_buffered_write(ctx, WRAM_START + trap_rom_data[next_trap.item][0], bytes([new_item_count]))
 
-            current_level = await snes_read(ctx, SMW_CURRENT_LEVEL_ADDR, 0x1)
             if current_level[0] in SMW_BAD_TEXT_BOX_LEVELS:
                 return
 
-            boss_state = await snes_read(ctx, SMW_BOSS_STATE_ADDR, 0x1)
             if boss_state[0] in SMW_BOSS_STATES:
                 return
 
-            active_boss = await snes_read(ctx, SMW_ACTIVE_BOSS_ADDR, 0x1)
             if active_boss[0] != 0x00:
                 return
 
@@ -240,17 +241,20 @@ class SMWSNIClient(SNIClient):
 
 
     async def game_watcher(self, ctx):
-        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
-
-        game_state = await snes_read(ctx, SMW_GAME_STATE_ADDR, 0x1)
-        mario_state = await snes_read(ctx, SMW_MARIO_STATE_ADDR, 0x1)
-        if game_state is None:
+        from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_many
+
+        snapshot = await snes_read_many(ctx, [(SMW_GAME_STATE_ADDR, 0x1), (SMW_MARIO_STATE_ADDR, 0x1),
+                                              (SMW_CURRENT_LEVEL_ADDR, 0x1), (SMW_GOAL_DATA, 0x1),
+                                              (SMW_MESSAGE_BOX_ADDR, 0x1), (SMW_EGG_COUNT_ADDR, 0x1),
+                                              (SMW_REQUIRED_EGGS_DATA, 0x1), (SMW_BOSS_COUNT_ADDR, 0x1),
+                                              (SMW_BONUS_STAR_ADDR, 0x1)])
+        if snapshot is None:
             # We're not properly connected
             return
-        elif game_state[0] >= 0x18:
+        game_state, mario_state, current_level, goal, message_box, egg_count, required_egg_count, boss_count, \
+            display_count = snapshot
+        if game_state[0] >= 0x18:
             if not ctx.finished_game:
-                current_level = await snes_read(ctx, SMW_CURRENT_LEVEL_ADDR, 0x1)
-
                 if current_level[0] in SMW_GOAL_LEVELS:
                     await ctx.send_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
                     ctx.finished_game = True
@@ -268,13 +272,7 @@ class SMWSNIClient(SNIClient):
             await ctx.handle_deathlink_state(currently_dead)
 
         # Check for Egg Hunt ending
-        goal = await snes_read(ctx, SMW_GOAL_DATA, 0x1)
         if game_state[0] == 0x14 and goal[0] == 1:
-            current_level = await snes_read(ctx, SMW_CURRENT_LEVEL_ADDR, 0x1)
-            message_box = await snes_read(ctx, SMW_MESSAGE_BOX_ADDR, 0x1)
-            egg_count = await snes_read(ctx, SMW_EGG_COUNT_ADDR, 0x1)
-            required_egg_count = await snes_read(ctx, SMW_REQUIRED_EGGS_DATA, 0x1)
-
             if current_level[0] == 0x28 and message_box[0] == 0x01 and egg_count[0] >= required_egg_count[0]:
                 snes_buffered_write(ctx, WRAM_START + 0x13C6, bytes([0x08]))
                 snes_buffered_write(ctx, WRAM_START + 0x13CE, bytes([0x01]))
@@ -284,10 +282,6 @@ class SMWSNIClient(SNIClient):
                 await snes_flush_writes(ctx)
                 return
 
-        egg_count     = await snes_read(ctx, SMW_EGG_COUNT_ADDR, 0x1)
-        boss_count    = await snes_read(ctx, SMW_BOSS_COUNT_ADDR, 0x1)
-        display_count = await snes_read(ctx, SMW_BONUS_STAR_ADDR, 0x1)
-
         if goal[0] == 0 and boss_count[0] > display_count[0]:
             snes_buffered_write(ctx, SMW_BONUS_STAR_ADDR, bytes([boss_count[0]]))
             await snes_flush_writes(ctx)
@@ -299,10 +293,19 @@ class SMWSNIClient(SNIClient):
         await self.handle_trap_queue(ctx)
 
         new_checks = []
-        event_data = await snes_read(ctx, SMW_EVENT_ROM_DATA, 0x60)
-        progress_data = bytearray(await snes_read(ctx, SMW_PROGRESS_DATA, 0x0F))
-        dragon_coins_data = bytearray(await snes_read(ctx, SMW_DRAGON_COINS_DATA, 0x0C))
-        dragon_coins_active = await snes_read(ctx, SMW_DRAGON_COINS_ACTIVE_ADDR, 0x1)
+        # the game state is read again after the progress data, to verify we are still in the save file
+        snapshot = await snes_read_many(ctx, [(SMW_EVENT_ROM_DATA, 0x60), (SMW_PROGRESS_DATA, 0x0F),
+                                              (SMW_DRAGON_COINS_DATA, 0x0C), (SMW_DRAGON_COINS_ACTIVE_ADDR, 0x1),
+                                              (SMW_GAME_STATE_ADDR, 0x1), (SMW_ROMHASH_START, ROMHASH_SIZE),
+                                              (SMW_RECV_PROGRESS_ADDR, 1), (SMW_PATH_DATA, 0x60),
+                                              (SMW_SWAMP_DONUT_GH_ADDR, 0x1), (SMW_NUM_EVENTS_ADDR, 0x1)])
+        if snapshot is None:
+            return
+        event_data, progress_data, dragon_coins_data, dragon_coins_active, verify_game_state, rom, recv_count, \
+            path_data, donut_gh_swapped, old_events = snapshot
+        progress_data = bytearray(progress_data)
+        dragon_coins_data = bytearray(dragon_coins_data)
+        path_data = bytearray(path_data)
         from worlds.smw.Rom import item_rom_data, ability_rom_data, trap_rom_data
         from worlds.smw.Levels import location_id_to_level_id, level_info_dict
         from worlds import AutoWorldRegister
@@ -339,13 +342,11 @@ class SMWSNIClient(SNIClient):
                     if bit_set:
                         new_checks.append(loc_id)
 
-        verify_game_state = await snes_read(ctx, SMW_GAME_STATE_ADDR, 0x1)
-        if verify_game_state is None or verify_game_state[0] < 0x0B or verify_game_state[0] > 0x29:
+        if verify_game_state[0] < 0x0B or verify_game_state[0] > 0x29:
             # We have somehow exited the save file (or worse)
             print("Exit Save File")
             return
 
-        rom = await snes_read(ctx, SMW_ROMHASH_START, ROMHASH_SIZE)
         if rom != ctx.rom:
             ctx.rom = None
             print("Exit ROM")
@@ -363,7 +364,6 @@ class SMWSNIClient(SNIClient):
             # Don't receive items or collect locations outside of in-level mode
             return
 
-        recv_count = await snes_read(ctx, SMW_RECV_PROGRESS_ADDR, 1)
         recv_index = recv_count[0]
 
         if recv_index < len(ctx.items_received):
@@ -445,8 +445,6 @@ class SMWSNIClient(SNIClient):
 
         # Handle Collected Locations
         new_events = 0
-        path_data = bytearray(await snes_read(ctx, SMW_PATH_DATA, 0x60))
-        donut_gh_swapped = await snes_read(ctx, SMW_SWAMP_DONUT_GH_ADDR, 0x1)
         new_dragon_coin = False
         for loc_id in ctx.checked_locations:
             if loc_id not in ctx.locations_checked:
@@ -516,7 +514,6 @@ class SMWSNIClient(SNIClient):
         if new_events > 0:
             snes_buffered_write(ctx, SMW_PROGRESS_DATA, bytes(progress_data))
             snes_buffered_write(ctx, SMW_PATH_DATA, bytes(path_data))
-            old_events = await snes_read(ctx, SMW_NUM_EVENTS_ADDR, 0x1)
             snes_buffered_write(ctx, SMW_NUM_EVENTS_ADDR, bytes([old_events[0] + new_events]))
 
         await snes_flush_writes(ctx)
@@ -47,9 +47,14 @@ class SMZ3CollectionState(metaclass=AutoLogicRegister):
             self.smz3state = {}
 
     def copy_mixin(self, ret) -> CollectionState:
-        ret.smz3state = {player: copy.deepcopy(self.smz3state[player]) for player in self.smz3state}
+        # Progression objects are shared until materialize_mixin is called for that player
+        ret.smz3state = self.smz3state.copy()
         return ret
 
+    def materialize_mixin(self, player: int) -> None:
+        if player in self.smz3state:
+            self.smz3state[player] = copy.deepcopy(self.smz3state[player])
+
 class SMZ3Web(WebWorld):
     tutorials = [Tutorial(
         "Multiworld Setup Guide",
@@ -476,9 +481,10 @@ class SMZ3World(World):
         return False
 
     def remove(self, state: CollectionState, item: Item) -> bool:
+        # collect adds every item to smz3state, so every item has to be removed from it again
+        state.smz3state[item.player].Remove([TotalSMZ3Item.Item(TotalSMZ3Item.ItemType[item.name], self.smz3World if hasattr(self, "smz3World") else None)])
         name = self.collect_item(state, item, True)
         if name:
-            state.smz3state[item.player].Remove([TotalSMZ3Item.Item(TotalSMZ3Item.ItemType[item.name], self.smz3World if hasattr(self, "smz3World") else None)])
             state.prog_items[item.player][item.name] -= 1
             if state.prog_items[item.player][item.name] < 1:
                 del (state.prog_items[item.player][item.name])